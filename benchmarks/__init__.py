@@ -0,0 +1,11 @@
+"""Benchmarks for the practica-tracker hot paths.
+
+
+Responsibilities:
+- `datasets` generates deterministic entry/challenge files of a given size
+- `scenarios` holds the timed scenarios (store, challenges, Flask routes)
+- `run` runs each scenario in a fresh process, records wall time, rows/sec
+  and peak RSS to JSON and compares a run against a stored baseline
+
+Run `python -m benchmarks.run --help` from the repository root.
+"""
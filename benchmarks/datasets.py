@@ -0,0 +1,160 @@
+"""Deterministic synthetic datasets for the benchmarks.
+
+The same (size, seed) always produces byte-identical files, so timings from
+different runs and machines are measured on the same data. Datasets are
+written once under a data directory and reused while their manifest matches.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+import json
+from pathlib import Path
+import random
+from typing import Iterator
+import uuid
+
+from practica_tracker.challenge import Challenge, status_completed, status_pendant
+from practica_tracker.store import Entry, append_entries
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "10M": 10_000_000}
+DEFAULT_SEED = 20260101
+# bump when the generated content changes, so stale datasets are rebuilt
+GENERATOR_VERSION = 1
+
+START = date(2000, 1, 1)
+_WORDS = (
+    "scales arpeggios sight reading etude sonata chords intervals rhythm metronome "
+    "warmup improvisation theory ear training left hand right hand tempo dynamics "
+    "phrasing legato staccato octaves trills pedal memorize review slow fast"
+).split()
+_TAGS = ("piano", "guitar", "theory", "ear", "technique", "repertoire", "py", "cli", "reading", "rhythm")
+
+
+def parse_size(value: str) -> int:
+    """"10k" / "1M" / a plain row count -> number of rows."""
+    if value in SIZES:
+        return SIZES[value]
+    try:
+        rows = int(value)
+    except ValueError:
+        raise ValueError(f"unknown size {value!r}, use one of {', '.join(SIZES)} or a number") from None
+    if rows < 1:
+        raise ValueError("size must be at least 1")
+    return rows
+
+
+def size_label(rows: int) -> str:
+    for label, count in SIZES.items():
+        if count == rows:
+            return label
+    return str(rows)
+
+
+def _description(rng: random.Random) -> str:
+    text = " ".join(rng.choices(_WORDS, k=rng.randint(3, 9)))
+    roll = rng.random()
+    # a few fields that need CSV quoting, like real free text
+    if roll < 0.05:
+        text += ", then " + rng.choice(_WORDS)
+    elif roll < 0.07:
+        text += ' "slowly"'
+    return text
+
+
+def generate_entries(rows: int, seed: int = DEFAULT_SEED) -> Iterator[Entry]:
+    """`rows` entries in append order: dates never go backwards, about 4 a day."""
+    rng = random.Random(seed)
+    for i in range(rows):
+        day = START + timedelta(days=i // 4)
+        yield Entry(
+            id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            date=day.isoformat(),
+            time=f"{rng.randrange(6, 23):02d}:{rng.randrange(60):02d}",
+            description=_description(rng),
+            tags=", ".join(rng.sample(_TAGS, rng.randint(0, 3))),
+            duration_minutes=rng.randint(5, 120),
+        )
+
+
+def generate_challenges(rows: int, seed: int = DEFAULT_SEED) -> Iterator[Challenge]:
+    """`rows` challenges, one per day, mostly completed.
+
+    Dates wrap around after 9999-12-31, so the 10M dataset repeats dates;
+    the benchmarks only load and save lists, which allow that.
+    """
+    rng = random.Random(seed + 1)
+    span = date.max.toordinal() - START.toordinal() + 1
+    for i in range(rows):
+        yield Challenge(
+            date=date.fromordinal(START.toordinal() + i % span),
+            description=_description(rng),
+            status=status_completed if rng.random() < 0.8 else status_pendant,
+        )
+
+
+def write_challenges_json(path: Path, challenges) -> None:
+    """Stream challenges to JSON in the exact format of `save_challenges_json`.
+
+    `save_challenges_json` builds the whole document in memory, which is not
+    an option for the larger datasets.
+    """
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("[")
+        sep = "\n"
+        for challenge in challenges:
+            body = json.dumps(challenge.to_dict(), ensure_ascii=False, indent=2)
+            handle.write(sep + "\n".join("  " + line for line in body.splitlines()))
+            sep = ",\n"
+        handle.write("\n]" if sep != "\n" else "]")
+
+
+@dataclass
+class Dataset:
+    rows: int
+    seed: int
+    root: Path
+
+    @property
+    def entries_csv(self) -> Path:
+        return self.root / "practica.csv"
+
+    @property
+    def challenges_json(self) -> Path:
+        return self.root / "challenges.json"
+
+    @property
+    def manifest(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _expected_manifest(self) -> dict:
+        return {"rows": self.rows, "seed": self.seed, "generator": GENERATOR_VERSION}
+
+    def is_current(self) -> bool:
+        try:
+            return json.loads(self.manifest.read_text(encoding="utf-8")) == self._expected_manifest()
+        except (FileNotFoundError, ValueError):
+            return False
+
+
+def ensure_dataset(data_dir: Path, rows: int, seed: int = DEFAULT_SEED) -> Dataset:
+    """The dataset for (rows, seed) under `data_dir`, generated if missing or stale."""
+    dataset = Dataset(rows, seed, Path(data_dir) / f"{size_label(rows)}-{seed}")
+    if dataset.is_current():
+        return dataset
+    dataset.root.mkdir(parents=True, exist_ok=True)
+    dataset.manifest.unlink(missing_ok=True)
+    dataset.entries_csv.unlink(missing_ok=True)
+    append_entries(dataset.entries_csv, generate_entries(rows, seed), chunk_size=10_000)
+    write_challenges_json(dataset.challenges_json, generate_challenges(rows, seed))
+    # written last: an interrupted generation is rebuilt next time
+    dataset.manifest.write_text(json.dumps(dataset._expected_manifest()), encoding="utf-8")
+    return dataset
+
+
+def describe(dataset: Dataset) -> dict:
+    info = asdict(dataset)
+    info["root"] = str(dataset.root)
+    info["entries_bytes"] = dataset.entries_csv.stat().st_size
+    info["challenges_bytes"] = dataset.challenges_json.stat().st_size
+    return info
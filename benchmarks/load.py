@@ -0,0 +1,212 @@
+"""Load test: Flask (sync workers) against the ASGI app under slow downloads.
+
+    python -m benchmarks.load                         # 100k rows, 16 slow + 8 quick clients
+    python -m benchmarks.load --workers 4 --slow 8 --rate 128k --json load.json
+
+Slow clients download /export/csv over and over at `--rate` bytes/sec each.
+Meanwhile quick clients keep posting to /add. The two apps are measured the
+same way:
+
+- Flask is driven through its WSGI callable from a pool of `--workers`
+  threads. That is what a sync server with that many workers does: a worker
+  stays busy until its client has read the whole response.
+- The ASGI app runs in one event loop with its default thread pools.
+
+Reported per app: quick-request latency percentiles (including time spent
+waiting for a free worker), requests served and downloads completed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.datasets import DEFAULT_SEED, ensure_dataset, parse_size
+from benchmarks.run import DEFAULT_DATA_DIR
+
+
+def _rate(value: str) -> float:
+    value = value.strip().lower()
+    scale = {"k": 1024, "m": 1024 * 1024}.get(value[-1:], 1)
+    return float(value.rstrip("km")) * scale
+
+
+class Recorder:
+    def __init__(self):
+        self.quick: list[float] = []
+        self.quick_errors = 0
+        self.downloads: list[float] = []
+        self._lock = threading.Lock()
+
+    def add_quick(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.quick.append(seconds)
+            else:
+                self.quick_errors += 1
+
+    def add_download(self, seconds: float) -> None:
+        with self._lock:
+            self.downloads.append(seconds)
+
+    def summary(self, duration: float) -> dict:
+        quick = sorted(self.quick)
+
+        def pct(p: float) -> float | None:
+            return round(quick[min(len(quick) - 1, int(p * len(quick)))] * 1000, 2) if quick else None
+
+        return {
+            "quick_requests": len(quick),
+            "quick_errors": self.quick_errors,
+            "quick_per_sec": round(len(quick) / duration, 1),
+            "quick_p50_ms": pct(0.50),
+            "quick_p95_ms": pct(0.95),
+            "quick_max_ms": round(quick[-1] * 1000, 2) if quick else None,
+            "downloads": len(self.downloads),
+            "download_mean_s": round(statistics.mean(self.downloads), 3) if self.downloads else None,
+        }
+
+
+def run_flask(csv_path: Path, args: argparse.Namespace) -> dict:
+    from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+    from practica_tracker.app import app
+
+    app.config.update(PRACTICA_BACKEND="csv", PRACTICA_DB=str(csv_path))
+    workers = ThreadPoolExecutor(max_workers=args.workers)
+    recorder = Recorder()
+    deadline = time.perf_counter() + args.duration
+
+    def handle(method: str, path: str, data: dict | None = None, rate: float | None = None) -> int:
+        environ = EnvironBuilder(method=method, path=path, data=data).get_environ()
+        app_iter, status, _ = run_wsgi_app(app.wsgi_app, environ, buffered=False)
+        try:
+            for chunk in app_iter:
+                if rate:
+                    time.sleep(len(chunk) / rate)  # the worker waits on its slow client
+        finally:
+            getattr(app_iter, "close", lambda: None)()
+        return int(status.split()[0])
+
+    def slow_client() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            workers.submit(handle, "GET", "/export/csv", None, args.rate).result()
+            recorder.add_download(time.perf_counter() - started)
+
+    def quick_client(n: int) -> None:
+        i = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status = workers.submit(handle, "POST", "/add", {"description": f"flask quick {n}-{i}"}).result()
+            recorder.add_quick(time.perf_counter() - started, status == 302)
+            i += 1
+
+    clients = [threading.Thread(target=slow_client) for _ in range(args.slow)]
+    clients += [threading.Thread(target=quick_client, args=(n,)) for n in range(args.quick)]
+    started = time.perf_counter()
+    for t in clients:
+        t.start()
+    for t in clients:
+        t.join()
+    workers.shutdown()
+    return recorder.summary(time.perf_counter() - started)
+
+
+def run_asgi(csv_path: Path, args: argparse.Namespace) -> dict:
+    from practica_tracker.asgi import PracticaASGI
+
+    app = PracticaASGI(backend="csv", db=csv_path)
+    recorder = Recorder()
+
+    async def request(method: str, path: str, body: bytes = b"", rate: float | None = None) -> int:
+        done = False
+        status = 0
+
+        async def receive():
+            nonlocal done
+            if not done:
+                done = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif rate and message.get("body"):
+                await asyncio.sleep(len(message["body"]) / rate)
+
+        headers = [(b"content-type", b"application/x-www-form-urlencoded")] if body else []
+        scope = {"type": "http", "method": method, "path": path, "query_string": b"", "headers": headers}
+        await app(scope, receive, send)
+        return status
+
+    async def main() -> dict:
+        deadline = time.perf_counter() + args.duration
+
+        async def slow_client():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await request("GET", "/export/csv", rate=args.rate)
+                recorder.add_download(time.perf_counter() - started)
+
+        async def quick_client(n: int):
+            i = 0
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                status = await request("POST", "/add", f"description=asgi+quick+{n}-{i}".encode())
+                recorder.add_quick(time.perf_counter() - started, status == 302)
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[slow_client() for _ in range(args.slow)], *[quick_client(n) for n in range(args.quick)])
+        return recorder.summary(time.perf_counter() - started)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        app.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks.load", description="Compare Flask and ASGI under slow clients")
+    parser.add_argument("--size", default="100k", help="Entries in the CSV being downloaded (10k, 100k, ... or a count)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--workers", type=int, default=8, help="Flask worker threads (a sync server's worker count)")
+    parser.add_argument("--slow", type=int, default=16, help="Concurrent slow downloaders")
+    parser.add_argument("--quick", type=int, default=8, help="Concurrent quick clients posting /add")
+    parser.add_argument("--rate", type=_rate, default=_rate("1m"), help="Bytes/sec each slow client reads (e.g. 256k, 1m)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to keep starting requests")
+    parser.add_argument("--apps", default="flask,asgi", help="Which apps to run")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    dataset = ensure_dataset(args.data_dir, parse_size(args.size), args.seed)
+    runners = {"flask": run_flask, "asgi": run_asgi}
+    results = {}
+    for name in [a.strip() for a in args.apps.split(",") if a.strip()]:
+        with tempfile.TemporaryDirectory(prefix=f"practica-load-{name}-") as tmp:
+            # each app gets its own copy, since the quick clients append to it
+            csv_path = Path(tmp) / "practica.csv"
+            shutil.copyfile(dataset.entries_csv, csv_path)
+            results[name] = runners[name](csv_path, args)
+        print(f"{name:<6} " + "  ".join(f"{k}={v}" for k, v in results[name].items()))
+    if args.json is not None:
+        args.json.write_text(json.dumps({"args": {k: str(v) for k, v in vars(args).items()}, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+"""Run the benchmark scenarios and compare against a baseline.
+
+    python -m benchmarks.run                          # 10k and 100k, every scenario
+    python -m benchmarks.run --sizes 1M,10M --scenarios read_entries,export_xlsx
+    python -m benchmarks.run --out base.json          # record a baseline
+    python -m benchmarks.run --baseline base.json     # exit 1 on a regression
+
+Each (scenario, size, repeat) runs in a fresh interpreter, so caches, imports
+and peak RSS never leak from one measurement into the next. The best wall
+time and the highest peak RSS over the repeats are reported.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.datasets import DEFAULT_SEED, ensure_dataset, describe, parse_size, size_label
+from benchmarks.scenarios import SCENARIOS
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SIZES = "10k,100k"
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_OUT = Path(__file__).resolve().parent / "results.json"
+DEFAULT_THRESHOLD = 0.10
+
+
+def _peak_rss_kib() -> int:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+def run_child(name: str, rows: int, seed: int, data_dir: Path) -> dict:
+    """One measurement, in this process. Called through `--child`."""
+    dataset = ensure_dataset(data_dir, rows, seed)
+    with tempfile.TemporaryDirectory(prefix="practica-bench-") as workdir:
+        run = SCENARIOS[name](dataset, Path(workdir))
+        setup_rss = _peak_rss_kib()
+        start = time.perf_counter()
+        processed = run()
+        seconds = time.perf_counter() - start
+    result = {"rows": processed, "seconds": seconds, "peak_rss_kib": _peak_rss_kib(), "setup_rss_kib": setup_rss}
+    if getattr(run, "info", None):
+        result["info"] = run.info
+    return result
+
+
+def measure(name: str, rows: int, seed: int, data_dir: Path, repeat: int) -> dict:
+    result = {"scenario": name, "size": size_label(rows)}
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--child", name, "--rows", str(rows),
+             "--seed", str(seed), "--data-dir", str(data_dir)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if proc.returncode != 0:
+            lines = proc.stderr.strip().splitlines()
+            result["error"] = lines[-1] if lines else f"exit status {proc.returncode}"
+            return result
+        samples.append(json.loads(proc.stdout.splitlines()[-1]))
+    best = min(samples, key=lambda s: s["seconds"])
+    result.update(
+        rows=best["rows"],
+        seconds=round(best["seconds"], 6),
+        rows_per_sec=round(best["rows"] / best["seconds"], 1) if best["seconds"] > 0 else None,
+        peak_rss_kib=max(s["peak_rss_kib"] for s in samples),
+        setup_rss_kib=max(s["setup_rss_kib"] for s in samples),
+    )
+    if "info" in best:
+        result["info"] = best["info"]
+    return result
+
+
+def _key(result: dict) -> str:
+    return f"{result['scenario']}/{result['size']}"
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """Per-measurement comparison of two result documents.
+
+    `status` is "regression" when wall time grew by more than `threshold`
+    (0.10 = 10%), "faster" when it shrank by more than that, otherwise "ok";
+    "new" / "missing" / "error" when either side has no timing.
+    """
+    before = {_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        key = _key(result)
+        base = before.get(key)
+        row = {"key": key, "seconds": result.get("seconds"), "baseline_seconds": base.get("seconds") if base else None}
+        if "error" in result:
+            row["status"] = "error"
+        elif base is None or not base.get("seconds"):
+            row["status"] = "new"
+        else:
+            row["ratio"] = round(result["seconds"] / base["seconds"], 3)
+            if row["ratio"] > 1 + threshold:
+                row["status"] = "regression"
+            elif row["ratio"] < 1 - threshold:
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    seen = {row["key"] for row in rows}
+    rows.extend({"key": key, "status": "missing"} for key in before if key not in seen)
+    return rows
+
+
+def _print_result(result: dict) -> None:
+    if "error" in result:
+        print(f"{_key(result):<32} ERROR {result['error']}")
+        return
+    print(
+        f"{_key(result):<32} {result['seconds']:>10.4f}s {result['rows_per_sec'] or 0:>14,.0f} rows/s "
+        f"{result['peak_rss_kib'] / 1024:>9.1f} MiB peak"
+        + "".join(f"  {key}={value}" for key, value in result.get("info", {}).items())
+    )
+
+
+def _print_comparison(rows: list[dict]) -> None:
+    print("\ncompared with baseline:")
+    for row in rows:
+        ratio = f"x{row['ratio']:.3f}" if "ratio" in row else ""
+        print(f"{row['key']:<32} {row['status']:<10} {ratio}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description="Benchmark practica-tracker hot paths")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma separated: 10k,100k,1M,10M or row counts")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma separated scenario names")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best wall time wins)")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Where generated datasets are kept")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Results JSON to write")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.10 = 10%%)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(run_child(args.child, args.rows, args.seed, args.data_dir)))
+        return 0
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)}; known: {', '.join(SCENARIOS)}", file=sys.stderr)
+        return 2
+    try:
+        sizes = [parse_size(s.strip()) for s in args.sizes.split(",") if s.strip()]
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    document = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "datasets": [],
+        },
+        "results": [],
+    }
+    for rows in sizes:
+        dataset = ensure_dataset(args.data_dir, rows, args.seed)
+        document["meta"]["datasets"].append(describe(dataset))
+        for name in names:
+            result = measure(name, rows, args.seed, args.data_dir, args.repeat)
+            document["results"].append(result)
+            _print_result(result)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    print(f"\nresults written to {args.out}")
+
+    if args.baseline is None:
+        return 0
+    rows = compare(document, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    _print_comparison(rows)
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
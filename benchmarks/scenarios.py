@@ -0,0 +1,238 @@
+"""Timed benchmark scenarios.
+
+A scenario is a function `(dataset, workdir) -> run` registered in
+`SCENARIOS`. Everything it does before returning `run` is untimed setup;
+`run()` is the timed part and returns how many rows it processed. A `run`
+with an `info` dict attribute (say, a compression ratio) has it recorded next
+to its timings.
+
+The Flask scenarios render pages with the stand-in templates in
+`benchmarks/templates/` wherever the app's own templates are missing.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict
+
+from benchmarks.datasets import Dataset
+
+Run = Callable[[], int]
+# stand-in pages for the app templates a checkout may not have
+TEMPLATES = Path(__file__).with_name("templates")
+SCENARIOS: Dict[str, Callable[[Dataset, Path], Run]] = {}
+
+
+def scenario(name: str):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+@scenario("read_entries")
+def read_entries_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.store import invalidate_cache, read_entries
+
+    def run() -> int:
+        invalidate_cache(dataset.entries_csv)  # cold read, not the process cache
+        return len(read_entries(dataset.entries_csv))
+    return run
+
+
+@scenario("get_entry")
+def get_entry_scenario(dataset: Dataset, workdir: Path) -> Run:
+    import random
+    import shutil
+
+    from practica_tracker.store import get_entry, get_offset_index, iter_entries
+
+    path = workdir / "practica.csv"
+    shutil.copyfile(dataset.entries_csv, path)
+    get_offset_index(path).sync()  # built once, like the sidecar of a live file
+    ids = random.Random(dataset.seed).sample([e.id for e in iter_entries(path)], min(1000, dataset.rows))
+
+    def run() -> int:
+        for entry_id in ids:
+            get_entry(path, entry_id)
+        return len(ids)
+    return run
+
+
+def _month_in_the_middle(dataset: Dataset) -> str:
+    from practica_tracker.store import iter_entries
+
+    dates = [e.date for e in iter_entries(dataset.entries_csv)]
+    return dates[len(dates) // 2][:7]
+
+
+@scenario("between_month")
+def between_month_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.store import CsvBackend
+
+    month = _month_in_the_middle(dataset)
+    backend = CsvBackend(dataset.entries_csv)
+    return lambda: sum(1 for _ in backend.between(f"{month}-01", f"{month}-31"))
+
+
+@scenario("between_month_partitioned")
+def between_month_partitioned_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.store import PartitionedBackend, convert_to_partitioned
+
+    month = _month_in_the_middle(dataset)
+    convert_to_partitioned(dataset.entries_csv, workdir / "practica")
+    backend = PartitionedBackend(workdir / "practica")
+    return lambda: sum(1 for _ in backend.between(f"{month}-01", f"{month}-31"))
+
+
+@scenario("read_all_partitioned")
+def read_all_partitioned_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.store import PartitionedBackend, convert_to_partitioned
+
+    convert_to_partitioned(dataset.entries_csv, workdir / "practica")
+    backend = PartitionedBackend(workdir / "practica")
+    return lambda: sum(1 for _ in backend.iter_entries())
+
+
+def _compressed(dataset: Dataset, workdir: Path, codec: str) -> Path:
+    from practica_tracker.store import convert_to_compressed
+
+    path = workdir / "practica.csvz"
+    convert_to_compressed(dataset.entries_csv, path, codec)
+    return path
+
+
+def _read_compressed(dataset: Dataset, workdir: Path, codec: str) -> Run:
+    from practica_tracker.store import block_stats, read_entries
+
+    path = _compressed(dataset, workdir, codec)
+
+    def run() -> int:
+        return len(read_entries(path))
+    stats = block_stats(path)
+    run.info = {"ratio": stats["ratio"], "stored_bytes": stats["stored_bytes"], "blocks": stats["blocks"]}
+    return run
+
+
+@scenario("read_entries_compressed")
+def read_entries_compressed_scenario(dataset: Dataset, workdir: Path) -> Run:
+    return _read_compressed(dataset, workdir, "zlib")
+
+
+@scenario("read_entries_compressed_lzma")
+def read_entries_compressed_lzma_scenario(dataset: Dataset, workdir: Path) -> Run:
+    return _read_compressed(dataset, workdir, "lzma")
+
+
+@scenario("between_month_compressed")
+def between_month_compressed_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.store import CompressedBackend
+
+    month = _month_in_the_middle(dataset)
+    backend = CompressedBackend(_compressed(dataset, workdir, "zlib"))
+    return lambda: sum(1 for _ in backend.between(f"{month}-01", f"{month}-31"))
+
+
+@scenario("load_challenges_json")
+def load_challenges_json_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.challenge import load_challenges_json
+
+    return lambda: len(load_challenges_json(dataset.challenges_json))
+
+
+@scenario("load_challenges_json_trusted")
+def load_challenges_json_trusted_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.challenge import load_challenges_json
+
+    return lambda: len(load_challenges_json(dataset.challenges_json, trusted=True))
+
+
+@scenario("save_challenges_csv")
+def save_challenges_csv_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.challenge import load_challenges_json, save_challenges_csv
+
+    challenges = load_challenges_json(dataset.challenges_json)
+    out = workdir / "challenges.csv"
+
+    def run() -> int:
+        save_challenges_csv(out, challenges)
+        return len(challenges)
+    return run
+
+
+@scenario("export_xlsx")
+def export_xlsx_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.store import export_xlsx
+
+    return lambda: export_xlsx(dataset.entries_csv, workdir / "practica.xlsx")
+
+
+def _client(dataset: Dataset):
+    import jinja2
+
+    from practica_tracker.app import app
+
+    if not isinstance(app.jinja_env.loader, jinja2.ChoiceLoader):
+        # the app's own templates win; the stand-ins only fill in missing ones
+        app.jinja_env.loader = jinja2.ChoiceLoader([app.jinja_env.loader, jinja2.FileSystemLoader(TEMPLATES)])
+    app.config.update(
+        PRACTICA_BACKEND="csv",
+        PRACTICA_DB=str(dataset.entries_csv),
+        PRACTICA_CHALLENGES=str(dataset.challenges_json),
+        PROPAGATE_EXCEPTIONS=True,  # report the real error, not a bare 500
+    )
+    return app.test_client()
+
+
+def _get(client, url: str):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} returned {response.status_code}")
+    return response
+
+
+@scenario("app.index")
+def app_index_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.app import PAGE_SIZE
+
+    client = _client(dataset)
+
+    def run() -> int:
+        _get(client, "/")
+        return min(PAGE_SIZE, dataset.rows)
+    return run
+
+
+@scenario("app.index_cached")
+def app_index_cached_scenario(dataset: Dataset, workdir: Path) -> Run:
+    from practica_tracker.app import PAGE_SIZE
+
+    client = _client(dataset)
+    _get(client, "/")  # rendered once, then served from the page cache
+
+    def run() -> int:
+        for _ in range(100):
+            _get(client, "/")
+        return 100 * min(PAGE_SIZE, dataset.rows)
+    return run
+
+
+@scenario("app.export_xlsx")
+def app_export_xlsx_scenario(dataset: Dataset, workdir: Path) -> Run:
+    client = _client(dataset)
+
+    def run() -> int:
+        response = _get(client, "/export/xlsx")
+        for _ in response.response:  # drain the streamed body
+            pass
+        response.close()
+        return dataset.rows
+    return run
+
+
+@scenario("app.stats")
+def app_stats_scenario(dataset: Dataset, workdir: Path) -> Run:
+    client = _client(dataset)
+
+    def run() -> int:
+        return _get(client, "/stats").get_json()["entries"]
+    return run
@@ -4,12 +4,18 @@
     Challenge helpers  ->  persistence (store)  ->  Flask app / CLI
 
 This module re-exports the public API and exposes __version__.
+The challenge helpers and `main` are imported eagerly (the CLI needs them);
+the entry store and `EntryTable` are imported on first attribute access, so
+`import practica_tracker` and the challenge commands stay fast.
 """
 
 __version__ = "0.1.0"
 
+import importlib
+
 from .challenge import (
     Challenge,
+    ChallengeCollection,
     create_challenge_today,
     get_challenge_by_date,
     load_challenges_csv,
@@ -18,12 +24,21 @@ from .challenge import (
     save_challenges_json,
     print_challenges,
 )
-from .store import Entry, append_entry, read_entries, export_xlsx
 from .main import main
 
+# exported name -> submodule it is loaded from on first access
+_LAZY_EXPORTS = {
+    "Entry": "store",
+    "append_entry": "store",
+    "read_entries": "store",
+    "export_xlsx": "store",
+    "EntryTable": "table",
+}
+
 __all__ = [
     "__version__",
     "Challenge",
+    "ChallengeCollection",
     "create_challenge_today",
     "get_challenge_by_date",
     "load_challenges_csv",
@@ -35,5 +50,19 @@ __all__ = [
     "append_entry",
     "read_entries",
     "export_xlsx",
+    "EntryTable",
     "main",
 ]
+
+
+def __getattr__(name):
+    submodule = _LAZY_EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
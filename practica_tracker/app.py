@@ -2,32 +2,366 @@
 
 Endpoints (UML-like):
 
-    [GET /] -> list entries
-    [GET/POST /add] -> create entry -> store.append_entry()
-    [GET /export/csv] -> send practica.csv
-    [GET /export/xlsx] -> export_xlsx() -> send .xlsx
+    [GET /?limit=&cursor=] -> list entries, newest first -> backend.page()
+    [GET/POST /add] -> create entry -> backend.append()
+    [GET /export/csv] -> send practica.csv (or a CSV streamed from the backend)
+    [GET /export/xlsx] -> export_xlsx() into the artifact cache -> send .xlsx
+    [POST /export/jobs] -> exports.ExportQueue.submit() -> 202 + JSON job
+    [GET /export/jobs/<id>] -> JSON job status and rows written so far
+    [GET /export/jobs/<id>/download] -> send the finished export
+    [GET /entry/<id>] -> backend.get() -> JSON entry (row-offset index for CSV)
+    [POST /entry/<id>/edit] -> backend.update() -> appends the new version
+    [POST /entry/<id>/delete] -> backend.delete() -> appends a tombstone
+    [GET /stats] -> stats.backend_stats() -> JSON rollups + streaks
+    [GET /search?tag=&q=&limit=] -> search.search_entries() -> JSON entries (CSV backend)
+    [GET /metrics] -> metrics.render() -> Prometheus text format
+
+Storage is picked by the PRACTICA_BACKEND config value ("csv", "sqlite",
+"partitioned" or "compressed", default "csv") and PRACTICA_DB (data file or directory path,
+defaults to `DB` for CSV);
+both can be set from the environment. PRACTICA_CHALLENGES points at the
+challenges JSON used for streaks. With the CSV backend, `/add` goes
+through a group-commit writer: concurrent requests are batched into one
+locked append + fsync, waiting at most PRACTICA_GROUP_COMMIT_DELAY seconds
+for company.
+
+With PRACTICA_DATA_ROOT set, one process serves many users instead: each
+request names its user in the PRACTICA_USER_HEADER header (default
+X-Practica-User, set by a proxy that authenticates) and reads and writes
+`<PRACTICA_DATA_ROOT>/<user>/` (entries and challenges.json; PRACTICA_DB and
+PRACTICA_CHALLENGES are ignored). Requests without a user answer 400. For
+local development only, PRACTICA_ALLOW_USER_PARAM also accepts `?user=`
+(remembered in the session), which lets any client act as any user. A
+`tenants.TenantManager` keeps at most PRACTICA_MAX_TENANTS users' writers,
+caches and indexes, and evicts users idle for PRACTICA_TENANT_IDLE_SECONDS.
+
+Every view is timed per endpoint (`practica_http_request_duration_seconds`)
+and template rendering is timed as its own operation. With PRACTICA_PROFILING
+enabled, adding `?profile=1` to a request samples its stack and returns the
+collapsed stacks (flame graph input) instead of the page; with it disabled
+the parameter is ignored and no sampling thread exists.
+
+`/`, `/export/csv` and `/export/xlsx` send an ETag and Last-Modified derived
+from the backend's data version (`backend.version()`) and answer conditional
+requests with 304 before doing any work (`conditional`, shared with the ASGI
+app). The CSV file download also honours Range requests (once entries have
+been edited or deleted, the live rows are streamed instead until the next
+vacuum). XLSX exports are built once per data
+version into an on-disk LRU cache (PRACTICA_ARTIFACT_DIR, at most
+PRACTICA_ARTIFACT_MAX_BYTES).
+
+Rendered `/` pages are kept gzipped in memory per data version, limit and
+cursor (`pagecache`, at most PRACTICA_PAGE_CACHE_MAX_BYTES), so repeat views
+skip both the store and the template. `/add` and the entry edits drop the
+cached pages of their store.
+
+`POST /export/jobs` (format "xlsx" or "csv", optional since/until dates and
+tag) queues an export on a pool of PRACTICA_EXPORT_WORKERS threads and
+answers at once; identical requests for the same data version share one job,
+and more than PRACTICA_EXPORT_MAX_PENDING waiting jobs answer 503. Finished
+files are kept in PRACTICA_EXPORT_DIR for PRACTICA_EXPORT_TTL seconds.
 
 This module depends on the store layer and renders templates in `templates/`.
 """
 from __future__ import annotations
 
-from flask import Flask, render_template, request, redirect, url_for, send_file, flash
+from flask import (
+    Flask, Response, g, render_template, request, redirect, url_for, send_file, flash, abort, jsonify, make_response, session,
+)
+from dataclasses import asdict
+from functools import lru_cache
+import os
 from pathlib import Path
-from practica_tracker.store import Entry, append_entry, read_entries, export_xlsx
+import time
+from typing import Iterator
+from practica_tracker import conditional, metrics
+from practica_tracker.artifacts import DEFAULT_MAX_BYTES, ArtifactCache, artifact_key
+from practica_tracker.exports import DEFAULT_MAX_PENDING, DEFAULT_TTL, DEFAULT_WORKERS, DONE, ExportQueue, QueueFull
+from practica_tracker.pagecache import DEFAULT_MAX_BYTES as DEFAULT_PAGE_CACHE_BYTES
+from practica_tracker.pagecache import PageCache, accepts_gzip, gunzip_body, page_key, store_key
+from practica_tracker.search import search_entries
+from practica_tracker.stats import backend_stats
+from practica_tracker.tenants import DEFAULT_IDLE_SECONDS, DEFAULT_MAX_TENANTS, Tenant, TenantManager
+from practica_tracker.store import (
+    CsvBackend, DataVersion, EditableBackend, Entry, StorageBackend, dead_rows, export_xlsx, get_backend,
+    iter_csv_chunks,
+)
 import tempfile
 
 app = Flask(__name__)
 app.secret_key = "dev-key-for-local"
+app.config.setdefault("PRACTICA_BACKEND", os.environ.get("PRACTICA_BACKEND", "csv"))
+app.config.setdefault("PRACTICA_DB", os.environ.get("PRACTICA_DB"))
+app.config.setdefault("PRACTICA_CHALLENGES", os.environ.get("PRACTICA_CHALLENGES", "challenges.json"))
+app.config.setdefault("PRACTICA_GROUP_COMMIT_DELAY", float(os.environ.get("PRACTICA_GROUP_COMMIT_DELAY", "0.002")))
+app.config.setdefault("PRACTICA_PROFILING", os.environ.get("PRACTICA_PROFILING", "") not in ("", "0"))
+app.config.setdefault("PRACTICA_PROFILE_INTERVAL", float(os.environ.get("PRACTICA_PROFILE_INTERVAL", "0.001")))
+app.config.setdefault("PRACTICA_ARTIFACT_DIR", os.environ.get("PRACTICA_ARTIFACT_DIR"))
+app.config.setdefault("PRACTICA_ARTIFACT_MAX_BYTES", int(os.environ.get("PRACTICA_ARTIFACT_MAX_BYTES", DEFAULT_MAX_BYTES)))
+app.config.setdefault(
+    "PRACTICA_PAGE_CACHE_MAX_BYTES", int(os.environ.get("PRACTICA_PAGE_CACHE_MAX_BYTES", DEFAULT_PAGE_CACHE_BYTES)),
+)
+app.config.setdefault("PRACTICA_DATA_ROOT", os.environ.get("PRACTICA_DATA_ROOT"))
+app.config.setdefault("PRACTICA_USER_HEADER", os.environ.get("PRACTICA_USER_HEADER", "X-Practica-User"))
+app.config.setdefault("PRACTICA_ALLOW_USER_PARAM", os.environ.get("PRACTICA_ALLOW_USER_PARAM", "") not in ("", "0"))
+app.config.setdefault("PRACTICA_MAX_TENANTS", int(os.environ.get("PRACTICA_MAX_TENANTS", DEFAULT_MAX_TENANTS)))
+app.config.setdefault(
+    "PRACTICA_TENANT_IDLE_SECONDS", float(os.environ.get("PRACTICA_TENANT_IDLE_SECONDS", DEFAULT_IDLE_SECONDS)),
+)
+app.config.setdefault("PRACTICA_EXPORT_DIR", os.environ.get("PRACTICA_EXPORT_DIR"))
+app.config.setdefault("PRACTICA_EXPORT_WORKERS", int(os.environ.get("PRACTICA_EXPORT_WORKERS", DEFAULT_WORKERS)))
+app.config.setdefault("PRACTICA_EXPORT_MAX_PENDING", int(os.environ.get("PRACTICA_EXPORT_MAX_PENDING", DEFAULT_MAX_PENDING)))
+app.config.setdefault("PRACTICA_EXPORT_TTL", float(os.environ.get("PRACTICA_EXPORT_TTL", DEFAULT_TTL)))
 
 DB = Path("practica.csv")
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+READ_CHUNK = 64 * 1024
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@lru_cache(maxsize=None)
+def _backend(kind: str, path: str | None, group_commit_delay: float | None) -> StorageBackend:
+    if kind == "csv":
+        return get_backend(kind, path, group_commit_delay=group_commit_delay)
+    return get_backend(kind, path)
+
+
+@lru_cache(maxsize=None)
+def _tenant_manager(
+    root: str, kind: str, max_tenants: int, idle_seconds: float, group_commit_delay: float | None,
+) -> TenantManager:
+    return TenantManager(root, kind, max_tenants, idle_seconds, group_commit_delay)
+
+
+def tenants() -> TenantManager | None:
+    """The per-user data manager when PRACTICA_DATA_ROOT is set, else None."""
+    root = app.config["PRACTICA_DATA_ROOT"]
+    if not root:
+        return None
+    return _tenant_manager(
+        os.path.abspath(root), app.config["PRACTICA_BACKEND"], app.config["PRACTICA_MAX_TENANTS"],
+        app.config["PRACTICA_TENANT_IDLE_SECONDS"], app.config["PRACTICA_GROUP_COMMIT_DELAY"],
+    )
+
+
+def current_user() -> str | None:
+    """The user a request is for: the user header, else (only with PRACTICA_ALLOW_USER_PARAM)
+    `?user=`, remembered in the session."""
+    user = request.headers.get(app.config["PRACTICA_USER_HEADER"])
+    if user:
+        return user
+    if not app.config["PRACTICA_ALLOW_USER_PARAM"]:
+        return None
+    user = request.args.get("user")
+    if user:
+        session["user"] = user
+        return user
+    return session.get("user")
+
+
+def tenant() -> Tenant:
+    """The current user's tenant, held until the end of the request."""
+    held = g.get("tenant")
+    if held is None:
+        user = current_user()
+        if not user:
+            abort(400, "No user given")
+        try:
+            held = g.tenant = tenants().acquire(user)
+        except ValueError as exc:
+            abort(400, str(exc))
+    return held
+
+
+def storage() -> StorageBackend:
+    """The storage backend selected by the app config (the user's, with PRACTICA_DATA_ROOT)."""
+    if tenants() is not None:
+        return tenant().backend
+    kind = app.config["PRACTICA_BACKEND"]
+    path = app.config["PRACTICA_DB"] or (str(DB) if kind == "csv" else None)
+    return _backend(kind, path, app.config["PRACTICA_GROUP_COMMIT_DELAY"])
+
+
+@lru_cache(maxsize=None)
+def _artifact_cache(root: str, max_bytes: int) -> ArtifactCache:
+    return ArtifactCache(root, max_bytes)
+
+
+def artifacts() -> ArtifactCache:
+    """The export artifact cache selected by the app config."""
+    root = app.config["PRACTICA_ARTIFACT_DIR"] or os.path.join(tempfile.gettempdir(), "practica-artifacts")
+    return _artifact_cache(root, app.config["PRACTICA_ARTIFACT_MAX_BYTES"])
+
+
+@lru_cache(maxsize=None)
+def _page_cache(max_bytes: int) -> PageCache:
+    return PageCache(max_bytes)
+
+
+def pages() -> PageCache:
+    """The rendered page cache selected by the app config."""
+    return _page_cache(app.config["PRACTICA_PAGE_CACHE_MAX_BYTES"])
+
+
+@lru_cache(maxsize=None)
+def _export_queue(root: str, workers: int, max_pending: int, ttl: float) -> ExportQueue:
+    return ExportQueue(root, workers, max_pending, ttl)
+
+
+def exports() -> ExportQueue:
+    """The background export queue selected by the app config."""
+    root = app.config["PRACTICA_EXPORT_DIR"] or os.path.join(tempfile.gettempdir(), "practica-exports")
+    return _export_queue(
+        root, app.config["PRACTICA_EXPORT_WORKERS"], app.config["PRACTICA_EXPORT_MAX_PENDING"],
+        app.config["PRACTICA_EXPORT_TTL"],
+    )
+
+
+def challenges_path() -> Path:
+    if tenants() is not None:
+        return tenant().challenges_path
+    return Path(app.config["PRACTICA_CHALLENGES"])
+
+
+def _store() -> str:
+    """`pagecache.store_key` of the configured backend."""
+    return store_key(app.config["PRACTICA_BACKEND"], storage().path)
+
+
+def _html_page(body: bytes, html: bytes | None = None) -> Response:
+    """A gzipped page as is for clients that take gzip, decompressed for the rest."""
+    if accepts_gzip(request.headers.get("Accept-Encoding")):
+        response = Response(body, mimetype="text/html")
+        response.content_encoding = "gzip"
+    else:
+        response = Response(gunzip_body(body) if html is None else html, mimetype="text/html")
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _not_modified(etag: str, version: DataVersion, weak: bool = False) -> Response | None:
+    """A 304 response when the request's validators still match, else None."""
+    if not conditional.is_fresh(request.headers.get("If-None-Match"), request.headers.get("If-Modified-Since"), etag, version):
+        return None
+    return _with_validators(Response(status=304), etag, version, weak)
+
+
+def _with_validators(response: Response, etag: str, version: DataVersion, weak: bool = False) -> Response:
+    for name, value in conditional.validators(etag, version, weak):
+        response.headers[name] = value
+    return response
+
+
+def _send_file_range(path: Path, etag: str, version: DataVersion, mimetype: str) -> Response:
+    """`path` as an attachment, or the byte range the request asks for (206 / 416)."""
+    f = path.open("rb")
+    size = os.fstat(f.fileno()).st_size  # the file as of now, rows appended meanwhile wait for the next export
+    try:
+        span = conditional.byte_range(request.headers.get("Range"), request.headers.get("If-Range"), size, etag, version)
+    except conditional.RangeNotSatisfiable:
+        f.close()
+        return Response("Range Not Satisfiable", status=416, headers={"Content-Range": f"bytes */{size}"})
+    start, stop = span or (0, size)
+    f.seek(start)
+    response = Response(_read_span(f, stop - start), status=200 if span is None else 206, mimetype=mimetype)
+    response.call_on_close(f.close)
+    response.headers["Content-Disposition"] = f"attachment; filename={path.name}"
+    response.headers["Accept-Ranges"] = "bytes"
+    response.headers["Content-Length"] = str(stop - start)
+    if span is not None:
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    return _with_validators(response, etag, version)
+
+
+def _read_span(f, remaining: int) -> Iterator[bytes]:
+    while remaining > 0:
+        chunk = f.read(min(READ_CHUNK, remaining))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+
+@app.before_request
+def _start_timing():
+    g.request_started = time.perf_counter()
+    if app.config["PRACTICA_PROFILING"] and request.args.get("profile"):
+        g.profiler = metrics.SamplingProfiler(interval=app.config["PRACTICA_PROFILE_INTERVAL"])
+        g.profiler.start()
+
+
+@app.after_request
+def _record_timing(response: Response) -> Response:
+    started = g.pop("request_started", None)
+    endpoint = request.endpoint or "unmatched"
+    if started is not None:
+        metrics.HTTP_SECONDS.observe(time.perf_counter() - started, endpoint, request.method)
+    metrics.HTTP_REQUESTS.inc(endpoint, request.method, str(response.status_code))
+    if tenants() is not None:
+        # pages and their validators differ per user behind the same URL
+        response.vary.add(app.config["PRACTICA_USER_HEADER"])
+        if app.config["PRACTICA_ALLOW_USER_PARAM"]:
+            response.vary.add("Cookie")
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    profiler.stop()
+    response.close()
+    return Response(
+        profiler.collapsed(),
+        mimetype="text/plain",
+        headers={"X-Profile-Samples": str(profiler.total), "X-Profiled-Status": str(response.status_code)},
+    )
+
+
+@app.teardown_request
+def _stop_profiler(exc: BaseException | None) -> None:
+    # the view raised before after_request could stop it
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop()
+
+
+@app.teardown_request
+def _release_tenant(exc: BaseException | None) -> None:
+    held = g.pop("tenant", None)
+    if held is not None:
+        tenants().release(held)
+
+
+def _render(template: str, **context) -> str:
+    with metrics.timer(f"render_template:{template}"):
+        return render_template(template, **context)
 
 
 @app.route("/")
 def index():
-    entries = read_entries(DB)
-    # show most recent first
-    entries = sorted(entries, key=lambda e: (e.date, e.time), reverse=True)
-    return render_template("index.html", entries=entries)
+    limit = request.args.get("limit", PAGE_SIZE, type=int)
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    cursor = request.args.get("cursor") or None
+    backend = storage()
+    version = backend.version()
+    etag = key = None
+    if version is not None and "_flashes" not in session:  # a pending flash changes the page
+        etag = f"{version.token}-{limit}-{cursor or ''}"
+        not_modified = _not_modified(etag, version, weak=True)
+        if not_modified is not None:
+            return not_modified
+        key = page_key(_store(), version, "index", limit, cursor or "")
+        body = pages().get(key)
+        if body is not None:
+            return _with_validators(_html_page(body), etag, version, weak=True)
+    # show most recent first, one page at a time
+    try:
+        page = backend.page(limit=limit, cursor=cursor)
+    except ValueError:
+        abort(400, "Invalid cursor")
+    html = _render("index.html", entries=page.entries, next_cursor=page.next_cursor, limit=limit)
+    if key is None:
+        return make_response(html)
+    html = html.encode("utf-8")
+    return _with_validators(_html_page(pages().put(key, html), html), etag, version, weak=True)
 
 
 @app.route("/add", methods=["GET", "POST"])
@@ -37,31 +371,175 @@ def add():
         if not description:
             flash("Description is required", "danger")
             return redirect(url_for("add"))
-        date_iso = request.form.get("date") or None
-        time_str = request.form.get("time") or None
-        tags = request.form.get("tags", "")
-        duration = request.form.get("duration", 0) or 0
-        entry = Entry.new(description=description, date_iso=date_iso, time_str=time_str, tags=tags, duration_minutes=duration)
-        append_entry(DB, entry)
+        try:
+            entry = Entry.from_record({
+                "description": description,
+                "date": request.form.get("date"),
+                "time": request.form.get("time"),
+                "tags": request.form.get("tags", ""),
+                "duration_minutes": request.form.get("duration"),
+            })
+        except ValueError as exc:  # same checks as imported records: dates, times, durations >= 0
+            abort(400, str(exc))
+        storage().append(entry)
+        pages().invalidate(_store())
         flash("Entry added", "success")
         return redirect(url_for("index"))
-    return render_template("add.html")
+    return _render("add.html")
 
 
 @app.route("/export/xlsx")
 def export_xlsx_route():
-    tmp = tempfile.NamedTemporaryFile(prefix="practica-", suffix=".xlsx", delete=False)
-    tmp.close()
-    export_xlsx(DB, Path(tmp.name))
-    return send_file(tmp.name, as_attachment=True, download_name="practica.xlsx")
+    backend = storage()
+    kind = app.config["PRACTICA_BACKEND"]
+    version = backend.version()
+    if version is None:
+        # nothing stored yet: an empty workbook, not worth caching
+        tmp = tempfile.TemporaryFile(prefix="practica-", suffix=".xlsx")
+        try:
+            export_xlsx(backend.path, tmp, backend=kind)
+            tmp.seek(0)
+        except BaseException:
+            tmp.close()
+            raise
+        return send_file(tmp, as_attachment=True, download_name="practica.xlsx", mimetype=XLSX_MIMETYPE)
+    etag = f"{version.token}-xlsx"
+    not_modified = _not_modified(etag, version)
+    if not_modified is not None:
+        return not_modified
+    path = artifacts().get_or_build(
+        artifact_key(kind, backend.path, version, ".xlsx"),
+        lambda tmp: export_xlsx(backend.path, tmp, backend=kind),
+    )
+    response = send_file(path, as_attachment=True, download_name="practica.xlsx", mimetype=XLSX_MIMETYPE, etag=etag)
+    return _with_validators(response, etag, version)
 
 
 @app.route("/export/csv")
 def export_csv_route():
-    if not DB.exists():
+    backend = storage()
+    version = backend.version()
+    if version is None:
         flash("No data to export", "warning")
         return redirect(url_for("index"))
-    return send_file(DB, as_attachment=True, download_name=DB.name)
+    if isinstance(backend, CsvBackend) and not dead_rows(backend.path):
+        # appends only add bytes (a vacuum renames a new file in, a new ETag),
+        # so byte ranges stay valid as it grows
+        not_modified = _not_modified(version.token, version)
+        if not_modified is not None:
+            return not_modified
+        return _send_file_range(backend.path, version.token, version, "text/csv")
+    etag = f"{version.token}-csv"
+    not_modified = _not_modified(etag, version)
+    if not_modified is not None:
+        return not_modified
+    response = Response(
+        iter_csv_chunks(backend.iter_entries()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=practica.csv"},
+    )
+    return _with_validators(response, etag, version)
+
+
+@app.route("/export/jobs", methods=["POST"])
+def export_jobs_route():
+    params = request.get_json(silent=True) or request.form
+    # the job outlives the request and the tenant's pin, so it gets a backend of its own
+    backend = get_backend(app.config["PRACTICA_BACKEND"], storage().path)
+    try:
+        job = exports().submit(
+            backend, _store(), params.get("format", "xlsx"),
+            since=params.get("since"), until=params.get("until"), tag=params.get("tag"),
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except QueueFull as exc:
+        return jsonify({"error": str(exc)}), 503, {"Retry-After": "5"}
+    return jsonify(job.to_dict()), 202, {"Location": url_for("export_job_route", job_id=job.id)}
+
+
+@app.route("/export/jobs/<job_id>")
+def export_job_route(job_id: str):
+    job = exports().get(job_id)
+    if job is None or job.store != _store():  # another user's job is not found either
+        abort(404)
+    return jsonify(job.to_dict())
+
+
+@app.route("/export/jobs/<job_id>/download")
+def export_job_download_route(job_id: str):
+    job = exports().get(job_id)
+    if job is None or job.store != _store():
+        abort(404)
+    if job.status != DONE:
+        return jsonify(job.to_dict()), 409
+    mimetype = XLSX_MIMETYPE if job.format == "xlsx" else "text/csv"
+    return send_file(job.path, as_attachment=True, download_name=job.filename, mimetype=mimetype)
+
+
+@app.route("/entry/<entry_id>")
+def entry_route(entry_id: str):
+    entry = storage().get(entry_id)
+    if entry is None:
+        abort(404, "No such entry")
+    return jsonify(asdict(entry))
+
+
+def _editable() -> EditableBackend:
+    backend = storage()
+    if not isinstance(backend, EditableBackend):
+        abort(501, f"The {app.config['PRACTICA_BACKEND']} backend cannot edit entries")
+    return backend
+
+
+@app.route("/entry/<entry_id>/edit", methods=["POST"])
+def edit_entry_route(entry_id: str):
+    fields = {name: request.form[name].strip() for name in ("description", "date", "time", "tags") if name in request.form}
+    if "duration" in request.form:
+        fields["duration_minutes"] = request.form["duration"] or 0
+    backend = _editable()
+    try:
+        entry = backend.update(entry_id, **fields)
+    except ValueError as exc:
+        abort(400, str(exc))
+    if entry is None:
+        abort(404, "No such entry")
+    pages().invalidate(_store())
+    flash("Entry updated", "success")
+    return redirect(url_for("index"))
+
+
+@app.route("/entry/<entry_id>/delete", methods=["POST"])
+def delete_entry_route(entry_id: str):
+    if not _editable().delete(entry_id):
+        abort(404, "No such entry")
+    pages().invalidate(_store())
+    flash("Entry deleted", "success")
+    return redirect(url_for("index"))
+
+
+@app.route("/stats")
+def stats_route():
+    return jsonify(backend_stats(storage(), challenges_path()))
+
+
+@app.route("/search")
+def search_route():
+    backend = storage()
+    if not isinstance(backend, CsvBackend):
+        abort(501, "Search needs the CSV backend")
+    tag = request.args.get("tag", "").strip() or None
+    q = request.args.get("q", "").strip() or None
+    if tag is None and q is None:
+        abort(400, "Give a tag and/or q")
+    limit = min(max(request.args.get("limit", PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    entries = search_entries(backend.path, tag=tag, q=q, limit=limit)
+    return jsonify(entries=[asdict(e) for e in entries])
+
+
+@app.route("/metrics")
+def metrics_route():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""On-disk cache for generated export files.
+
+
+Responsibilities:
+- `ArtifactCache` keeps generated files (XLSX exports) in a directory, keyed
+  by a name that embeds the data version they were built from
+- A hit is served as-is; a miss builds the file once per key (concurrent
+  requests for the same key wait for that build) and publishes it atomically
+- The directory is bounded to `max_bytes`; the least recently used files are
+  evicted first (use time is the file's mtime, refreshed on every hit)
+
+A key never needs invalidating: new data means a new version, so a new key,
+and the stale artifact simply ages out.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+import re
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from practica_tracker import metrics
+from practica_tracker.store import DataVersion
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_GRACE_SECONDS = 5.0  # files used this recently are never evicted (they may be mid-download)
+
+_KEY = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+ARTIFACTS = metrics.Counter("practica_artifact_cache_total", "Artifact cache lookups and evictions", ("result",))
+
+
+class ArtifactCache:
+    """Generated files under `root`, at most `max_bytes` in total. Thread safe."""
+
+    def __init__(self, root: Path | str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._building: dict[str, threading.Lock] = {}
+
+    def path(self, key: str) -> Path:
+        if not _KEY.match(key):
+            raise ValueError(f"Invalid artifact key: {key!r}")
+        return self.root / key
+
+    def get(self, key: str) -> Path | None:
+        """The artifact for `key` if it is cached (and mark it as just used)."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_or_build(self, key: str, build: Callable[[Path], None]) -> Path:
+        """The artifact for `key`, calling `build(tmp_path)` to write it on a miss."""
+        path = self.get(key)
+        if path is not None:
+            ARTIFACTS.inc("hit")
+            return path
+        with self._lock:
+            key_lock = self._building.setdefault(key, threading.Lock())
+        with key_lock:
+            path = self.get(key)  # built while we waited
+            if path is not None:
+                ARTIFACTS.inc("hit")
+                return path
+            ARTIFACTS.inc("miss")
+            path = self.path(key)
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".build-", suffix=".tmp")
+            os.close(fd)
+            try:
+                build(Path(tmp))
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        self.evict(keep=key)
+        return path
+
+    def evict(self, keep: str | None = None) -> int:
+        """Delete least recently used artifacts until the cache fits, returns how many."""
+        files = []
+        for entry in os.scandir(self.root) if self.root.exists() else ():
+            if entry.name.startswith(".") or not entry.is_file():
+                continue  # in-progress builds
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, entry.name))
+        total = sum(size for _, size, _ in files)
+        now = time.time()
+        removed = 0
+        for mtime, size, name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if name == keep or now - mtime < EVICT_GRACE_SECONDS:
+                continue
+            try:
+                os.unlink(self.root / name)
+            except FileNotFoundError:
+                pass  # another process got there first
+            total -= size
+            removed += 1
+        if removed:
+            ARTIFACTS.inc("evicted", amount=removed)
+        return removed
+
+
+def artifact_key(kind: str, path: Path | str, version: DataVersion, suffix: str) -> str:
+    """Cache key for an export of the `kind` backend data at `path`, as of `version`."""
+    where = hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:12]
+    return f"{kind}-{where}-{version.token}{suffix}"
@@ -4,14 +4,31 @@
 Responsibilities:
 - Represent a daily challenge entry
 - Convert to/from dict for JSON/CSV persistence
-- Provide helpers to save/load lists of Challenge objects
+- Provide helpers to save/load lists of Challenge objects, and iterators that
+  stream them from JSON/CSV without holding the whole document
+- Keep challenges indexed by date and status (ChallengeCollection)
+- Journal single changes to an append-only log and compact it into the JSON snapshot;
+  appends and compaction take turns through an `fcntl` lock on the journal
+- Report load/save timings, rows and bytes to `metrics`
 """
 
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
 import csv
 import json
+import os
+import re
+import tempfile
 from datetime import date
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Iterable, Iterator, List
+
+from practica_tracker import metrics
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 status_pendant = "pending"
 status_completed = "completed"
@@ -22,6 +39,8 @@ VALID_STATUSES = {status_pendant, status_completed} #helper for status
 
 
 class Challenge:
+    __slots__ = ("date", "description", "status")
+
     def __init__(self, date: date, description: str, status: str = status_pendant):
         # validate status strictly against allowed values
         if status not in VALID_STATUSES:
@@ -42,9 +61,13 @@ class Challenge:
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Challenge":
+    def from_dict(cls, data: dict, trusted: bool = False) -> "Challenge":
         """Create a Challenge instance from a dict produced by to_dict. This method is robust
-        to whitespace and missing fields commonly found in CSV/JSON inputs."""
+        to whitespace and missing fields commonly found in CSV/JSON inputs.
+        With trusted=True the dict must be exactly what to_dict produced: no stripping
+        or defaults, only the date parse and the status check in __init__."""
+        if trusted:
+            return cls(date.fromisoformat(data["date"]), data["description"], data["status"])
         # date: accept either a date object or an ISO date string (with whitespace)
         raw_date = data.get("date")
         if isinstance(raw_date, date):
@@ -79,34 +102,407 @@ class Challenge:
         )
 
 
+class ChallengeCollection:
+    """Challenges indexed by date, with sorted views kept up to date.
+
+    Holds a dict keyed by date for O(1) lookup, a sorted list of dates and one
+    sorted list of dates per status (a date once per challenge with that
+    status). The views are maintained with bisect on `add`/`complete`, so
+    listing never re-sorts. `add` refuses a second challenge for a date, but
+    data loaded with duplicated dates keeps all of them: lookups by date
+    (`get`, `complete`) use the first one, like `get_challenge_by_date`, and
+    `in_file_order` gives them back as loaded, so saving round-trips the file.
+
+    Change statuses through `complete` rather than on the challenge itself,
+    otherwise the per-status views go stale.
+    """
+
+    def __init__(self, challenges: Iterable[Challenge] = ()):
+        self._loaded: List[Challenge] = list(challenges)
+        self._by_date: dict[date, List[Challenge]] = {}
+        for challenge in self._loaded:
+            self._by_date.setdefault(challenge.date, []).append(challenge)
+        self._dates = sorted(self._by_date)
+        self._by_status: dict[str, List[date]] = {status: [] for status in VALID_STATUSES}
+        for d in self._dates:
+            for challenge in self._by_date[d]:
+                self._by_status[challenge.status].append(d)
+
+    def __len__(self) -> int:
+        return len(self._loaded)
+
+    def __contains__(self, target_date: date) -> bool:
+        return target_date in self._by_date
+
+    def __iter__(self):
+        """iterates challenges ordered by date"""
+        by_date = self._by_date
+        return (challenge for d in self._dates for challenge in by_date[d])
+
+    def get(self, target_date: date) -> Challenge | None:
+        same_day = self._by_date.get(target_date)
+        return same_day[0] if same_day else None
+
+    def add(self, challenge: Challenge) -> bool:
+        """adds a challenge, returns False if that date already has one"""
+        if challenge.date in self._by_date:
+            return False
+        self._loaded.append(challenge)
+        self._by_date[challenge.date] = [challenge]
+        insort(self._dates, challenge.date)
+        insort(self._by_status[challenge.status], challenge.date)
+        return True
+
+    def complete(self, target_date: date) -> Challenge | None:
+        """marks the challenge of that date completed, returns None if there is none"""
+        challenge = self.get(target_date)
+        if challenge is None:
+            return None
+        if challenge.status != status_completed:
+            old = self._by_status[challenge.status]
+            del old[bisect_left(old, target_date)]
+            challenge.complete_challenge()
+            insort(self._by_status[status_completed], target_date)
+        return challenge
+
+    def sorted(self) -> List[Challenge]:
+        return list(self)
+
+    def in_file_order(self) -> List[Challenge]:
+        """every challenge in the order it was loaded or added, for saving"""
+        return list(self._loaded)
+
+    def _on_dates(self, dates: List[date], status: str | None = None) -> List[Challenge]:
+        # `dates` is sorted and may repeat a date once per challenge on it
+        found = []
+        previous = None
+        for d in dates:
+            if d != previous:
+                found.extend(c for c in self._by_date[d] if status is None or c.status == status)
+                previous = d
+        return found
+
+    def by_status(self, status: str) -> List[Challenge]:
+        """returns challenges with that status ordered by date"""
+        if status not in VALID_STATUSES:
+            raise ValueError(f"status must be one of {VALID_STATUSES}")
+        return self._on_dates(self._by_status[status], status)
+
+    def between(self, since: date | None = None, until: date | None = None, status: str | None = None) -> List[Challenge]:
+        """returns challenges with since <= date <= until (both optional), ordered by date"""
+        if status is None:
+            dates = self._dates
+        elif status in VALID_STATUSES:
+            dates = self._by_status[status]
+        else:
+            raise ValueError(f"status must be one of {VALID_STATUSES}")
+        lo = bisect_left(dates, since) if since is not None else 0
+        hi = bisect_right(dates, until) if until is not None else len(dates)
+        return self._on_dates(dates[lo:hi], status)
+
+
 # helpers to save and load challenges ---
 
+_JSON_CHUNK = 64 * 1024
+_JSON_SPACE = re.compile(r"[ \t\n\r]*")
+_JSON_AFTER_ITEM = re.compile(r"[ \t\n\r]*([,\]])?[ \t\n\r]*")
+_json_decoder = json.JSONDecoder()
+
+
+def _iter_json_array(handle, chunk_size: int = _JSON_CHUNK) -> Iterator[object]:
+    """yields the items of the top-level JSON array in `handle`, reading
+    `chunk_size` characters at a time.
+
+    The objects buffered up to the last "}" are decoded in one `json.loads`
+    call (a proper prefix of a JSON value never parses, so if the slice
+    parses every item in it is whole); when it doesn't parse, e.g. the "}"
+    sits inside a string, the buffer is decoded item by item instead."""
+    decode = _json_decoder.raw_decode
+    after_item = _JSON_AFTER_ITEM.match
+    buf, pos, eof, batch = "", 0, False, True
+
+    def refill() -> None:
+        nonlocal buf, pos, eof, batch
+        chunk = handle.read(chunk_size)
+        buf, pos, eof, batch = buf[pos:] + chunk, 0, not chunk, True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            pos = _JSON_SPACE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            refill()
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("Expecting '['", buf, pos)
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            items = None
+            if batch:
+                cut = buf.rfind("}", pos) + 1
+                try:
+                    items = json.loads("[" + buf[pos:cut] + "]") if cut else None
+                except json.JSONDecodeError:
+                    pass
+                batch = items is not None
+                end = cut
+            if items is None:
+                try:
+                    item, end = decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    refill()  # probably cut off at the end of the buffer
+                    pos = _JSON_SPACE.match(buf).end()  # raw_decode won't skip it
+                    continue
+                items = (item,)
+            match = after_item(buf, end)
+            sep = match.group(1)
+            if sep is None:
+                if eof:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, match.end())
+                refill()  # the last item ("12" of "123") or its delimiter goes on in the next chunk
+                continue
+            yield from items
+            pos = match.end()
+            if sep == "]":
+                break
+    if next_char():
+        raise json.JSONDecodeError("Extra data", buf, pos)
+
+
+def iter_challenges_json(path: str | Path, trusted: bool = False) -> Iterator[Challenge]:
+    """Stream the challenges of a JSON snapshot, one at a time (the journal is not applied).
+    trusted=True is for files written by this tool, see Challenge.from_dict."""
+    rows = 0
+    with Path(path).open("r", encoding="utf-8") as handle:
+        try:
+            for item in _iter_json_array(handle):
+                yield Challenge.from_dict(item, trusted)
+                rows += 1
+        finally:
+            metrics.count_rows("challenges_json", rows)
+            metrics.count_bytes_read("challenges_json", handle.buffer.tell())
+
+
+def iter_challenges_csv(path: str | Path, trusted: bool = False) -> Iterator[Challenge]:
+    """Stream the challenges of a CSV file, one row at a time."""
+    rows = 0
+    with Path(path).open("r", newline="", encoding="utf-8") as handle:
+        try:
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if header is None:
+                return
+            positional = trusted and header == CSV_FIELDS
+            for values in reader:
+                if not values:
+                    continue
+                if positional:
+                    challenge = Challenge(date.fromisoformat(values[0]), values[1], values[2])
+                else:
+                    challenge = Challenge.from_dict(dict(zip(header, values)), trusted)
+                rows += 1
+                yield challenge
+        finally:
+            metrics.count_rows("challenges_csv", rows)
+            metrics.count_bytes_read("challenges_csv", handle.buffer.tell())
+
+
+@metrics.timed("save_challenges_json")
 def save_challenges_json(path: str | Path, challenges: Iterable[Challenge]) -> None:
     data = [c.to_dict() for c in challenges]
     Path(path).write_text(json.dumps(data, ensure_ascii=False , indent=2), encoding="utf-8")
+    metrics.count_rows("challenges_json", len(data), "written")
+    metrics.count_bytes_written("challenges_json", Path(path).stat().st_size)
 
 
-def load_challenges_json(path: str | Path) -> List[Challenge]:
-    raw = json.loads(Path(path).read_text(encoding="utf-8"))
-    return [Challenge.from_dict(item) for item in raw]
+@metrics.timed("load_challenges_json")
+def load_challenges_json(path: str | Path, trusted: bool = False) -> List[Challenge]:
+    """Load the JSON snapshot and replay its journal on top, if there is one.
+    A missing snapshot is fine as long as the journal exists."""
+    path = Path(path)
+    log = journal_path(path)
+    if path.exists() or not log.exists():
+        challenges = list(iter_challenges_json(path, trusted))
+    else:
+        challenges = []
+    replay_journal(path, challenges)
+    return challenges
 
 
+@metrics.timed("save_challenges_csv")
 def save_challenges_csv(path: str | Path, challenges: Iterable[Challenge]) -> None:
+    rows = 0
     with Path(path).open("w", newline="", encoding="utf-8") as handle:
         writer = csv.DictWriter(handle, fieldnames=CSV_FIELDS)
         writer.writeheader()
         for challenge in challenges:
             writer.writerow(challenge.to_dict())
-
-
-def load_challenges_csv(path: str | Path) -> List[Challenge]:
-    with Path(path).open("r", newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        return [Challenge.from_dict(row) for row in reader]
-
-
-def get_challenge_by_date(challenges: List[Challenge], target_date: date) -> Challenge | None:
+            rows += 1
+        size = handle.tell()
+    metrics.count_rows("challenges_csv", rows, "written")
+    metrics.count_bytes_written("challenges_csv", size)
+
+
+# append-only journal ---
+# Each add/complete is one JSON line in "<snapshot>.log" next to the JSON file.
+# Loading replays the log over the snapshot; compaction folds it back in.
+
+JOURNAL_ADD = "add"
+JOURNAL_COMPLETE = "complete"
+COMPACT_RATIO = 0.5
+COMPACT_MIN_BYTES = 16 * 1024
+
+
+def journal_path(path: str | Path) -> Path:
+    """returns the journal file that belongs to a JSON snapshot"""
+    path = Path(path)
+    return path.with_name(path.name + ".log")
+
+
+def append_journal(path: str | Path, op: str, challenge: Challenge) -> None:
+    """Append one change to the journal of the snapshot at `path`."""
+    if op == JOURNAL_ADD:
+        record = {"op": op, **challenge.to_dict()}
+    elif op == JOURNAL_COMPLETE:
+        record = {"op": op, "date": challenge.date.isoformat()}
+    else:
+        raise ValueError(f"Invalid journal op: {op}")
+    with _locked_journal(path) as handle:
+        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def _locked_journal(path: str | Path) -> Iterator:
+    """The journal of `path` opened for appending, exclusively locked.
+
+    Compaction unlinks the journal while holding the lock, so a writer that
+    was waiting for it reopens the path instead of writing to the unlinked file.
+    """
+    log = journal_path(path)
+    while True:
+        handle = log.open("a", encoding="utf-8")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                current = os.stat(log)
+            except FileNotFoundError:
+                current = None
+            held = os.fstat(handle.fileno())
+            if current is not None and (current.st_dev, current.st_ino) == (held.st_dev, held.st_ino):
+                yield handle
+                return
+        finally:
+            handle.close()  # also releases the lock
+
+
+def replay_journal(path: str | Path, challenges: List[Challenge]) -> int:
+    """Apply the journal of `path` to `challenges` in place, returns how many
+    records were applied. Replaying is idempotent, so a journal that was
+    already folded into the snapshot does no harm."""
+    log = journal_path(path)
+    if not log.exists():
+        return 0
+    by_date: dict[date, Challenge] = {}
+    for challenge in challenges:
+        by_date.setdefault(challenge.date, challenge)
+    applied = 0
+    with log.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.endswith("\n"):
+                break  # torn last write
+            record = json.loads(line)
+            op = record.pop("op", None)
+            if op == JOURNAL_ADD:
+                challenge = Challenge.from_dict(record)
+                if challenge.date not in by_date:
+                    by_date[challenge.date] = challenge
+                    challenges.append(challenge)
+            elif op == JOURNAL_COMPLETE:
+                challenge = by_date.get(date.fromisoformat(record["date"]))
+                if challenge is not None:
+                    challenge.complete_challenge()
+            else:
+                raise ValueError(f"Invalid journal op: {op}")
+            applied += 1
+    return applied
+
+
+def _replace_atomically(path: Path, write: Callable) -> None:
+    """writes through `write(handle)` into a temp file next to `path` and renames it over `path`"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with open(fd, "w", newline="", encoding="utf-8") as handle:
+            write(handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@metrics.timed("write_snapshot")
+def write_snapshot(path: str | Path, challenges: Iterable[Challenge], csv_path: str | Path | None = None) -> None:
+    """Atomically write a fresh JSON snapshot (and CSV mirror) and drop the journal."""
+    with _locked_journal(path):
+        _write_snapshot(Path(path), challenges, csv_path)
+
+
+def _write_snapshot(path: Path, challenges: Iterable[Challenge], csv_path: str | Path | None) -> None:
+    # called with the journal locked
+    data = [c.to_dict() for c in challenges]
+    _replace_atomically(path, lambda handle: handle.write(json.dumps(data, ensure_ascii=False, indent=2)))
+    if csv_path is not None:
+        def write_csv(handle):
+            writer = csv.DictWriter(handle, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(data)
+        _replace_atomically(Path(csv_path), write_csv)
+    journal_path(path).unlink(missing_ok=True)
+
+
+def compact_challenges(path: str | Path, csv_path: str | Path | None = None) -> int:
+    """Fold the journal into a fresh snapshot, returns the number of challenges.
+
+    The journal stays locked from loading to dropping it, so no append is lost.
+    """
+    with _locked_journal(path):
+        challenges = load_challenges_json(path)
+        _write_snapshot(Path(path), challenges, csv_path)
+    return len(challenges)
+
+
+def maybe_compact(path: str | Path, csv_path: str | Path | None = None) -> bool:
+    """Compact once the journal outgrows COMPACT_MIN_BYTES and COMPACT_RATIO of the snapshot."""
+    path = Path(path)
+    try:
+        log_size = journal_path(path).stat().st_size
+    except FileNotFoundError:
+        return False
+    snapshot_size = path.stat().st_size if path.exists() else 0
+    if log_size < max(COMPACT_MIN_BYTES, COMPACT_RATIO * snapshot_size):
+        return False
+    compact_challenges(path, csv_path)
+    return True
+
+
+@metrics.timed("load_challenges_csv")
+def load_challenges_csv(path: str | Path, trusted: bool = False) -> List[Challenge]:
+    return list(iter_challenges_csv(path, trusted))
+
+
+def get_challenge_by_date(challenges: List[Challenge] | ChallengeCollection, target_date: date) -> Challenge | None:
     """Find and returns a challenge by date. Returns None if not found."""
+    if isinstance(challenges, ChallengeCollection):
+        return challenges.get(target_date)
     for challenge in challenges:
         if challenge.date == target_date:
             return challenge
@@ -127,8 +523,10 @@ def mark_challenge_completed (challenge: Challenge) -> None:
     challenge.complete_challenge()
 
 
-def list_challenge_sorted (challenges: List[Challenge]) -> List[Challenge]:
+def list_challenge_sorted (challenges: List[Challenge] | ChallengeCollection) -> List[Challenge]:
     """returns a list of challenges sorted by date."""
+    if isinstance(challenges, ChallengeCollection):
+        return challenges.sorted()
     return sorted(challenges, key=lambda c: c.date)
 
 
@@ -137,13 +535,17 @@ def format_challenge(challenge: Challenge, index: int) -> str:
     return f"{index},{challenge.date} - {challenge.description} [{challenge.status}]"
 
 
-def print_challenges(challenges: List[Challenge], status: str | None = None) -> None:
+def print_challenges(challenges: List[Challenge] | ChallengeCollection, status: str | None = None) -> None:
     """shows challenges ordered. optionally i can filter by status"""
-    if status:
-        if status not in VALID_STATUSES:
-            raise ValueError(f"status must be one of {VALID_STATUSES}")
-        challenges = [c for c in challenges if c.status == status]
-    challenges = sorted(challenges, key=lambda c: c.date)
+    if isinstance(challenges, ChallengeCollection):
+        # already ordered, no need to sort again
+        challenges = challenges.by_status(status) if status else challenges.sorted()
+    else:
+        if status:
+            if status not in VALID_STATUSES:
+                raise ValueError(f"status must be one of {VALID_STATUSES}")
+            challenges = [c for c in challenges if c.status == status]
+        challenges = sorted(challenges, key=lambda c: c.date)
     if not challenges:
         print("No challenges found.")
         return
@@ -152,8 +554,10 @@ def print_challenges(challenges: List[Challenge], status: str | None = None) ->
         print(format_challenge(challenge, i))
 
 
-def filter_by_status (challenges: List[Challenge], status: str) -> List[Challenge]:
+def filter_by_status (challenges: List[Challenge] | ChallengeCollection, status: str) -> List[Challenge]:
     """returns challenges filtered by status."""
+    if isinstance(challenges, ChallengeCollection):
+        return challenges.by_status(status)
     if status not in VALID_STATUSES:
         raise ValueError(f"status must be one of {VALID_STATUSES}")
     return [challenge for challenge in challenges if challenge.status == status]
@@ -0,0 +1,96 @@
+"""Conditional and range requests, shared by the Flask and ASGI apps.
+
+
+Responsibilities:
+- `validators` gives the ETag / Last-Modified / Cache-Control headers sent
+  for a data version (`store.DataVersion`)
+- `is_fresh` tells whether a request's If-None-Match / If-Modified-Since still
+  match, so a 304 is enough
+- `byte_range` picks the byte range a Range request asks for, following
+  RFC 9110: a range that does not parse (`bytes=5-2`, several ranges, another
+  unit) or an outdated If-Range is ignored and the whole file is sent; only a
+  range starting past the end is unsatisfiable (416)
+
+Everything works on plain header values (None when absent), so each app
+passes what its request object has.
+"""
+from __future__ import annotations
+
+from email.utils import formatdate, parsedate_to_datetime
+import re
+
+from practica_tracker.store import DataVersion
+
+_BYTE_RANGE = re.compile(r"([0-9]*)-([0-9]*)")
+
+
+class RangeNotSatisfiable(ValueError):
+    """The Range header asks for bytes the file does not have (answer 416)."""
+
+
+def validators(etag: str, version: DataVersion, weak: bool = False) -> list[tuple[str, str]]:
+    return [
+        ("ETag", f'W/"{etag}"' if weak else f'"{etag}"'),
+        ("Last-Modified", formatdate(version.mtime, usegmt=True)),
+        ("Cache-Control", "no-cache"),  # always revalidate, the data changes
+    ]
+
+
+def etag_listed(header: str, etag: str, weak: bool = True) -> bool:
+    """Does an If-None-Match / If-Range header name `etag`? (weak: ignore W/)"""
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            if not weak:
+                continue
+            tag = tag[2:]
+        if tag.strip('"') == etag:
+            return True
+    return False
+
+
+def not_modified_since(header: str | None, version: DataVersion) -> bool:
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(version.mtime) <= since
+
+
+def is_fresh(if_none_match: str | None, if_modified_since: str | None, etag: str, version: DataVersion) -> bool:
+    """True when the client's cached copy is current (a 304 is enough)."""
+    if if_none_match is not None:
+        return etag_listed(if_none_match, etag)
+    return not_modified_since(if_modified_since, version)
+
+
+def byte_range(header: str | None, if_range: str | None, size: int, etag: str, version: DataVersion) -> tuple[int, int] | None:
+    """The single `bytes=` range asked for, as (start, stop), or None for the whole file.
+
+    Raises RangeNotSatisfiable when the range starts at or past `size`.
+    """
+    unit, _, spec = (header or "").partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    if if_range:
+        current = etag_listed(if_range, etag, weak=False) if '"' in if_range else not_modified_since(if_range, version)
+        if not current:
+            return None
+    match = _BYTE_RANGE.fullmatch(spec.strip())
+    if match is None or match.group() == "-":
+        return None
+    first, last = match.groups()
+    if not first:  # the last `last` bytes
+        if int(last) == 0 or size == 0:
+            raise RangeNotSatisfiable(f"unsatisfiable range: {header}")
+        return max(size - int(last), 0), size
+    start = int(first)
+    if last and int(last) < start:
+        return None  # not a valid range, so it is ignored
+    if start >= size:
+        raise RangeNotSatisfiable(f"unsatisfiable range: {header}")
+    return start, min(int(last) + 1, size) if last else size
@@ -0,0 +1,257 @@
+"""Background export jobs.
+
+
+Responsibilities:
+- `ExportQueue` runs XLSX and CSV exports of a backend on a bounded pool of
+  worker threads, off the request path, and refuses new jobs once
+  `max_pending` are waiting
+- A job is named after what it exports: the store, its data version, the
+  format and the filters (date range, tag). Submitting a job identical to a
+  queued, running or finished one returns that job instead of a second run
+- Each job owns the backend it exports and closes it when it has run, so
+  the data stays open however long the job waits or runs
+- Jobs report progress as rows written; the finished file is kept in the
+  queue's directory until `ttl` seconds after the job finished, then the job
+  and its file are dropped (checked whenever the queue is used), as are
+  stray files in the directory older than `ttl`
+
+Jobs live in the process that runs them, so status polling must reach the
+same process (one app process, or sticky routing).
+
+Used by `POST /export/jobs`, `GET /export/jobs/<id>` and
+`GET /export/jobs/<id>/download` in the Flask app.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Iterator
+
+from practica_tracker import metrics
+from practica_tracker.store import EXPORT_PROGRESS_ROWS, Entry, StorageBackend, iter_csv_chunks, write_xlsx
+from practica_tracker.table import tag_tokens
+
+FORMATS = ("xlsx", "csv")
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 16
+DEFAULT_TTL = 3600.0
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+EXPORT_JOBS = metrics.Counter("practica_export_jobs_total", "Export jobs by format and outcome", ("format", "result"))
+
+
+class QueueFull(RuntimeError):
+    """Raised by `ExportQueue.submit` when `max_pending` jobs are already waiting."""
+
+
+@dataclass
+class ExportJob:
+    id: str
+    format: str
+    store: str = ""
+    since: str | None = None
+    until: str | None = None
+    tag: str | None = None
+    status: str = QUEUED
+    rows: int = 0
+    error: str | None = None
+    path: Path | None = None
+    created: float = field(default_factory=time.time)
+    finished: float | None = None
+
+    @property
+    def filename(self) -> str:
+        return f"practica.{self.format}"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "format": self.format,
+            "filters": {"since": self.since, "until": self.until, "tag": self.tag},
+            "status": self.status,
+            "rows": self.rows,
+            "error": self.error,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+def _check_date(value: str | None, name: str) -> str | None:
+    if not value:
+        return None
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"invalid {name}: {value!r}") from None
+    return value
+
+
+def select_entries(backend: StorageBackend, since: str | None = None, until: str | None = None, tag: str | None = None) -> Iterator[Entry]:
+    """Entries of `backend` dated `since` to `until` (inclusive) and carrying `tag`."""
+    entries = backend.between(since, until) if since or until else backend.iter_entries()
+    if not tag:
+        return iter(entries)
+    wanted = tag_tokens(tag)
+    return (e for e in entries if wanted <= tag_tokens(e.tags))
+
+
+class ExportQueue:
+    """Export jobs run by `workers` threads, files kept under `root`. Thread safe."""
+
+    def __init__(
+        self,
+        root: Path | str,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        ttl: float = DEFAULT_TTL,
+    ):
+        self.root = Path(root)
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="practica-export-job")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, ExportJob] = {}
+
+    def submit(
+        self,
+        backend: StorageBackend,
+        store: str,
+        format: str,
+        since: str | None = None,
+        until: str | None = None,
+        tag: str | None = None,
+    ) -> ExportJob:
+        """Queue an export of `backend` (named `store`, see `pagecache.store_key`), or
+        return the job already exporting the same data. Raises ValueError for a bad
+        format or date and `QueueFull` when too many jobs are waiting.
+
+        The queue owns `backend` from here on: it is closed once the job has
+        run, or right away when no new job runs it. Pass an instance of its
+        own, not one a request or tenant may close meanwhile.
+        """
+        try:
+            job, queued = self._queue(backend, store, format, since, until, tag)
+        except BaseException:
+            backend.close()
+            raise
+        if not queued:
+            backend.close()
+        return job
+
+    def _queue(
+        self, backend: StorageBackend, store: str, format: str, since: str | None, until: str | None, tag: str | None,
+    ) -> tuple[ExportJob, bool]:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format: {format!r} (expected one of {', '.join(FORMATS)})")
+        since, until = _check_date(since, "since"), _check_date(until, "until")
+        tag = tag.strip() if tag and tag.strip() else None
+        version = backend.version()
+        spec = [store, version.token if version else None, format, since, until, tag]
+        job_id = hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()[:16]
+        self.expire()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status != FAILED:
+                EXPORT_JOBS.inc(format, "deduplicated")
+                return job, False
+            if sum(1 for j in self._jobs.values() if j.status == QUEUED) >= self.max_pending:
+                raise QueueFull(f"{self.max_pending} export jobs are already waiting")
+            job = self._jobs[job_id] = ExportJob(job_id, format, store, since, until, tag)
+        self._pool.submit(self._run, job, backend)
+        return job, True
+
+    def get(self, job_id: str) -> ExportJob | None:
+        self.expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def expire(self, now: float | None = None) -> int:
+        """Drop jobs that finished more than `ttl` seconds ago with their files, returns how many."""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [j for j in self._jobs.values() if j.finished is not None and now - j.finished > self.ttl]
+            for job in expired:
+                del self._jobs[job.id]
+            kept = set(self._jobs)
+        for job in expired:
+            if job.path is not None:
+                job.path.unlink(missing_ok=True)
+        # files left behind by an earlier process (or a crashed job) have no job
+        for path in self.root.glob("*") if self.root.is_dir() else ():
+            try:
+                if _job_of(path) not in kept and now - path.stat().st_mtime > self.ttl:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+        return len(expired)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _run(self, job: ExportJob, backend: StorageBackend) -> None:
+        job.status = RUNNING
+
+        def progress(rows: int) -> None:
+            job.rows = rows
+
+        tmp = None
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{job.id}-", suffix=".tmp")
+            os.close(fd)
+            entries = select_entries(backend, job.since, job.until, job.tag)
+            if job.format == "xlsx":
+                job.rows = write_xlsx(entries, Path(tmp), progress)
+            else:
+                job.rows = _write_csv(entries, Path(tmp), progress)
+            path = self.root / f"{job.id}.{job.format}"
+            os.replace(tmp, path)
+        except Exception as exc:
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+            job.error = str(exc) or type(exc).__name__
+            job.finished = time.time()  # before the status, which is what readers poll
+            job.status = FAILED
+            EXPORT_JOBS.inc(job.format, "failed")
+        else:
+            job.path = path
+            job.finished = time.time()
+            job.status = DONE
+            EXPORT_JOBS.inc(job.format, "done")
+        finally:
+            backend.close()
+
+
+def _job_of(path: Path) -> str:
+    """Job id a file in the queue directory belongs to: `<id>.<format>` or `.<id>-*.tmp`."""
+    return path.name.lstrip(".").partition(".")[0].partition("-")[0]
+
+
+def _write_csv(entries, path: Path, progress) -> int:
+    count = 0
+
+    def counted():
+        nonlocal count
+        for entry in entries:
+            count += 1
+            if count % EXPORT_PROGRESS_ROWS == 0:
+                progress(count)
+            yield entry
+
+    with path.open("wb") as f:
+        for chunk in iter_csv_chunks(counted()):
+            f.write(chunk)
+    metrics.count_rows("csv_export", count, "written")
+    return count
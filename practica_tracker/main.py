@@ -2,49 +2,87 @@
 
 Commands:
 
-    practica-tracker list [--status pending|completed]
+    practica-tracker list [--status pending|completed] [--since ISO-date] [--until ISO-date]
     practica-tracker add <description> [--complete]
     practica-tracker complete <ISO-date>
+    practica-tracker compact
+    practica-tracker migrate-db [--csv practica.csv] [--db practica.sqlite3]
+    practica-tracker partition [--csv practica.csv] [--dir practica]
+    practica-tracker vacuum [--db practica.csv]
+    practica-tracker compress [--csv practica.csv] [--out practica.csvz] [--codec zlib|lzma]
+    practica-tracker import <file.jsonl|file.csv> [--backend csv|sqlite|partitioned|compressed] [--db PATH]
+    practica-tracker stats [--backend csv|sqlite|partitioned|compressed] [--db PATH] [--json]
+    practica-tracker search [--tag TAG] [WORD ...] [--db practica.csv] [--limit N]
+
+`add` and `complete` append one line to the journal next to the JSON file
+(`challenges.json.log`); the snapshot and the CSV mirror are rewritten when
+the journal grows past a size threshold or on `compact`.
 
 This module orchestrates domain helpers (challenge.*) and persistence helpers for CLI usage.
+Only `challenge` is imported up front: the entry store, stats and search modules are
+imported by the commands that use them, so the challenge commands start fast.
 """
 from __future__ import annotations
 
 from datetime import date
 from pathlib import Path
 import argparse
+import csv
+import json
+import sys
+import time
+from typing import TYPE_CHECKING, Iterator
 from practica_tracker.challenge import (
+    JOURNAL_ADD,
+    JOURNAL_COMPLETE,
+    ChallengeCollection,
+    append_journal,
+    compact_challenges,
     create_challenge_today,
+    journal_path,
     load_challenges_csv,
     load_challenges_json,
-    save_challenges_csv,
-    save_challenges_json,
+    maybe_compact,
     print_challenges,
     status_completed,
     status_pendant,
-    get_challenge_by_date,
+    write_snapshot,
 )
 
+if TYPE_CHECKING:
+    from practica_tracker.store import Entry, StorageBackend
+
 DEFAULT_JSON = Path("challenges.json")
 DEFAULT_CSV = Path("challenges.csv")
+# mirror store.BACKENDS / *Backend.default_path without importing store at startup
+BACKEND_CHOICES = ["csv", "sqlite", "partitioned", "compressed"]
+DEFAULT_ENTRIES_CSV = Path("practica.csv")
+DEFAULT_ENTRIES_DB = Path("practica.sqlite3")
+DEFAULT_ENTRIES_DIR = Path("practica")
+DEFAULT_ENTRIES_BLOCKS = Path("practica.csvz")
 
 
 def cmd_list(args: argparse.Namespace) -> None:
-    challenges = load_challenges_json(args.file)
+    challenges = ChallengeCollection(load_challenges_json(args.file))
+    if args.since or args.until:
+        since = date.fromisoformat(args.since) if args.since else None
+        until = date.fromisoformat(args.until) if args.until else None
+        challenges = ChallengeCollection(challenges.between(since, until))
     print_challenges(challenges, args.status)
 
 
 def cmd_add(args: argparse.Namespace) -> None:
-    challenges = load_challenges_json(args.file) if args.file.exists() else []
+    has_data = args.file.exists() or journal_path(args.file).exists()
+    challenges = ChallengeCollection(load_challenges_json(args.file) if has_data else [])
     today = date.today()
-    existing = get_challenge_by_date(challenges, today)
+    existing = challenges.get(today)
     new_ch = create_challenge_today(args.description)
     if args.complete:
         new_ch.complete_challenge()
     if existing is None:
-        challenges.append(new_ch)
-        save_challenges_json(args.file, challenges)
-        save_challenges_csv(DEFAULT_CSV, challenges)
+        challenges.add(new_ch)
+        append_journal(args.file, JOURNAL_ADD, new_ch)
+        maybe_compact(args.file, DEFAULT_CSV)
         print("Added challenge:")
         print(new_ch)
     else:
@@ -53,23 +91,186 @@ def cmd_add(args: argparse.Namespace) -> None:
 
 
 def cmd_complete(args: argparse.Namespace) -> None:
-    challenges = load_challenges_json(args.file)
+    challenges = ChallengeCollection(load_challenges_json(args.file))
     target_date = date.fromisoformat(args.date)
-    ch = get_challenge_by_date(challenges, target_date)
+    ch = challenges.get(target_date)
     if ch is None:
         print(f"No challenge found for {target_date}")
         return
-    ch.complete_challenge()
-    save_challenges_json(args.file, challenges)
-    save_challenges_csv(DEFAULT_CSV, challenges)
+    if ch.status == status_completed:
+        print(f"{target_date} is already completed")
+        return
+    challenges.complete(target_date)
+    append_journal(args.file, JOURNAL_COMPLETE, ch)
+    maybe_compact(args.file, DEFAULT_CSV)
     print(f"Marked {target_date} as completed")
 
 
+def cmd_compact(args: argparse.Namespace) -> None:
+    count = compact_challenges(args.file, DEFAULT_CSV)
+    print(f"Compacted {count} challenges into {args.file}")
+
+
+def cmd_migrate_db(args: argparse.Namespace) -> None:
+    from practica_tracker.store import migrate_csv_to_sqlite
+
+    if not args.csv.exists():
+        print(f"No entries file at {args.csv}")
+        return
+    copied = migrate_csv_to_sqlite(args.csv, args.db)
+    print(f"Copied {copied} entries from {args.csv} into {args.db}")
+
+
+def cmd_partition(args: argparse.Namespace) -> None:
+    from practica_tracker.store import convert_to_partitioned
+
+    if not args.csv.exists():
+        print(f"No entries file at {args.csv}")
+        return
+    try:
+        copied = convert_to_partitioned(args.csv, args.dir)
+    except ValueError as exc:
+        print(exc)
+        return
+    print(f"Copied {copied} entries from {args.csv} into monthly partitions under {args.dir}")
+
+
+def cmd_compress(args: argparse.Namespace) -> None:
+    from practica_tracker.store import block_stats, convert_to_compressed
+
+    if not args.csv.exists():
+        print(f"No entries file at {args.csv}")
+        return
+    try:
+        copied = convert_to_compressed(args.csv, args.out, args.codec)
+    except ValueError as exc:
+        print(exc)
+        return
+    stats = block_stats(args.out)
+    print(f"Copied {copied} entries from {args.csv} into {args.out} ({stats['blocks']} blocks, {stats['ratio']}x smaller)")
+
+
+def cmd_vacuum(args: argparse.Namespace) -> None:
+    from practica_tracker.store import vacuum
+
+    if not args.db.exists():
+        print(f"No entries file at {args.db}")
+        return
+    dropped = vacuum(args.db)
+    print(f"Dropped {dropped} superseded or deleted rows from {args.db}")
+
+
+IMPORT_ERRORS_SHOWN = 20
+
+
+def _import_records(path: Path) -> Iterator[tuple[int, object]]:
+    """yields (line number, record) from a .csv or JSON-lines file, one at a time"""
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for lineno, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield lineno, json.loads(line)
+                except ValueError as exc:
+                    yield lineno, exc
+
+
+def _valid_entries(records: Iterator[tuple[int, object]], errors: list[str], unique_ids: StorageBackend | None = None) -> Iterator[Entry]:
+    """yields an Entry per valid record; with `unique_ids`, a given id already there (or earlier in the file) is an error"""
+    from practica_tracker.store import Entry
+
+    seen: set[str] = set()
+    for lineno, record in records:
+        try:
+            if isinstance(record, Exception):
+                raise ValueError(f"invalid JSON: {record}")
+            entry = Entry.from_record(record)
+            if unique_ids is not None and str(record.get("id") or "").strip():
+                if entry.id in seen or unique_ids.get(entry.id) is not None:
+                    raise ValueError(f"duplicate id: {entry.id!r}")
+                seen.add(entry.id)
+            yield entry
+        except ValueError as exc:
+            errors.append(f"line {lineno}: {exc}")
+
+
+def cmd_import(args: argparse.Namespace) -> None:
+    from practica_tracker.store import SqliteBackend, get_backend
+
+    if not args.source.exists():
+        print(f"No such file: {args.source}")
+        return
+    backend = get_backend(args.backend, args.db)
+    errors: list[str] = []
+    started = time.perf_counter()
+    if isinstance(backend, SqliteBackend):  # ids are a primary key there: report a repeat, don't fail mid-import
+        entries = _valid_entries(_import_records(args.source), errors, unique_ids=backend)
+        imported = backend.append_many(entries, ignore_existing=True)
+    else:
+        imported = backend.append_many(_valid_entries(_import_records(args.source), errors))
+    elapsed = time.perf_counter() - started
+    for message in errors[:IMPORT_ERRORS_SHOWN]:
+        print(f"skipped {message}", file=sys.stderr)
+    if len(errors) > IMPORT_ERRORS_SHOWN:
+        print(f"... and {len(errors) - IMPORT_ERRORS_SHOWN} more invalid rows", file=sys.stderr)
+    rate = imported / elapsed if elapsed > 0 else float("inf")
+    print(f"Imported {imported} entries into {backend.path} ({len(errors)} invalid rows skipped) "
+          f"in {elapsed:.2f}s, {rate:,.0f} rows/sec")
+
+
+STATS_RECENT = 5
+
+
+def cmd_stats(args: argparse.Namespace) -> None:
+    from practica_tracker.stats import backend_stats
+    from practica_tracker.store import get_backend
+
+    data = backend_stats(get_backend(args.backend, args.db), args.file)
+    if args.json:
+        print(json.dumps(data, indent=2))
+        return
+    streak = data["streak"]
+    print(f"entries: {data['entries']}, total minutes: {data['total_minutes']}")
+    print(f"streak: current {streak['current']} days, longest {streak['longest']} days "
+          f"(last completed {streak['last_completed'] or '-'})")
+    for title, key in (("days", "by_day"), ("weeks", "by_week"), ("months", "by_month")):
+        recent = list(data[key].items())[-STATS_RECENT:]
+        if recent:
+            print(f"-last {title}-")
+            for label, minutes in recent:
+                print(f"{label}: {minutes} min")
+    if data["by_tag"]:
+        print("-top tags-")
+        for tag, minutes in list(data["by_tag"].items())[:STATS_RECENT]:
+            print(f"{tag}: {minutes} min")
+
+
+def cmd_search(args: argparse.Namespace) -> None:
+    from practica_tracker.search import search_entries
+
+    q = " ".join(args.words) or None
+    if args.tag is None and q is None:
+        print("Give a --tag and/or words to search for")
+        return
+    entries = search_entries(args.db, tag=args.tag, q=q, limit=args.limit)
+    if not entries:
+        print("No entries found.")
+        return
+    for e in entries:
+        tags = f" [{e.tags}]" if e.tags else ""
+        print(f"{e.date} {e.time} - {e.description}{tags} ({e.duration_minutes} min)")
+
+
 def interactive_flow() -> None:
     json_path = DEFAULT_JSON
-    if json_path.exists():
+    if json_path.exists() or journal_path(json_path).exists():
         print("file found, loading challenges...")
-        challenges = load_challenges_json(json_path)
+        challenges = ChallengeCollection(load_challenges_json(json_path))
         print(f"loaded {len(challenges)} challenges from {json_path}")
         print_challenges(challenges)
         print("-completed challenges-")
@@ -79,35 +280,34 @@ def interactive_flow() -> None:
         print()
     else:
         print("can't find the last file, starting a new challenge")
-        challenges = []
+        challenges = ChallengeCollection()
 
     description = input("today's challenge: ")
     if not description.strip():
         description = "realizar un commit util en github"
     today_challenge = create_challenge_today(description)
 
-    existing_today = get_challenge_by_date(challenges, date.today())
+    existing_today = challenges.get(date.today())
     if existing_today is None:
         print("adding new challenge: ")
         print(f"{today_challenge}")
         today_challenge.complete_challenge()
-        challenges.append(today_challenge)
+        challenges.add(today_challenge)
     else:
         print("challenge already exists, using the existing")
 
-    save_challenges_json(json_path, challenges)
-    save_challenges_csv(DEFAULT_CSV, challenges)
+    write_snapshot(json_path, challenges.in_file_order(), DEFAULT_CSV)
     print(f"saved {len(challenges)} challenges in database")
 
     # verify reconstruction
     print(f"reconstructing challenges from json files: ")
-    reloaded_json = load_challenges_json(json_path)
+    reloaded_json = ChallengeCollection(load_challenges_json(json_path))
     print_challenges(reloaded_json)
     print_challenges(reloaded_json, status_pendant)
     print_challenges(reloaded_json, status_completed)
 
     print("reconstructing challenges from CSV files")
-    reloaded_csv = load_challenges_csv(DEFAULT_CSV)
+    reloaded_csv = ChallengeCollection(load_challenges_csv(DEFAULT_CSV))
     print_challenges(reloaded_csv)
     print_challenges(reloaded_csv, status_pendant)
     print_challenges(reloaded_csv, status_completed)
@@ -120,6 +320,8 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
     p_list = sub.add_parser("list", help="List challenges")
     p_list.add_argument("--status", choices=[status_pendant, status_completed], help="Filter by status")
+    p_list.add_argument("--since", help="Only challenges on or after this ISO date (YYYY-MM-DD)")
+    p_list.add_argument("--until", help="Only challenges on or before this ISO date (YYYY-MM-DD)")
 
     p_add = sub.add_parser("add", help="Add today's challenge")
     p_add.add_argument("description", help="Description for today's challenge")
@@ -128,6 +330,40 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p_complete = sub.add_parser("complete", help="Mark a challenge completed by ISO date (YYYY-MM-DD)")
     p_complete.add_argument("date", help="Date of the challenge to mark completed (YYYY-MM-DD)")
 
+    sub.add_parser("compact", help="Fold the journal into a fresh JSON snapshot and CSV mirror")
+
+    p_migrate = sub.add_parser("migrate-db", help="Copy practice entries from the CSV file into a SQLite database")
+    p_migrate.add_argument("--csv", type=Path, default=DEFAULT_ENTRIES_CSV, help="Source CSV entries file")
+    p_migrate.add_argument("--db", type=Path, default=DEFAULT_ENTRIES_DB, help="Target SQLite database")
+
+    p_partition = sub.add_parser("partition", help="Split the CSV entries file into one file per month")
+    p_partition.add_argument("--csv", type=Path, default=DEFAULT_ENTRIES_CSV, help="Source CSV entries file")
+    p_partition.add_argument("--dir", type=Path, default=DEFAULT_ENTRIES_DIR, help="Target partitioned store directory")
+
+    p_vacuum = sub.add_parser("vacuum", help="Rewrite the CSV entries file without edited-away or deleted rows")
+    p_vacuum.add_argument("--db", type=Path, default=DEFAULT_ENTRIES_CSV, help="Entries CSV file or partitioned directory")
+
+    p_compress = sub.add_parser("compress", help="Copy the CSV entries file into a block-compressed store")
+    p_compress.add_argument("--csv", type=Path, default=DEFAULT_ENTRIES_CSV, help="Source CSV entries file")
+    p_compress.add_argument("--out", type=Path, default=DEFAULT_ENTRIES_BLOCKS, help="Target .csvz store")
+    p_compress.add_argument("--codec", choices=["zlib", "lzma"], default="zlib", help="zlib is faster to read, lzma smaller")
+
+    p_import = sub.add_parser("import", help="Bulk import practice entries from a .jsonl or .csv file")
+    p_import.add_argument("source", type=Path, help="JSON-lines (one object per line) or CSV file with entry fields")
+    p_import.add_argument("--backend", choices=BACKEND_CHOICES, default="csv", help="Storage backend to import into")
+    p_import.add_argument("--db", type=Path, default=None, help="Entries file (defaults to the backend's default path)")
+
+    p_stats = sub.add_parser("stats", help="Practice minutes per day/week/month/tag and challenge streaks")
+    p_stats.add_argument("--backend", choices=BACKEND_CHOICES, default="csv", help="Storage backend with the entries")
+    p_stats.add_argument("--db", type=Path, default=None, help="Entries file (defaults to the backend's default path)")
+    p_stats.add_argument("--json", action="store_true", help="Print the raw JSON document")
+
+    p_search = sub.add_parser("search", help="Find practice entries by tag and/or words in the description")
+    p_search.add_argument("words", nargs="*", help="Words that must all appear in the description")
+    p_search.add_argument("--tag", help="Tag the entries must carry")
+    p_search.add_argument("--db", type=Path, default=DEFAULT_ENTRIES_CSV, help="Entries CSV file")
+    p_search.add_argument("--limit", type=int, default=50, help="Maximum number of entries, newest first")
+
     return parser.parse_args(argv)
 
 
@@ -139,6 +375,22 @@ def main(argv: list[str] | None = None) -> None:
         cmd_add(args)
     elif args.command == "complete":
         cmd_complete(args)
+    elif args.command == "compact":
+        cmd_compact(args)
+    elif args.command == "migrate-db":
+        cmd_migrate_db(args)
+    elif args.command == "partition":
+        cmd_partition(args)
+    elif args.command == "compress":
+        cmd_compress(args)
+    elif args.command == "vacuum":
+        cmd_vacuum(args)
+    elif args.command == "import":
+        cmd_import(args)
+    elif args.command == "stats":
+        cmd_stats(args)
+    elif args.command == "search":
+        cmd_search(args)
     else:
         interactive_flow()
 
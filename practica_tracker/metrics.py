@@ -0,0 +1,249 @@
+"""In-process metrics and an opt-in sampling profiler.
+
+
+Responsibilities:
+- `Counter` / `Histogram` keep labelled values and render them in the
+  Prometheus text format (`render`, served by `GET /metrics`)
+- `timed` / `timer` record how long store and challenge operations take and
+  pass every timing to hooks added with `add_timing_hook`
+- `count_rows` / `count_bytes_read` / `count_bytes_written` track I/O volume
+- `SamplingProfiler` samples one thread's stack while a request runs; when
+  nobody asks for a profile no thread exists and nothing is sampled
+
+Dependency free and cheap to import, since `store` and `challenge` use it.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: list = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label values."""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labelnames, labels)} {_number(v)}" for labels, v in items)
+        return lines
+
+
+class Histogram:
+    """Observations bucketed by upper bound, per label values."""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket = _labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {repr(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Forget all recorded values (tests, or after fork)."""
+    for metric in _registry:
+        metric.clear()
+
+
+OPERATION_SECONDS = Histogram("practica_operation_seconds", "Time spent in store and challenge operations", ("operation",))
+ROWS = Counter("practica_rows_total", "Rows parsed from or written to data files", ("source", "direction"))
+BYTES = Counter("practica_bytes_total", "Bytes read from or written to data files", ("source", "direction"))
+HTTP_SECONDS = Histogram("practica_http_request_duration_seconds", "Time to produce a response, per endpoint", ("endpoint", "method"))
+HTTP_REQUESTS = Counter("practica_http_requests_total", "Responses per endpoint and status", ("endpoint", "method", "status"))
+
+
+def count_rows(source: str, rows: int, direction: str = "read") -> None:
+    if rows:
+        ROWS.inc(source, direction, amount=rows)
+
+
+def count_bytes_read(source: str, size: int) -> None:
+    if size:
+        BYTES.inc(source, "read", amount=size)
+
+
+def count_bytes_written(source: str, size: int) -> None:
+    if size:
+        BYTES.inc(source, "written", amount=size)
+
+
+# callables notified with (operation, seconds) after every timed operation
+_timing_hooks: List[Callable[[str, float], None]] = []
+
+
+def add_timing_hook(hook: Callable[[str, float], None]) -> None:
+    if hook not in _timing_hooks:
+        _timing_hooks.append(hook)
+
+
+def remove_timing_hook(hook: Callable[[str, float], None]) -> None:
+    if hook in _timing_hooks:
+        _timing_hooks.remove(hook)
+
+
+def record(operation: str, seconds: float) -> None:
+    OPERATION_SECONDS.observe(seconds, operation)
+    for hook in _timing_hooks:
+        hook(operation, seconds)
+
+
+@contextmanager
+def timer(operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(operation, time.perf_counter() - start)
+
+
+def timed(operation: str):
+    """Decorator: record each call of the function under `operation`."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(operation, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread every `interval` seconds.
+
+    Use as a context manager around the code to profile; `collapsed()` then
+    returns the samples as "outer;inner;leaf count" lines (flame graph input).
+    """
+
+    def __init__(self, thread_id: int | None = None, interval: float = 0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Dict[Tuple[str, ...], int] = {}
+        self.total = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="practica-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            key = tuple(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+            self.total += 1
+
+    def collapsed(self) -> str:
+        lines = [f"{';'.join(stack)} {n}" for stack, n in sorted(self.samples.items(), key=lambda kv: -kv[1])]
+        return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,135 @@
+"""In-memory cache of rendered HTML pages.
+
+
+Responsibilities:
+- `PageCache` keeps rendered pages (the `/` listing, one per limit and
+  cursor) gzip-compressed in memory, keyed by the store they show, its data
+  version (`store.DataVersion`, which every append changes) and the view's
+  parameters
+- A hit skips reading the store and rendering the template; clients that
+  accept gzip get the stored body as-is, others get it decompressed
+- The compressed bodies are bounded to `max_bytes` in total; the least
+  recently used pages are evicted first
+- `invalidate(store)` drops the pages of one store and leaves the others, for
+  writes made through the app
+
+A page of an outdated version is never served, since its key names the
+old version; invalidating only frees the memory sooner.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+from pathlib import Path
+import threading
+import zlib
+
+from practica_tracker import metrics
+from practica_tracker.store import DataVersion
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+GZIP_LEVEL = 6
+_GZIP_WBITS = 16 + zlib.MAX_WBITS  # gzip container, so bodies can be sent with Content-Encoding: gzip
+
+PAGES = metrics.Counter("practica_page_cache_total", "Rendered page cache lookups and evictions", ("result",))
+
+PageKey = tuple
+
+
+def store_key(kind: str, path: Path | str) -> str:
+    """Names the store a page shows: the backend kind and its absolute data path."""
+    return f"{kind}:{os.path.abspath(path)}"
+
+
+def page_key(store: str, version: DataVersion, view: str, *params) -> PageKey:
+    return (store, version.token, view, *params)
+
+
+def gzip_body(html: bytes, level: int = GZIP_LEVEL) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(html) + compressor.flush()
+
+
+def gunzip_body(body: bytes) -> bytes:
+    return zlib.decompress(body, _GZIP_WBITS)
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Does an Accept-Encoding header allow gzip? (q=0 rules it out)"""
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class PageCache:
+    """Gzipped pages, at most `max_bytes` of them in total. Thread safe."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self._pages: OrderedDict[PageKey, bytes] = OrderedDict()
+        self._by_store: dict[str, set[PageKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, key: PageKey) -> bytes | None:
+        """The gzipped page for `key` (and mark it as just used), None on a miss."""
+        with self._lock:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+        PAGES.inc("hit" if body is not None else "miss")
+        return body
+
+    def put(self, key: PageKey, html: bytes) -> bytes:
+        """Compress and keep `html` under `key`, returns the gzipped body."""
+        body = gzip_body(html)
+        if len(body) > self.max_bytes:
+            return body  # would evict everything else and still not fit
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._pages[key] = body
+            self._by_store.setdefault(key[0], set()).add(key)
+            self.nbytes += len(body)
+            evicted = 0
+            while self.nbytes > self.max_bytes:
+                self._drop(next(iter(self._pages)))
+                evicted += 1
+        if evicted:
+            PAGES.inc("evicted", amount=evicted)
+        return body
+
+    def invalidate(self, store: str) -> int:
+        """Drop every page of `store`, returns how many."""
+        with self._lock:
+            keys = list(self._by_store.get(store, ()))
+            for key in keys:
+                self._drop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._by_store.clear()
+            self.nbytes = 0
+
+    def _drop(self, key: PageKey) -> None:
+        body = self._pages.pop(key)
+        self.nbytes -= len(body)
+        keys = self._by_store[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._by_store[key[0]]
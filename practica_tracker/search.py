@@ -0,0 +1,197 @@
+"""Tag and full-text search over practice entries.
+
+
+Responsibilities:
+- `SearchIndex` keeps an inverted index (tag -> rows, word -> rows) for one
+  entries CSV in a sqlite3 sidecar next to it (`practica.csv.search`)
+- The index remembers how far it has read the CSV (`store.TailPosition`) and
+  only indexes rows appended since; a rewritten file is re-indexed from scratch
+- Appends do no indexing work: a query first catches up with the rows
+  appended since the last one, by this process or any other
+- Results are decoded straight from the byte range of each matching row, so a
+  query costs the size of its posting lists, not the size of the history
+- Rows superseded by `store.update_entry` or `store.delete_entry` stay indexed
+  and are dropped from results using the row-offset index (`store.liveness`)
+- `store.release` of a path closes the indexes of the files under it
+
+Used by `GET /search?tag=&q=` in the Flask app and `practica-tracker search`.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import re
+import sqlite3
+import threading
+from typing import List
+
+from practica_tracker.store import (
+    Entry,
+    TailPosition,
+    add_release_listener,
+    entry_from_bytes,
+    is_within,
+    liveness,
+    read_appended,
+)
+from practica_tracker.table import tag_tokens
+
+INDEX_SUFFIX = ".search"
+KIND_TAG = 0
+KIND_WORD = 1
+
+_WORD = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS rows (row INTEGER PRIMARY KEY, start INTEGER NOT NULL, end INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS postings (
+    kind INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    PRIMARY KEY (kind, term, row)
+) WITHOUT ROWID;
+"""
+
+
+def words(text: str) -> set[str]:
+    """Lowercased words of a free-text string."""
+    return set(_WORD.findall(text.lower()))
+
+
+def index_path(entries_path: Path) -> Path:
+    entries_path = Path(entries_path)
+    return entries_path.with_name(entries_path.name + INDEX_SUFFIX)
+
+
+def _dump_position(position: TailPosition) -> str:
+    return json.dumps({
+        "ident": list(position.ident),
+        "offset": position.offset,
+        "mtime_ns": position.mtime_ns,
+        "fingerprint": position.fingerprint.hex(),
+        "fieldnames": position.fieldnames,
+    })
+
+
+def _load_position(raw: str) -> TailPosition:
+    data = json.loads(raw)
+    return TailPosition(
+        tuple(data["ident"]), data["offset"], data["mtime_ns"], bytes.fromhex(data["fingerprint"]), data["fieldnames"],
+    )
+
+
+class SearchIndex:
+    """On-disk inverted index for one entries CSV. Thread safe."""
+
+    def __init__(self, entries_path: Path):
+        self.entries_path = Path(entries_path)
+        self.path = index_path(self.entries_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _position(self) -> TailPosition | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'position'").fetchone()
+        return _load_position(row[0]) if row else None
+
+    def sync(self) -> int:
+        """Index rows appended since the last sync, returns how many were added.
+
+        Runs in one IMMEDIATE transaction, so processes sharing the sidecar
+        take turns instead of indexing the same rows twice.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._sync_locked()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return added
+
+    def _sync_locked(self) -> int:
+        spans: list = []
+        entries, position, reset = read_appended(self.entries_path, self._position(), spans)
+        if not reset and not entries:
+            return 0
+        if reset:
+            self._conn.execute("DELETE FROM rows")
+            self._conn.execute("DELETE FROM postings")
+        first = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM rows").fetchone()[0]
+        rows = []
+        postings = []
+        for row, (entry, (start, end)) in enumerate(zip(entries, spans), first):
+            rows.append((row, start, end))
+            postings.extend((KIND_TAG, tag, row) for tag in tag_tokens(entry.tags))
+            postings.extend((KIND_WORD, word, row) for word in words(entry.description))
+        self._conn.executemany("INSERT INTO rows VALUES (?, ?, ?)", rows)
+        self._conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?)", postings)
+        if position is None:
+            self._conn.execute("DELETE FROM meta WHERE key = 'position'")
+        else:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('position', ?)", (_dump_position(position),))
+        return len(rows)
+
+    def search(self, tag: str | None = None, q: str | None = None, limit: int = 50) -> List[Entry]:
+        """Newest-first entries carrying `tag` whose description has every word of `q`."""
+        terms = [(KIND_TAG, t) for t in sorted(tag_tokens(tag or ""))]
+        terms += [(KIND_WORD, w) for w in sorted(words(q or ""))]
+        if not terms:
+            return []
+        self.sync()
+        live = liveness(self.entries_path)
+        sql = " INTERSECT ".join(["SELECT row FROM postings WHERE kind = ? AND term = ?"] * len(terms))
+        params = [value for term in terms for value in term]
+        with self._lock:
+            spans = self._conn.execute(
+                f"SELECT rows.start, rows.end FROM rows WHERE row IN ({sql}) ORDER BY row DESC LIMIT ?",
+                (*params, limit + (live.dead if live else 0)),
+            ).fetchall()
+            position = self._position()
+        if live is not None:
+            spans = [span for span in spans if live.offset(span[0])][:limit]
+        if not spans:
+            return []
+        fieldnames = position.fieldnames if position else None
+        results = []
+        with self.entries_path.open("rb") as f:
+            for start, end in spans:
+                f.seek(start)
+                results.append(entry_from_bytes(f.read(end - start), fieldnames))
+        return results
+
+
+_indexes: dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(entries_path: Path) -> SearchIndex:
+    """Process-wide index for `entries_path`, created on first use."""
+    key = os.path.abspath(entries_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SearchIndex(Path(entries_path))
+        return index
+
+
+def search_entries(entries_path: Path, tag: str | None = None, q: str | None = None, limit: int = 50) -> List[Entry]:
+    return get_index(entries_path).search(tag=tag, q=q, limit=limit)
+
+
+def _on_release(path: Path) -> None:
+    with _indexes_lock:
+        released = [_indexes.pop(key) for key in list(_indexes) if is_within(key, path)]
+    for index in released:
+        index.close()
+
+
+add_release_listener(_on_release)
@@ -0,0 +1,265 @@
+"""Practice-time rollups and challenge streaks.
+
+
+Responsibilities:
+- `Rollups` keeps running totals of `duration_minutes` per day, ISO week,
+  month and tag
+- `StatsTracker` keeps rollups for one entries CSV up to date by parsing only
+  the rows appended since its last snapshot (`store.read_appended`); rows
+  that an edit, delete or repeated id made dead (`store.liveness`) are read
+  back one by one and taken out of the totals
+- Partitioned stores are rolled up per partition in worker processes and merged
+- Streaks come from the completed challenges in challenges.json (snapshot plus
+  journal) and are only recomputed when those files change
+- `store.release` of a path drops the trackers and cached streak dates of the
+  files under it
+
+Used by `GET /stats` in the Flask app and by `practica-tracker stats`.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+import os
+from pathlib import Path
+import threading
+from typing import Iterable, List
+
+from practica_tracker.challenge import ChallengeCollection, journal_path, load_challenges_json, status_completed
+from practica_tracker.store import (
+    CsvBackend,
+    Entry,
+    PartitionedBackend,
+    StorageBackend,
+    TailPosition,
+    add_release_listener,
+    fan_out,
+    is_within,
+    iter_entries,
+    liveness,
+    partition_path,
+    read_appended,
+    read_entries_at,
+)
+from practica_tracker.table import tag_tokens
+
+
+class Rollups:
+    """Running totals of practice minutes, updated one entry at a time."""
+
+    def __init__(self):
+        self.entries = 0
+        self.total_minutes = 0
+        self.by_day: dict[str, int] = {}
+        self.by_week: dict[str, int] = {}
+        self.by_month: dict[str, int] = {}
+        self.by_tag: dict[str, int] = {}
+        self._rows: dict[tuple[str, str], int] = {}  # entries behind each bucket key
+
+    def _keys(self, entry: Entry) -> list[tuple[str, str]]:
+        """The ``(bucket, key)`` pairs `entry` counts towards."""
+        keys = []
+        try:
+            day = date.fromisoformat(entry.date)
+        except ValueError:
+            day = None  # malformed dates still count towards the totals
+        if day is not None:
+            year, week, _ = day.isocalendar()
+            keys += [("by_day", entry.date), ("by_week", f"{year}-W{week:02d}"), ("by_month", entry.date[:7])]
+        keys += [("by_tag", tag) for tag in tag_tokens(entry.tags)]
+        return keys
+
+    def _count(self, entry: Entry, sign: int) -> None:
+        minutes = sign * entry.duration_minutes
+        self.entries += sign
+        self.total_minutes += minutes
+        for name, key in self._keys(entry):
+            bucket = getattr(self, name)
+            rows = self._rows.get((name, key), 0) + sign
+            if rows:
+                self._rows[name, key] = rows
+                bucket[key] = bucket.get(key, 0) + minutes
+            else:  # the last entry behind this key is gone
+                del self._rows[name, key]
+                del bucket[key]
+
+    def add(self, entry: Entry) -> None:
+        self._count(entry, 1)
+
+    def remove(self, entry: Entry) -> None:
+        """Take back an entry added before (e.g. one an edit superseded)."""
+        self._count(entry, -1)
+
+    def extend(self, entries: Iterable[Entry]) -> None:
+        for entry in entries:
+            self.add(entry)
+
+    def merge(self, other: "Rollups") -> None:
+        """Add the totals of `other` (e.g. another partition's) to these."""
+        self.entries += other.entries
+        self.total_minutes += other.total_minutes
+        for mine, theirs in (
+            (self.by_day, other.by_day),
+            (self.by_week, other.by_week),
+            (self.by_month, other.by_month),
+            (self.by_tag, other.by_tag),
+        ):
+            for key, minutes in theirs.items():
+                mine[key] = mine.get(key, 0) + minutes
+        for key, rows in other._rows.items():
+            self._rows[key] = self._rows.get(key, 0) + rows
+
+    def to_dict(self) -> dict:
+        return {
+            "entries": self.entries,
+            "total_minutes": self.total_minutes,
+            "by_day": dict(sorted(self.by_day.items())),
+            "by_week": dict(sorted(self.by_week.items())),
+            "by_month": dict(sorted(self.by_month.items())),
+            "by_tag": dict(sorted(self.by_tag.items(), key=lambda kv: (-kv[1], kv[0]))),
+        }
+
+
+def compute_streaks(completed: List[date], today: date | None = None) -> dict:
+    """Current and longest runs of consecutive days in sorted `completed` dates.
+
+    The current streak ends today, or yesterday when today's challenge is not
+    done yet; otherwise it is 0.
+    """
+    today = today or date.today()
+    longest = run = 0
+    previous = None
+    for day in completed:
+        if previous is not None and day == previous:
+            continue
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    current = run if previous is not None and today - previous <= timedelta(days=1) else 0
+    return {
+        "current": current,
+        "longest": longest,
+        "last_completed": previous.isoformat() if previous else None,
+    }
+
+
+def _file_version(path: Path) -> tuple | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+# challenges JSON path -> (version of snapshot + journal, sorted completed dates)
+_completed_cache: dict[str, tuple[tuple, List[date]]] = {}
+_completed_lock = threading.Lock()
+
+
+def completed_dates(challenges_path: Path) -> List[date]:
+    """Sorted dates of completed challenges, re-read only when the files change."""
+    challenges_path = Path(challenges_path)
+    version = (_file_version(challenges_path), _file_version(journal_path(challenges_path)))
+    key = os.path.abspath(challenges_path)
+    with _completed_lock:
+        cached = _completed_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        if version == (None, None):
+            dates: List[date] = []
+        else:
+            collection = ChallengeCollection(load_challenges_json(challenges_path))
+            dates = [c.date for c in collection.by_status(status_completed)]
+        _completed_cache[key] = (version, dates)
+        return dates
+
+
+class StatsTracker:
+    """Rollups for one entries CSV plus streaks for one challenges JSON file.
+
+    `snapshot` parses only rows appended since the previous call and re-reads
+    the challenges only when the snapshot or its journal changed, so serving
+    stats never rescans either source in full. Thread safe.
+    """
+
+    def __init__(self, entries_path: Path, challenges_path: Path):
+        self.entries_path = Path(entries_path)
+        self.challenges_path = Path(challenges_path)
+        self.rollups = Rollups()
+        self._position: TailPosition | None = None
+        self._dead: frozenset = frozenset()  # byte offsets of the rows taken out of the rollups
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        entries, self._position, reset = read_appended(self.entries_path, self._position)
+        if reset:
+            self.rollups = Rollups()
+            self._dead = frozenset()
+        self.rollups.extend(entries)
+        live = liveness(self.entries_path)
+        counted = self._position.offset if self._position is not None else 0
+        dead = frozenset(o for o in live.dead_offsets if o < counted) if live is not None else frozenset()
+        if dead != self._dead:
+            # only the rows whose state changed are read back
+            for entry in read_entries_at(self.entries_path, dead - self._dead):
+                self.rollups.remove(entry)
+            self.rollups.extend(read_entries_at(self.entries_path, self._dead - dead))
+            self._dead = dead
+
+    def snapshot(self, today: date | None = None) -> dict:
+        with self._lock:
+            self._refresh()
+            data = self.rollups.to_dict()
+        data["streak"] = compute_streaks(completed_dates(self.challenges_path), today)
+        return data
+
+
+_trackers: dict[tuple[str, str], StatsTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_tracker(entries_path: Path, challenges_path: Path) -> StatsTracker:
+    """Process-wide tracker for this pair of files."""
+    key = (os.path.abspath(entries_path), os.path.abspath(challenges_path))
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = StatsTracker(Path(entries_path), Path(challenges_path))
+        return tracker
+
+
+def _partition_rollups(path: Path) -> Rollups:
+    rollups = Rollups()
+    rollups.extend(iter_entries(path))
+    return rollups
+
+
+def backend_stats(backend: StorageBackend, challenges_path: Path, today: date | None = None) -> dict:
+    """Stats for any backend: incremental for CSV files, a full pass otherwise.
+
+    Partitioned stores are rolled up one partition per worker process and
+    the per-partition totals merged, so only the totals cross processes.
+    """
+    if isinstance(backend, CsvBackend):
+        return get_tracker(backend.path, challenges_path).snapshot(today)
+    rollups = Rollups()
+    if isinstance(backend, PartitionedBackend):
+        paths = [partition_path(backend.path, name) for name in backend.partitions()]
+        for part in fan_out(_partition_rollups, [p for p in paths if p.exists()], backend.workers):
+            rollups.merge(part)
+    else:
+        rollups.extend(backend.iter_entries())
+    data = rollups.to_dict()
+    data["streak"] = compute_streaks(completed_dates(challenges_path), today)
+    return data
+
+
+def _on_release(path: Path) -> None:
+    with _trackers_lock:
+        for key in [key for key in _trackers if is_within(key[0], path) or is_within(key[1], path)]:
+            del _trackers[key]
+    with _completed_lock:
+        for key in [key for key in _completed_cache if is_within(key, path)]:
+            del _completed_cache[key]
+
+
+add_release_listener(_on_release)
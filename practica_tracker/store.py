@@ -3,25 +3,81 @@
 
 Responsibilities:
 - `Entry` dataclass represents a practice entry
-- `append_entry` appends rows to CSV without overwriting
-- `read_entries` reconstructs `Entry` instances
-- `export_xlsx` provides optional Excel export (openpyxl)
+- `append_entry` appends rows to CSV without overwriting; `append_entries`
+  does the same for any iterable through one handle, in chunks
+- `GroupCommitWriter` batches appends from concurrent requests into one
+  locked (fcntl) write + fsync
+- `read_entries` reconstructs `Entry` instances (served from an incremental,
+  offset-tracking cache so only newly appended rows are parsed)
+- `read_page` serves newest-first pages by scanning the CSV backwards from EOF
+- `get_entry` / `read_row` fetch one entry by id or row number through a
+  row-offset sidecar (`OffsetIndex`), decoding just that row from a memory map
+- `update_entry` / `delete_entry` append a new version or a tombstone row;
+  readers skip rows superseded by a later row with the same id (`liveness`,
+  read from the sidecar, which appends keep current through an append
+  listener), and `vacuum` (run by `maybe_vacuum` once enough rows are dead)
+  rewrites the file with the live rows only
+- `export_xlsx` provides optional, streaming Excel export (openpyxl)
+- `StorageBackend` abstracts the above (`EditableBackend` adds update, delete
+  and vacuum); `CsvBackend` wraps the CSV helpers,
+  `SqliteBackend` keeps entries in an indexed sqlite3 database and
+  `PartitionedBackend` keeps one CSV per month (`practica/2026-01.csv`),
+  scanning partitions in parallel worker processes (`fan_out`, started
+  with forkserver or spawn and shut down at exit);
+  `CompressedBackend` keeps rows in zlib/lzma blocks (`practica.csvz`) with
+  a block index, which `read_entries` / `export_xlsx` read transparently
+- `release` drops the per-file state kept in process-wide caches (writers,
+  parsed entries, indexes), so one process can serve many stores in turn
+- Reads and writes report timings, rows and bytes to `metrics`
 
 Designed to be small and dependency-light.
 """
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+import atexit
+import base64
+import bisect
+from collections import deque
+from contextlib import contextmanager
 import csv
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import date, datetime
+from functools import partial
+import hashlib
+import heapq
+import io
+from itertools import islice
+import json
+import logging
+import mmap
+import os
 from pathlib import Path
-from typing import Iterable, List
+import re
+import sqlite3
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator, List
 import uuid
+import zlib
+
+from practica_tracker import metrics
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
 
 CSV_FIELDS = ["id", "date", "time", "description", "tags", "duration_minutes"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Entry:
     id: str
     date: str  # ISO date YYYY-MM-DD
@@ -36,52 +92,2362 @@ class Entry:
         time_str = time_str or datetime.now().strftime("%H:%M")
         return cls(id=str(uuid.uuid4()), date=date_iso, time=time_str, description=description.strip(), tags=tags.strip(), duration_minutes=int(duration_minutes))
 
+    @classmethod
+    def from_record(cls, data: dict) -> "Entry":
+        """Validate an imported record (JSON object or CSV row) into an Entry.
+
+        `description` is required; `date` (YYYY-MM-DD) and `time` (HH:MM) default
+        like `new` and are stored in that canonical form (`7:05` becomes `07:05`),
+        `tags` may be a string or a list, and an existing `id` is kept.
+        Raises ValueError describing the first problem found.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("record must be an object")
+        description = str(data.get("description") or "").strip()
+        if not description:
+            raise ValueError("description is required")
+        date_iso = str(data.get("date") or "").strip() or None
+        if date_iso is not None:
+            try:
+                date_iso = date.fromisoformat(date_iso).isoformat()
+            except ValueError:
+                raise ValueError(f"invalid date: {date_iso!r}") from None
+        time_str = str(data.get("time") or "").strip() or None
+        if time_str is not None:
+            try:
+                time_str = datetime.strptime(time_str, "%H:%M").strftime("%H:%M")
+            except ValueError:
+                raise ValueError(f"invalid time: {time_str!r}") from None
+        tags = data.get("tags") or ""
+        if isinstance(tags, (list, tuple)):
+            tags = ",".join(str(t).strip() for t in tags)
+        raw_duration = data.get("duration_minutes") or 0
+        try:
+            duration = int(raw_duration)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid duration_minutes: {raw_duration!r}") from None
+        if duration < 0:
+            raise ValueError(f"invalid duration_minutes: {raw_duration!r}")
+        entry = cls.new(description, date_iso=date_iso, time_str=time_str, tags=str(tags), duration_minutes=duration)
+        entry_id = str(data.get("id") or "").strip()
+        if entry_id:
+            entry.id = entry_id
+        return entry
+
+
+@contextmanager
+def _file_lock(f):
+    """Hold an exclusive advisory lock on an open file (no-op without fcntl)."""
+    if fcntl is None:  # pragma: no cover
+        yield
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
 
 def ensure_csv(path: Path) -> None:
-    if not path.exists():
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-            writer.writeheader()
+    """Create the CSV with its header; safe against concurrent creators."""
+    if path.exists() and path.stat().st_size:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as f, _file_lock(f):
+        if f.seek(0, os.SEEK_END) == 0:
+            f.write(_encode_header())
+
+
+def _entry_row(entry: Entry) -> list:
+    return [entry.id, entry.date, entry.time, entry.description, entry.tags, entry.duration_minutes]
+
+
+def _encode_rows(entries: Iterable[Entry]) -> bytes:
+    """Serialize entries exactly as `csv.DictWriter` would, as UTF-8 bytes."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(map(_entry_row, entries))
+    return buf.getvalue().encode("utf-8")
+
+
+def iter_csv_chunks(entries: Iterable[Entry], chunk_rows: int = 1000) -> Iterator[bytes]:
+    """Yield a CSV document (header first) for `entries` in chunks of encoded rows."""
+    yield _encode_header()
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= chunk_rows:
+            yield _encode_rows(batch)
+            batch = []
+    if batch:
+        yield _encode_rows(batch)
+
+
+def _encode_header() -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(CSV_FIELDS)
+    return buf.getvalue().encode("utf-8")
+
+
+def _row_to_entry(fieldnames: List[str], values: List[str]) -> Entry:
+    if fieldnames == CSV_FIELDS and len(values) == len(CSV_FIELDS):
+        return Entry(values[0], values[1], values[2], values[3], values[4], int(values[5] or 0))
+    r = dict(zip(fieldnames, values))
+    return Entry(
+        id=r.get("id", ""),
+        date=r.get("date", ""),
+        time=r.get("time", ""),
+        description=r.get("description", ""),
+        tags=r.get("tags", ""),
+        duration_minutes=int(r.get("duration_minutes") or 0),
+    )
+
+
+def entry_from_bytes(record: bytes, fieldnames: List[str] | None = None) -> Entry:
+    """Decode a single CSV record (as stored in the file) into an Entry."""
+    values = next(csv.reader(io.StringIO(record.decode("utf-8"), newline="")), None)
+    if not values:
+        raise ValueError("empty CSV record")
+    return _row_to_entry(fieldnames or CSV_FIELDS, values)
+
+
+def _complete_prefix(buf: bytes) -> int:
+    """Length of the longest prefix of `buf` made of whole CSV records.
+
+    A record ends at a newline outside quotes; since quotes are escaped by
+    doubling, a newline closes a record when the quote count before it is even.
+    A trailing partial row (e.g. a concurrent writer mid-append) is left out.
+    """
+    quotes_after = 0
+    end = len(buf)
+    total = buf.count(b'"')
+    while True:
+        nl = buf.rfind(b"\n", 0, end)
+        if nl < 0:
+            return 0
+        quotes_after += buf.count(b'"', nl + 1, end)
+        if (total - quotes_after) % 2 == 0:
+            return nl + 1
+        end = nl
+
+
+def _writer_active(f) -> bool:
+    """Does another handle hold the file lock on `f`'s file, i.e. may a write be half done?"""
+    if fcntl is None:  # pragma: no cover
+        return False
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    return False
+
+
+def _final_row(f, start: int, end: int, fieldnames: List[str] | None, lock_file=None) -> List[str] | None:
+    """Values of a last row with no newline after it (bytes `start`..`end` of `f`), else None.
+
+    Hand-edited files often lack the final newline. Appends through this
+    module end every row with one and write under the file lock, so the
+    bytes are only taken as a row while no writer holds the lock (on
+    `lock_file`, default `f`) and when they parse into one record with a
+    value for every field; anything else is a row still being written.
+    """
+    if end <= start:
+        return None
+    f.seek(start)
+    data = f.read(end - start)
+    if data.count(b'"') % 2:
+        return None  # ends inside a quoted field
+    try:
+        records = [values for values in csv.reader(io.StringIO(data.decode("utf-8"), newline="")) if values]
+    except (UnicodeDecodeError, csv.Error):
+        return None
+    if len(records) != 1 or (fieldnames is not None and len(records[0]) != len(fieldnames)):
+        return None
+    if _writer_active(lock_file or f) or os.fstat(f.fileno()).st_size != end:
+        return None
+    return records[0]
+
+
+_CHUNK_SIZE = 1 << 20
+_FINGERPRINT_SIZE = 64
+
+
+def _record_spans(buf: bytes) -> List[tuple[int, int]]:
+    """``(start, end)`` of each record in `buf`, which holds whole records only."""
+    spans = []
+    start = pos = quotes = 0
+    while True:
+        nl = buf.find(b"\n", pos)
+        if nl < 0:
+            return spans
+        quotes += buf.count(b'"', pos, nl)
+        if quotes % 2 == 0:
+            spans.append((start, nl + 1))
+            start = nl + 1
+            quotes = 0
+        pos = nl + 1
+
+
+def _parse_from(f, offset: int, fieldnames: List[str] | None, spans: list | None = None) -> tuple[List[Entry], int, List[str] | None]:
+    """Parse whole records from binary handle `f` starting at byte `offset`.
+
+    Returns ``(entries, new_offset, fieldnames)``; when `fieldnames` is None the
+    first record is consumed as the header. When `spans` is a list, the
+    absolute ``(start, end)`` byte range of each entry is appended to it.
+    A last row without a newline counts when `_final_row` accepts it.
+    """
+    entries: List[Entry] = []
+    f.seek(offset)
+    pending = b""
+    size = 0
+    while True:
+        chunk = f.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        pending += chunk
+        cut = _complete_prefix(pending)
+        if not cut:
+            continue
+        reader = csv.reader(io.StringIO(pending[:cut].decode("utf-8"), newline=""))
+        if spans is None:
+            if fieldnames is None:
+                fieldnames = next(reader, None)
+            for values in reader:
+                if values:
+                    entries.append(_row_to_entry(fieldnames, values))
+        else:
+            records = zip(_record_spans(pending[:cut]), reader)
+            if fieldnames is None:
+                fieldnames = next(records, (None, None))[1]
+            for (start, end), values in records:
+                if values:
+                    entries.append(_row_to_entry(fieldnames, values))
+                    spans.append((offset + start, offset + end))
+        offset += cut
+        pending = pending[cut:]
+    values = _final_row(f, offset, offset + len(pending), fieldnames) if pending.strip() else None
+    if values is not None:
+        if fieldnames is None:
+            fieldnames = values
+        else:
+            entries.append(_row_to_entry(fieldnames, values))
+            if spans is not None:
+                spans.append((offset, offset + len(pending)))
+        offset += len(pending)
+    metrics.count_bytes_read("entries_csv", size)
+    metrics.count_rows("entries_csv", len(entries))
+    return entries, offset, fieldnames
+
+
+@dataclass(slots=True)
+class TailPosition:
+    """How far a reader has consumed a CSV file, see `read_appended`.
+
+    Besides the byte offset it remembers the file identity (device, inode),
+    its mtime and the bytes just before the offset, which is enough to tell
+    an append apart from a truncate, rewrite or replace.
+    """
+
+    ident: tuple[int, int]
+    offset: int
+    mtime_ns: int
+    fingerprint: bytes
+    fieldnames: List[str] | None
+
+
+def _read_fingerprint(f, offset: int) -> bytes:
+    start = max(0, offset - _FINGERPRINT_SIZE)
+    f.seek(start)
+    return f.read(offset - start)
+
+
+def _only_appended(f, st: os.stat_result, position: TailPosition | None) -> bool:
+    """True when open file `f` (stat `st`) is `position`'s file, at most appended to since."""
+    return (
+        position is not None
+        and position.ident == (st.st_dev, st.st_ino)
+        and st.st_size >= position.offset
+        and (st.st_size > position.offset or st.st_mtime_ns == position.mtime_ns)
+        and _read_fingerprint(f, position.offset) == position.fingerprint
+    )
+
+
+def read_appended(path: Path, position: TailPosition | None = None, spans: list | None = None) -> tuple[List[Entry], TailPosition | None, bool]:
+    """Parse only the rows appended since `position`.
+
+    Returns ``(entries, new_position, reset)``. `reset` is true when there was
+    no usable position (first call, or the file was truncated, rewritten or
+    replaced); `entries` then holds the whole file and callers should rebuild
+    whatever they derived from it. A missing file gives ``([], None, True)``.
+    Pass a list as `spans` to also get the ``(start, end)`` byte range of
+    each returned entry.
+    """
+    try:
+        f = Path(path).open("rb")
+    except FileNotFoundError:
+        return [], None, True
+    with f:
+        st = os.fstat(f.fileno())
+        ident = (st.st_dev, st.st_ino)
+        if not _only_appended(f, st, position):
+            entries, offset, fieldnames = _parse_from(f, 0, None, spans)
+            return entries, TailPosition(ident, offset, st.st_mtime_ns, _read_fingerprint(f, offset), fieldnames), True
+        if st.st_size == position.offset:
+            return [], position, False
+        entries, offset, _ = _parse_from(f, position.offset, position.fieldnames, spans)
+        new_position = TailPosition(ident, offset, st.st_mtime_ns, _read_fingerprint(f, offset), position.fieldnames)
+        return entries, new_position, False
+
+
+class _CacheState:
+    __slots__ = ("position", "entries")
 
+    def __init__(self, position: TailPosition, entries: List[Entry]):
+        self.position = position
+        self.entries = entries
 
+
+# process-level cache: absolute path -> parsed state of that CSV file
+_entry_cache: dict[str, _CacheState] = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_key(path: Path) -> str:
+    return os.path.abspath(path)
+
+
+def _load_state(path: Path, state: _CacheState | None) -> _CacheState | None:
+    """Bring `state` up to date with the file, parsing only what is new."""
+    entries, position, reset = read_appended(path, state.position if state is not None else None)
+    if position is None:
+        return None
+    if reset:
+        return _CacheState(position, entries)
+    state.entries.extend(entries)
+    state.position = position
+    return state
+
+
+def _cache_appended(path: Path, start: int, data: bytes, entries: List[Entry], mtime_ns: int) -> None:
+    """Record our own append of `data` at byte `start` without re-reading it.
+
+    If the cache was not exactly caught up to `start` (someone else wrote in
+    between) it is left alone; the next read parses the tail it is missing.
+    """
+    with _cache_lock:
+        state = _entry_cache.get(_cache_key(path))
+        if state is None:
+            return
+        position = state.position
+        if position.offset != start:
+            return
+        state.entries.extend(entries)
+        position.offset = start + len(data)
+        position.fingerprint = (position.fingerprint + data)[-_FINGERPRINT_SIZE:]
+        position.mtime_ns = mtime_ns
+
+
+def invalidate_cache(path: Path | None = None) -> None:
+    """Drop cached entries for `path` (or for every file when None).
+
+    Call this after rewriting a data file in place; plain appends through
+    `append_entry` keep the cache current on their own.
+    """
+    with _cache_lock:
+        if path is None:
+            _entry_cache.clear()
+        else:
+            _entry_cache.pop(_cache_key(path), None)
+
+
+@metrics.timed("append_entry")
 def append_entry(path: Path, entry: Entry) -> None:
+    if is_partitioned(path):
+        _append_partitioned(path, [entry])
+        return
+    if is_compressed(path):
+        _append_blocks(path, [entry])
+        return
     ensure_csv(path)
-    with path.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-        writer.writerow(asdict(entry))
+    with path.open("ab") as f:
+        _write_chunk(path, f, [entry])
+
+
+@metrics.timed("append_entries")
+def append_entries(path: Path, entries: Iterable[Entry], chunk_size: int = 1000) -> int:
+    """Append any iterable of entries through a single handle, returns the count.
+
+    Rows are encoded and written `chunk_size` at a time, so the iterable is
+    consumed lazily and memory stays bounded for large backfills. When
+    `path` is a partitioned store each row goes to its month's file.
+    """
+    if is_partitioned(path):
+        return _append_partitioned(path, entries, chunk_size)
+    if is_compressed(path):
+        return _append_blocks(path, entries, chunk_size)
+    ensure_csv(path)
+    count = 0
+    with path.open("ab") as f:
+        chunk: List[Entry] = []
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) >= chunk_size:
+                _write_chunk(path, f, chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            _write_chunk(path, f, chunk)
+            count += len(chunk)
+    return count
+
+
+def _write_chunk(path: Path, f, chunk: List[Entry], fsync: bool = False) -> None:
+    """Append encoded rows under the file lock, so rows never interleave."""
+    data = _encode_rows(chunk)
+    reopened = None
+    try:
+        while True:
+            with _file_lock(f):
+                if not _replaced(path, f):
+                    if _ends_mid_line(path):
+                        data = b"\n" + data  # a hand-edited last row without its newline
+                    f.write(data)
+                    f.flush()
+                    if fsync:
+                        os.fsync(f.fileno())
+                    end = f.tell()
+                    mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                    break
+            # `vacuum` renamed a rewritten file over ours while we waited for the lock
+            if reopened is not None:
+                reopened.close()
+            f = reopened = Path(path).open("ab")
+    finally:
+        if reopened is not None:
+            reopened.close()
+    metrics.count_bytes_written("entries_csv", len(data))
+    metrics.count_rows("entries_csv", len(chunk), "written")
+    _cache_appended(path, end - len(data), data, chunk, mtime_ns)
+    _notify_appended(path)
+
+
+def _ends_mid_line(path: Path) -> bool:
+    """Is the last byte of a non-empty file something other than a newline?"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        return size > 0 and os.pread(fd, 1, size - 1) != b"\n"
+    finally:
+        os.close(fd)
+
+
+def _replaced(path: Path, f) -> bool:
+    """True when `path` no longer names the file open as `f`."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    held = os.fstat(f.fileno())
+    return (st.st_dev, st.st_ino) != (held.st_dev, held.st_ino)
+
+
+# callables notified with the path after every append made through this module
+_append_listeners: list = []
+
+
+def add_append_listener(listener) -> None:
+    """Call `listener(path)` after each append through this module, e.g. the
+    group-commit writer's; `_sync_offsets` uses it to keep row-offset sidecars
+    current. A listener that raises is logged and the append still succeeds."""
+    if listener not in _append_listeners:
+        _append_listeners.append(listener)
+
+
+def _notify_appended(path: Path) -> None:
+    # the rows are already durable: a failing listener must not fail the append
+    for listener in _append_listeners:
+        try:
+            listener(path)
+        except Exception:
+            log.exception("append listener %r failed for %s", listener, path)
+
+
+class _Ticket:
+    __slots__ = ("done", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: BaseException | None = None
+
+
+class GroupCommitWriter:
+    """Append entries from many threads with one locked write + fsync per batch.
+
+    `submit` blocks until its entry is durable. A background thread collects
+    entries arriving within `max_delay` seconds of the first pending one (up
+    to `max_batch`) and commits them together under an exclusive `fcntl`
+    lock, which also serializes against other processes writing the file.
+    """
+
+    def __init__(self, path: Path, max_delay: float = 0.002, max_batch: int = 512, fsync: bool = True):
+        self.path = Path(path)
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self._pending: list[tuple[Entry, _Ticket]] = []
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, entry: Entry) -> None:
+        ticket = _Ticket()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            self._pending.append((entry, ticket))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="practica-group-commit", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        ticket.done.wait()
+        if ticket.error is not None:
+            raise ticket.error
+
+    def close(self) -> None:
+        """Commit what is pending and stop the background thread; `get_writer`
+        hands out a new writer for the path from then on."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        with _writers_lock:
+            key = _cache_key(self.path)
+            if _writers.get(key) is self:
+                del _writers[key]
+        if thread is not None:
+            thread.join()
+
+    def _next_batch(self) -> list[tuple[Entry, _Ticket]]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + self.max_delay
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return  # closed and drained
+            error = None
+            try:
+                ensure_csv(self.path)
+                with self.path.open("ab") as f:
+                    _write_chunk(self.path, f, [entry for entry, _ in batch], fsync=self.fsync)
+            except BaseException as exc:
+                error = exc
+            for _, ticket in batch:
+                ticket.error = error
+                ticket.done.set()
+
+
+_writers: dict[str, GroupCommitWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path: Path, max_delay: float = 0.002) -> GroupCommitWriter:
+    """Process-wide group-commit writer for `path`."""
+    key = _cache_key(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = _writers[key] = GroupCommitWriter(Path(path), max_delay=max_delay)
+        writer.max_delay = max_delay
+        return writer
+
+
+def _reset_after_fork() -> None:
+    # writer threads do not survive fork; children start with fresh writers
+    global _writers_lock, _offset_indexes_lock, _process_pools_lock, _block_indexes_lock, _liveness_cache_lock
+    _writers.clear()
+    _writers_lock = threading.Lock()
+    _offset_indexes.clear()
+    _offset_indexes_lock = threading.Lock()
+    _process_pools.clear()  # the parent's pools belong to the parent
+    _process_pools_lock = threading.Lock()
+    _block_indexes_lock = threading.Lock()  # the indexes stay valid, a holder's lock would not
+    _liveness_cache_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def is_within(key: str, root: Path) -> bool:
+    """Is the absolute path `key` the path `root` or inside it?"""
+    root_key = os.path.abspath(root)
+    return key == root_key or key.startswith(root_key.rstrip(os.sep) + os.sep)
 
 
+# callables notified with the path after `release` dropped the state kept for it
+_release_listeners: list = []
+
+
+def add_release_listener(listener) -> None:
+    """Call `listener(path)` after `release(path)`; used to drop sidecar indexes."""
+    if listener not in _release_listeners:
+        _release_listeners.append(listener)
+
+
+def release(path: Path) -> None:
+    """Drop the process-wide state kept for the data at `path` (a file, or a
+    directory and everything in it): its group-commit writer, after committing
+    what is pending, parsed entries, row-offset and block indexes, and through
+    the release listeners the search indexes and stats trackers.
+
+    Nothing is lost, the next use rebuilds what it needs from disk; this only
+    bounds what a process holds when it serves many stores.
+    """
+    with _writers_lock:
+        writers = [_writers.pop(key) for key in list(_writers) if is_within(key, path)]
+    for writer in writers:
+        writer.close()
+    for cache, lock in (
+        (_entry_cache, _cache_lock), (_offset_indexes, _offset_indexes_lock), (_block_indexes, _block_indexes_lock),
+        (_liveness_cache, _liveness_cache_lock),
+    ):
+        with lock:
+            for key in [key for key in cache if is_within(key, path)]:
+                del cache[key]
+    for listener in _release_listeners:
+        listener(path)
+
+
+@metrics.timed("read_entries")
 def read_entries(path: Path) -> List[Entry]:
-    if not path.exists():
-        return []
-    with path.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = []
-        for r in reader:
-            rows.append(Entry(
-                id=r.get("id", ""),
-                date=r.get("date", ""),
-                time=r.get("time", ""),
-                description=r.get("description", ""),
-                tags=r.get("tags", ""),
-                duration_minutes=int(r.get("duration_minutes") or 0),
-            ))
-        return rows
-
-
-def export_xlsx(csv_path: Path, xlsx_path: Path) -> None:
+    if is_partitioned(path):
+        return list(PartitionedBackend(path).iter_entries())
+    if is_compressed(path):
+        return list(iter_blocks(path))
+    key = _cache_key(path)
+    with _cache_lock:
+        state = _load_state(Path(path), _entry_cache.get(key))
+        if state is None:
+            _entry_cache.pop(key, None)
+            return []
+        _entry_cache[key] = state
+        entries = list(state.entries)
+    live = liveness(path)
+    if live is not None:
+        entries = [entry for row, entry in enumerate(entries) if live.row(row)]
+    return entries
+
+
+def iter_entries(path: Path) -> Iterator[Entry]:
+    """Stream entries in file order, one row at a time, bypassing the cache."""
+    if is_partitioned(path):
+        yield from PartitionedBackend(path).iter_entries()
+        return
+    if is_compressed(path):
+        yield from iter_blocks(path)
+        return
+    if not Path(path).exists():
+        return
+    live = liveness(path)
+    rows = 0
+    with Path(path).open("r", newline="", encoding="utf-8") as f:
+        try:
+            reader = csv.reader(f)
+            fieldnames = next(reader, None)
+            if fieldnames is None:
+                return
+            for values in reader:
+                if values:
+                    rows += 1
+                    if live is None or live.row(rows - 1):
+                        yield _row_to_entry(fieldnames, values)
+        finally:
+            # counted once per pass rather than per row
+            metrics.count_rows("entries_csv", rows)
+            metrics.count_bytes_read("entries_csv", f.buffer.tell())
+
+
+# --- newest-first reading -------------------------------------------------
+
+_REVERSE_BLOCK_SIZE = 64 * 1024
+
+
+def _read_header(f) -> tuple[List[str], int]:
+    """Return the header fieldnames and the byte offset where data rows start."""
+    f.seek(0)
+    buf = b""
+    while True:
+        chunk = f.read(_REVERSE_BLOCK_SIZE)
+        buf += chunk
+        cut = _complete_prefix(buf)
+        if cut or not chunk:
+            break
+    if not cut:
+        return list(CSV_FIELDS), 0
+    header = next(csv.reader(io.StringIO(buf[:buf.index(b"\n") + 1].decode("utf-8"), newline="")), None)
+    return header or list(CSV_FIELDS), buf.index(b"\n") + 1
+
+
+def _split_records_reversed(buf: bytes, at_start: bool) -> tuple[List[tuple[int, int]], int]:
+    """Split `buf` (which ends on a record boundary) into records, last first.
+
+    Returns the ``(start, end)`` spans found and the length of the leading
+    fragment that may belong to a record beginning before `buf`. When
+    `at_start` is true `buf` begins on a boundary and nothing is left over.
+    """
+    spans = []
+    rec_end = len(buf)
+    j = rec_end - 1
+    quotes = 0
+    while True:
+        nl = buf.rfind(b"\n", 0, j)
+        if nl < 0:
+            break
+        quotes += buf.count(b'"', nl + 1, j)
+        if quotes % 2 == 0:
+            spans.append((nl + 1, rec_end))
+            rec_end = nl + 1
+            quotes = 0
+        j = nl
+    if at_start and rec_end > 0:
+        spans.append((0, rec_end))
+        rec_end = 0
+    return spans, rec_end
+
+
+def _scan_reversed(path: Path, end: int | None = None, block_size: int = _REVERSE_BLOCK_SIZE) -> Iterator[tuple[int, int, Entry]]:
+    """Yield ``(start, end, entry)`` for every live row before byte `end`, last row first."""
+    live = liveness(path)
+    try:
+        f = Path(path).open("rb")
+    except FileNotFoundError:
+        return
+    with f:
+        fieldnames, header_end = _read_header(f)
+        if end is None:
+            end = f.seek(0, os.SEEK_END)
+            if end > header_end:
+                # drop a trailing row that is still being written
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    f.seek(max(header_end, end - block_size))
+                    block = f.read(end - f.tell())
+                    cut = end - (len(block) - (block.rfind(b"\n") + 1))
+                    if _final_row(f, cut, end, fieldnames) is None:
+                        end = cut
+        pos = end
+        carry = b""
+        size = rows = 0
+        try:
+            while pos > header_end:
+                step = min(block_size, pos - header_end)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + carry
+                size += step
+                spans, rest = _split_records_reversed(buf, at_start=pos == header_end)
+                for start, stop in spans:
+                    values = next(csv.reader(io.StringIO(buf[start:stop].decode("utf-8"), newline="")), None)
+                    if values:
+                        rows += 1
+                        if live is None or live.offset(pos + start):
+                            yield pos + start, pos + stop, _row_to_entry(fieldnames, values)
+                carry = buf[:rest]
+        finally:
+            metrics.count_rows("entries_csv", rows)
+            metrics.count_bytes_read("entries_csv", size)
+
+
+def iter_entries_reversed(path: Path) -> Iterator[Entry]:
+    """Yield entries in reverse file order (most recently appended first).
+
+    The file is read backwards from EOF in fixed-size blocks, so consuming the
+    first n entries costs O(n) regardless of the file size.
+    """
+    for _, _, entry in _scan_reversed(path):
+        yield entry
+
+
+def _sort_key(entry: Entry) -> tuple[str, str, str]:
+    return (entry.date, entry.time, entry.id)
+
+
+class _Newest:
+    """Heap key that makes `heapq` behave as a max-heap on entry sort keys."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other: "_Newest") -> bool:
+        return self.key > other.key
+
+
+@dataclass
+class Page:
+    entries: List[Entry] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def _encode_cursor(resume_end: int, scanned_from: int, key: tuple[str, str, str]) -> str:
+    raw = json.dumps([resume_end, scanned_from, *key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, int, tuple[str, str, str]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        resume_end, scanned_from, *key = json.loads(raw)
+        if not (isinstance(resume_end, int) and isinstance(scanned_from, int) and len(key) == 3):
+            raise ValueError
+        return resume_end, scanned_from, (str(key[0]), str(key[1]), str(key[2]))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+@metrics.timed("read_page")
+def read_page(path: Path, limit: int = 50, cursor: str | None = None) -> Page:
+    """Return up to `limit` entries, newest (date, time) first, plus a cursor.
+
+    Rows are scanned backwards from EOF and pushed through a max-heap bounded
+    to `limit` rows, which puts back in order rows appended up to `limit`
+    positions out of date order. A row that is newer than what was already
+    emitted (further out of order than that) is emitted straight away rather
+    than dropped.
+
+    The cursor records where scanning resumes, how far the previous pages had
+    scanned and the oldest key they emitted, so rows that are already shown
+    are skipped and rows appended after the first page do not shift later
+    pages.
+    """
+    return _page_from(partial(_scan_reversed, path), limit, cursor)
+
+
+def _page_from(scan: Callable[..., Iterator[tuple[int, int, Entry]]], limit: int, cursor: str | None) -> Page:
+    """`read_page` over any newest-first ``scan(end=...)`` of ``(start, end, entry)``
+    rows, where positions grow with the append order (byte offsets, row numbers)."""
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+    resume_end = scanned_from = None
+    oldest = None
+    if cursor:
+        resume_end, scanned_from, oldest = _decode_cursor(cursor)
+
+    out: List[Entry] = []
+    heap: list = []
+    lowest = scanned_from
+    exhausted = True
+    for start, stop, entry in scan(end=resume_end):
+        lowest = start if lowest is None else min(lowest, start)
+        key = _sort_key(entry)
+        if oldest is not None and key >= oldest:
+            if scanned_from is not None and start >= scanned_from:
+                continue  # shown on an earlier page
+            out.append(entry)
+        else:
+            heapq.heappush(heap, (_Newest(key), start, stop, entry))
+            if len(heap) > limit:
+                item = heapq.heappop(heap)
+                oldest = item[0].key
+                out.append(item[3])
+        if len(out) >= limit:
+            exhausted = False
+            break
+    if exhausted:
+        while heap and len(out) < limit:
+            item = heapq.heappop(heap)
+            oldest = item[0].key
+            out.append(item[3])
+        if not heap:
+            return Page(out, None)
+    resume = max((item[2] for item in heap), default=lowest)
+    return Page(out, _encode_cursor(resume, lowest, oldest))
+
+
+# --- random access, updates and deletes -------------------------------------
+
+OFFSETS_SUFFIX = ".offsets"
+TOMBSTONE = "!deleted"  # date of the row that marks its id as deleted
+_OFFSETS_MAGIC = b"PRACOFF2"
+# magic, generation, device, inode, indexed offset, mtime_ns, rows, fingerprint length, fingerprint
+_OFFSETS_HEADER = struct.Struct(f"<8s6QB{_FINGERPRINT_SIZE}s7x")
+_OFFSETS_RECORD = struct.Struct("<QQ")  # id digest, byte offset where the row starts (| _TOMBSTONE_BIT)
+_TOMBSTONE_BIT = 1 << 63
+_TOMBSTONE_PREFIX = f",{TOMBSTONE},".encode("utf-8")
+
+_ROW_READ_SIZE = 4096  # covers a typical row in one read
+
+VACUUM_MIN_DEAD = 1000
+VACUUM_DEAD_RATIO = 0.25
+
+
+def offsets_path(entries_path: Path) -> Path:
+    entries_path = Path(entries_path)
+    return entries_path.with_name(entries_path.name + OFFSETS_SUFFIX)
+
+
+def is_tombstone(entry: Entry) -> bool:
+    return entry.date == TOMBSTONE
+
+
+def _id_digest(entry_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(entry_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _scan_row_offsets(mm, start: int, fieldnames: List[str], f=None) -> tuple[list[tuple[int, int]], int]:
+    """Find the whole records of a mapped CSV from byte `start` on.
+
+    Returns ``([(id digest, row start | tombstone bit), ...], end)`` where
+    `end` follows the last whole record. With the standard header the id
+    and the tombstone marker are sliced straight out of the map when the id
+    is unquoted; other rows go through `csv`. Blank lines are skipped, as
+    `read_entries` does. Given the open file `f`, a last row without a newline
+    counts when `_final_row` accepts it.
+    """
+    standard = fieldnames[:2] == ["id", "date"]
+    id_column = fieldnames.index("id") if "id" in fieldnames else 0
+    date_column = fieldnames.index("date") if "date" in fieldnames else 1
+    found = []
+    pos = row = start
+    quoted = False
+    while True:
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            values = _final_row(f, row, len(mm), fieldnames) if f is not None and not quoted else None
+            if values is None:
+                return found, row
+            entry_id = values[id_column] if id_column < len(values) else ""
+            flag = _TOMBSTONE_BIT if date_column < len(values) and values[date_column] == TOMBSTONE else 0
+            found.append((_id_digest(entry_id), row | flag))
+            return found, len(mm)
+        q = mm.find(b'"', pos, nl)
+        while q >= 0:
+            quoted = not quoted
+            q = mm.find(b'"', q + 1, nl)
+        pos = nl + 1
+        if quoted:
+            continue  # the newline is inside a quoted field
+        comma = mm.find(b",", row, nl) if standard else -1
+        if comma >= 0 and mm[row:row + 1] != b'"':
+            flag = _TOMBSTONE_BIT if mm[comma:comma + len(_TOMBSTONE_PREFIX)] == _TOMBSTONE_PREFIX else 0
+            found.append((_id_digest(mm[row:comma].decode("utf-8")), row | flag))
+        else:
+            values = next(csv.reader(io.StringIO(mm[row:pos].decode("utf-8"), newline="")), None)
+            if values:
+                entry_id = values[id_column] if id_column < len(values) else ""
+                flag = _TOMBSTONE_BIT if date_column < len(values) and values[date_column] == TOMBSTONE else 0
+                found.append((_id_digest(entry_id), row | flag))
+        row = pos
+
+
+@dataclass(frozen=True)
+class Liveness:
+    """Which rows of a CSV are older versions of their entry or tombstones.
+
+    Covers the first `rows` rows (up to byte `end`); rows past that were
+    appended after the snapshot and count as live. Only the dead rows are
+    held, and vacuums keep those few.
+    """
+
+    rows: int
+    end: int
+    dead_rows: frozenset
+    dead_offsets: frozenset
+
+    @property
+    def dead(self) -> int:
+        return len(self.dead_rows)
+
+    def row(self, row: int) -> bool:
+        return row >= self.rows or row not in self.dead_rows
+
+    def offset(self, start: int) -> bool:
+        return start >= self.end or start not in self.dead_offsets
+
+
+class OffsetIndex:
+    """Row-offset sidecar for one entries CSV (`practica.csv.offsets`). Thread safe.
+
+    The sidecar is a fixed header, saying how far the CSV has been indexed
+    (a `TailPosition`), followed by one fixed-size record per data row: a
+    digest of the row's id and the byte offset where the row starts, with
+    the top bit set for tombstones. Row n is record n, so a row lookup reads
+    two records; ids go through a dict (digest -> latest row) loaded from
+    the sidecar once per process and extended as it grows. Rows appended
+    since the last sync are scanned from a memory map of the CSV before
+    every lookup; a rewritten file is indexed from scratch. Processes
+    sharing the sidecar take turns through an `fcntl` lock on it.
+
+    A row is live when it is the latest row of its id and not a tombstone.
+    Readers learn which rows those are from `liveness`, which only reads
+    the sidecar.
+    """
+
+    def __init__(self, entries_path: Path):
+        self.entries_path = Path(entries_path)
+        self.path = offsets_path(self.entries_path)
+        self._lock = threading.Lock()
+        self._generation = None  # changes whenever the sidecar is rebuilt
+        self._fieldnames: List[str] = list(CSV_FIELDS)
+        self._ids: dict[int, int] = {}
+        self._deleted: set[int] = set()  # digests whose latest row is a tombstone
+        self._loaded = 0  # sidecar records already in _ids
+        self._end = 0
+
+    def sync(self) -> int:
+        """Index rows appended since the last sync, returns how many were added."""
+        return self._locate()[0]
+
+    def get(self, entry_id: str) -> Entry | None:
+        """The current version of entry `entry_id`; None if there is none or it was deleted."""
+        _, entry = self._locate(entry_id=entry_id)
+        return entry if entry is not None and entry.id == entry_id and not is_tombstone(entry) else None
+
+    def row(self, row: int) -> Entry:
+        """The row `row` as stored (0-based in file order, negative counts from the end),
+        which may be an older version or a tombstone."""
+        _, entry = self._locate(row=row)
+        return entry
+
+    def __len__(self) -> int:
+        self.sync()
+        return self._loaded
+
+    def dead_rows(self) -> int:
+        """Rows that are older versions or tombstones."""
+        self.sync()
+        with self._lock:
+            return self._loaded - (len(self._ids) - len(self._deleted))
+
+    def _locate(self, entry_id: str | None = None, row: int | None = None) -> tuple[int, Entry | None]:
+        with self._lock:
+            try:
+                f = self.entries_path.open("rb")
+            except FileNotFoundError:
+                if row is not None:
+                    raise IndexError(f"row {row} out of range") from None
+                return 0, None
+            with f:
+                st = os.fstat(f.fileno())
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                with os.fdopen(fd, "r+b") as side, _file_lock(side):
+                    added, rows, end = self._sync_locked(f, st, side)
+                    if entry_id is not None:
+                        row = self._ids.get(_id_digest(entry_id))
+                        if row is None:
+                            return added, None
+                    elif row is None:
+                        return added, None
+                    elif not -rows <= row < rows:
+                        raise IndexError(f"row {row} out of range")
+                    elif row < 0:
+                        row += rows
+                    side.seek(_OFFSETS_HEADER.size + row * _OFFSETS_RECORD.size)
+                    records = side.read(2 * _OFFSETS_RECORD.size)
+                start = _OFFSETS_RECORD.unpack_from(records)[1] & ~_TOMBSTONE_BIT
+                if len(records) > _OFFSETS_RECORD.size:
+                    stop = _OFFSETS_RECORD.unpack_from(records, _OFFSETS_RECORD.size)[1] & ~_TOMBSTONE_BIT
+                else:
+                    stop = end
+                with mmap.mmap(f.fileno(), end, access=mmap.ACCESS_READ) as mm:
+                    entry = entry_from_bytes(mm[start:stop], self._fieldnames)
+        metrics.count_bytes_read("entries_csv", stop - start)
+        metrics.count_rows("entries_csv", 1)
+        return added, entry
+
+    def _sync_locked(self, f, st: os.stat_result, side) -> tuple[int, int, int]:
+        """Bring the sidecar and `_ids` up to date, returns ``(added, rows, end)``."""
+        side.seek(0)
+        raw = side.read(_OFFSETS_HEADER.size)
+        position = None
+        if len(raw) == _OFFSETS_HEADER.size:
+            magic, generation, dev, ino, offset, mtime_ns, rows, fp_len, fingerprint = _OFFSETS_HEADER.unpack(raw)
+            if magic == _OFFSETS_MAGIC:
+                position = TailPosition((dev, ino), offset, mtime_ns, fingerprint[:fp_len], None)
+        if _only_appended(f, st, position):
+            start = position.offset
+        else:
+            generation, rows = int.from_bytes(os.urandom(8), "little"), 0
+            fieldnames, start = _read_header(f)
+            if not start:
+                side.truncate(0)  # not even a whole header yet
+                self._reset(None, list(CSV_FIELDS))
+                return 0, 0, 0
+            position = None
+        if generation != self._generation:
+            if position is not None:
+                fieldnames, _ = _read_header(f)
+            self._reset(generation, fieldnames)
+        added = 0
+        if position is None or st.st_size > start:
+            found: list = []
+            end = start
+            if st.st_size > start:
+                with mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ) as mm:
+                    found, end = _scan_row_offsets(mm, start, self._fieldnames, f)
+                    fingerprint = mm[max(0, end - _FINGERPRINT_SIZE):end]
+                metrics.count_bytes_read("entries_csv", end - start)
+            else:
+                fingerprint = _read_fingerprint(f, end)
+            side.truncate(_OFFSETS_HEADER.size + rows * _OFFSETS_RECORD.size)  # drop a torn tail
+            side.seek(0, os.SEEK_END)
+            side.write(b"".join(_OFFSETS_RECORD.pack(digest, offset) for digest, offset in found))
+            rows += len(found)
+            header = _OFFSETS_HEADER.pack(
+                _OFFSETS_MAGIC, generation, st.st_dev, st.st_ino, end, st.st_mtime_ns, rows, len(fingerprint), fingerprint,
+            )
+            side.seek(0)
+            side.write(header)
+            side.flush()
+            added = len(found)
+        else:
+            end = start
+        if self._loaded < rows:
+            side.seek(_OFFSETS_HEADER.size + self._loaded * _OFFSETS_RECORD.size)
+            data = side.read((rows - self._loaded) * _OFFSETS_RECORD.size)
+            for row, (digest, offset) in enumerate(_OFFSETS_RECORD.iter_unpack(data), self._loaded):
+                self._ids[digest] = row
+                if offset & _TOMBSTONE_BIT:
+                    self._deleted.add(digest)
+                else:
+                    self._deleted.discard(digest)
+            self._loaded = rows
+        self._end = end
+        return added, rows, end
+
+    def _reset(self, generation: int | None, fieldnames: List[str]) -> None:
+        self._generation = generation
+        self._fieldnames = fieldnames
+        self._ids = {}
+        self._deleted = set()
+        self._loaded = 0
+
+
+_offset_indexes: dict[str, OffsetIndex] = {}
+_offset_indexes_lock = threading.Lock()
+
+
+def get_offset_index(path: Path) -> OffsetIndex:
+    """Process-wide row-offset index for the CSV at `path`, created on first use."""
+    key = _cache_key(path)
+    with _offset_indexes_lock:
+        index = _offset_indexes.get(key)
+        if index is None:
+            index = _offset_indexes[key] = OffsetIndex(Path(path))
+        return index
+
+
+@metrics.timed("get_entry")
+def get_entry(path: Path, entry_id: str) -> Entry | None:
+    """The entry with `entry_id`, or None; decodes that one row only (see `OffsetIndex`)."""
+    if is_partitioned(path):
+        return PartitionedBackend(path).get(entry_id)
+    if is_compressed(path):
+        return CompressedBackend(path).get(entry_id)
+    return get_offset_index(path).get(entry_id)
+
+
+@metrics.timed("read_row")
+def read_row(path: Path, row: int) -> Entry:
+    """Data row `row` of the CSV as stored (IndexError when there is none)."""
+    return get_offset_index(path).row(row)
+
+
+@metrics.timed("read_entries_at")
+def read_entries_at(path: Path, offsets: Iterable[int]) -> List[Entry]:
+    """The rows of the CSV starting at byte `offsets` (e.g. `Liveness.dead_offsets`),
+    as stored and in file order; decodes those rows only."""
+    entries: List[Entry] = []
+    size = 0
+    with Path(path).open("rb") as f:
+        fieldnames, _ = _read_header(f)
+        for offset in sorted(offsets):
+            f.seek(offset)
+            record = b""
+            while True:
+                chunk = f.read(_ROW_READ_SIZE)
+                record += chunk
+                cut = _complete_prefix(record)
+                if cut or not chunk:
+                    break
+            size += len(record)
+            entries.append(entry_from_bytes(record[:cut] or record, fieldnames))
+    metrics.count_bytes_read("entries_csv", size)
+    metrics.count_rows("entries_csv", len(entries))
+    return entries
+
+
+_liveness_cache: dict[str, tuple[tuple, Liveness | None]] = {}
+_liveness_cache_lock = threading.Lock()
+
+
+def liveness(path: Path) -> Liveness | None:
+    """Which rows of the CSV at `path` are dead; None when all are live.
+
+    Only files with a row-offset sidecar can hold dead rows: `update_entry`
+    and `delete_entry` look the entry up through it first, which creates it,
+    and appends keep it current. The sidecar is only read, never created or
+    locked, so readers work in read-only directories; a missing, stale or
+    unreadable one means every row is live. The dead rows are worked out in
+    one pass over the sidecar and kept per sidecar state.
+    """
+    try:
+        side = offsets_path(path).open("rb")
+    except OSError:
+        return None
+    with side:
+        raw = side.read(_OFFSETS_HEADER.size)
+        if len(raw) < _OFFSETS_HEADER.size:
+            return None
+        magic, generation, dev, ino, end, mtime_ns, rows, fp_len, fingerprint = _OFFSETS_HEADER.unpack(raw)
+        if magic != _OFFSETS_MAGIC:
+            return None
+        try:
+            with Path(path).open("rb") as f:
+                position = TailPosition((dev, ino), end, mtime_ns, fingerprint[:fp_len], None)
+                if not _only_appended(f, os.fstat(f.fileno()), position):
+                    return None
+        except FileNotFoundError:
+            return None
+        key, stamp = _cache_key(path), (generation, dev, ino, rows, end)
+        with _liveness_cache_lock:
+            cached = _liveness_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        data = side.read(rows * _OFFSETS_RECORD.size)
+    if len(data) < rows * _OFFSETS_RECORD.size:
+        return None  # rebuilt under us, the next call sees the new one
+    seen: set[int] = set()
+    dead_rows, dead_offsets = set(), set()
+    for row in range(rows - 1, -1, -1):
+        digest, offset = _OFFSETS_RECORD.unpack_from(data, row * _OFFSETS_RECORD.size)
+        if digest in seen or offset & _TOMBSTONE_BIT:
+            dead_rows.add(row)
+            dead_offsets.add(offset & ~_TOMBSTONE_BIT)
+        seen.add(digest)
+    live = Liveness(rows, end, frozenset(dead_rows), frozenset(dead_offsets)) if dead_rows else None
+    with _liveness_cache_lock:
+        _liveness_cache[key] = (stamp, live)
+    return live
+
+
+def dead_rows(path: Path) -> int:
+    """Superseded rows and tombstones in the CSV (or partitioned store) at `path`."""
+    if is_partitioned(path):
+        return sum(dead_rows(partition_path(path, name)) for name in read_manifest(path))
+    if not offsets_path(path).exists():
+        return 0
+    return get_offset_index(path).dead_rows()
+
+
+def _apply_fields(entry: Entry, fields: dict) -> Entry:
+    unknown = set(fields) - set(CSV_FIELDS[1:])
+    if unknown:
+        raise ValueError(f"Unknown entry fields: {', '.join(sorted(unknown))}")
+    return Entry.from_record({**asdict(entry), **fields})
+
+
+def _append_rows(path: Path, rows: List[Entry]) -> None:
+    ensure_csv(path)
+    with path.open("ab") as f:
+        _write_chunk(path, f, rows)
+
+
+@metrics.timed("update_entry")
+def update_entry(path: Path, entry_id: str, **fields) -> Entry | None:
+    """Change fields of an entry by appending its new version; returns it, or None
+    when there is no such entry. Values are validated like `Entry.from_record`.
+
+    In a partitioned store an entry whose month changes moves: a tombstone
+    goes to the old partition and the new version to the new one.
+    """
+    current = get_entry(path, entry_id)
+    if current is None:
+        return None
+    updated = _apply_fields(current, fields)
+    target = Path(path)
+    if is_partitioned(path):
+        target = partition_path(path, partition_of(current.date))
+        if partition_of(updated.date) != partition_of(current.date):
+            _append_rows(target, [Entry(entry_id, TOMBSTONE, "", "")])
+            maybe_vacuum(target)
+            _append_partitioned(path, [updated])
+            return updated
+    _append_rows(target, [updated])
+    maybe_vacuum(target)
+    return updated
+
+
+@metrics.timed("delete_entry")
+def delete_entry(path: Path, entry_id: str) -> bool:
+    """Delete an entry by appending a tombstone; False when there is no such entry."""
+    current = get_entry(path, entry_id)
+    if current is None:
+        return False
+    target = partition_path(path, partition_of(current.date)) if is_partitioned(path) else Path(path)
+    _append_rows(target, [Entry(entry_id, TOMBSTONE, "", "")])
+    maybe_vacuum(target)
+    return True
+
+
+@metrics.timed("vacuum")
+def vacuum(path: Path) -> int:
+    """Rewrite the CSV with live rows only, returns how many dead rows were dropped.
+
+    The new file is written next to the old one and renamed over it while
+    the old one is locked, so readers see either file whole and appends
+    waiting on the lock move on to the new file. For a partitioned store
+    every partition is vacuumed.
+    """
+    if is_partitioned(path):
+        return sum(vacuum(partition_path(path, name)) for name in read_manifest(path))
+    path = Path(path)
+    dead = dead_rows(path)
+    if not dead:
+        return 0
+    tmp = path.with_name(f".{path.name}.vacuum")
+    with path.open("rb") as f, _file_lock(f):
+        dead = dead_rows(path)  # rows may have come in while we waited
+        with tmp.open("wb") as out:
+            out.write(_encode_header())
+            for chunk in _chunks(iter_entries(path), 1000):
+                out.write(_encode_rows(chunk))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, path)
+    invalidate_cache(path)
+    return dead
+
+
+def maybe_vacuum(path: Path, min_dead: int = VACUUM_MIN_DEAD, ratio: float = VACUUM_DEAD_RATIO) -> bool:
+    """Vacuum once dead rows reach `min_dead` and `ratio` of all rows."""
+    if not offsets_path(path).exists():
+        return False
+    index = get_offset_index(path)
+    dead = index.dead_rows()
+    if dead < max(min_dead, ratio * len(index)):
+        return False
+    vacuum(path)
+    return True
+
+
+def _sync_offsets(path: Path) -> None:
+    # keep row-offset indexes current: open ones, and ones that exist on disk
+    if _cache_key(path) in _offset_indexes or offsets_path(path).exists():
+        get_offset_index(path).sync()
+
+
+add_append_listener(_sync_offsets)
+
+
+EXPORT_PROGRESS_ROWS = 1000
+
+
+@metrics.timed("export_xlsx")
+def export_xlsx(path: Path, xlsx_path: Path | BinaryIO, backend: str = "csv") -> int:
+    """Write all entries to an .xlsx file (or binary file object), returns rows written.
+
+    Rows are streamed from the backend into a write-only workbook, so memory
+    stays flat no matter how many entries there are.
+    """
+    store = get_backend(backend, path)
+    try:
+        return write_xlsx(store.iter_entries(), xlsx_path)
+    finally:
+        store.close()
+
+
+def write_xlsx(
+    entries: Iterable[Entry], xlsx_path: Path | BinaryIO, progress: Callable[[int], None] | None = None,
+) -> int:
+    """`export_xlsx` for any iterable of entries; `progress(rows)` is called every
+    `EXPORT_PROGRESS_ROWS` rows."""
     try:
         from openpyxl import Workbook
     except Exception as exc:  # pragma: no cover - optional dependency
         raise RuntimeError("openpyxl is required to export to XLSX") from exc
 
-    entries = read_entries(csv_path)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Practica"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Practica")
     ws.append(CSV_FIELDS)
+    count = 0
     for e in entries:
         ws.append([e.id, e.date, e.time, e.description, e.tags, e.duration_minutes])
-    xlsx_path.parent.mkdir(parents=True, exist_ok=True)
+        count += 1
+        if progress is not None and count % EXPORT_PROGRESS_ROWS == 0:
+            progress(count)
+    if isinstance(xlsx_path, Path):
+        xlsx_path.parent.mkdir(parents=True, exist_ok=True)
     wb.save(xlsx_path)
+    metrics.count_rows("xlsx", count, "written")
+    return count
+
+
+# --- storage backends -----------------------------------------------------
+
+@dataclass(frozen=True)
+class DataVersion:
+    """Identifies the current contents of a backend's files.
+
+    `token` changes whenever the data changes (it is built from inode, size
+    and mtime), so it can serve as an HTTP ETag or a cache key; `mtime` is the
+    newest modification time, for Last-Modified.
+    """
+
+    token: str
+    mtime: float
+
+
+def _files_version(paths: Iterable[Path]) -> DataVersion | None:
+    parts = []
+    mtime = None
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        parts.append(f"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}")
+        mtime = st.st_mtime if mtime is None else max(mtime, st.st_mtime)
+    if mtime is None:
+        return None
+    return DataVersion(".".join(parts), mtime)
+
+
+class StorageBackend(ABC):
+    """Where entries live. Subclasses are registered in `BACKENDS` by name.
+
+    Subclasses must implement appending, streaming, paging and lookup by id;
+    backends that can also change stored entries derive from `EditableBackend`.
+    """
+
+    default_path = ""
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(path or self.default_path)
+
+    def append(self, entry: Entry) -> None:
+        self.append_many([entry])
+
+    @abstractmethod
+    def append_many(self, entries: Iterable[Entry]) -> int:
+        """Append entries in order, returns how many were stored."""
+
+    @abstractmethod
+    def iter_entries(self) -> Iterator[Entry]:
+        """Stream entries in insertion order."""
+
+    def read_all(self) -> List[Entry]:
+        return list(self.iter_entries())
+
+    @abstractmethod
+    def page(self, limit: int = 50, cursor: str | None = None) -> Page:
+        """Newest (date, time) first, see `read_page`."""
+
+    @abstractmethod
+    def get(self, entry_id: str) -> Entry | None:
+        """The entry with `entry_id`, None when there is none."""
+
+    def between(self, since: str | None = None, until: str | None = None) -> Iterator[Entry]:
+        """Entries dated from `since` to `until` (ISO dates, inclusive, None is open)."""
+        for entry in self.iter_entries():
+            if (since is None or entry.date >= since) and (until is None or entry.date <= until):
+                yield entry
+
+    def version(self) -> DataVersion | None:
+        """Version of the stored data, None when there is none yet."""
+        return _files_version([self.path])
+
+    def close(self) -> None:
+        """Release handles held for the calling thread (nothing by default)."""
+
+
+class EditableBackend(StorageBackend):
+    """A backend whose entries can be changed and deleted after they are stored."""
+
+    @abstractmethod
+    def update(self, entry_id: str, **fields) -> Entry | None:
+        """Change fields of an entry, returns the new version (None when there is no such entry)."""
+
+    @abstractmethod
+    def delete(self, entry_id: str) -> bool:
+        """Delete an entry, False when there is no such entry."""
+
+    @abstractmethod
+    def vacuum(self) -> int:
+        """Reclaim space left by updates and deletes, returns how many rows were dropped."""
+
+
+class CsvBackend(EditableBackend):
+    """The original single-file CSV storage.
+
+    With `group_commit_delay` set, `append` goes through the process-wide
+    `GroupCommitWriter` for the file, batching concurrent requests.
+    """
+
+    default_path = "practica.csv"
+
+    def __init__(self, path: Path | str | None = None, group_commit_delay: float | None = None):
+        super().__init__(path)
+        self.group_commit_delay = group_commit_delay
+
+    def append(self, entry: Entry) -> None:
+        if self.group_commit_delay is None:
+            append_entry(self.path, entry)
+        else:
+            get_writer(self.path, self.group_commit_delay).submit(entry)
+
+    def append_many(self, entries: Iterable[Entry]) -> int:
+        return append_entries(self.path, entries)
+
+    def iter_entries(self) -> Iterator[Entry]:
+        return iter_entries(self.path)
+
+    def read_all(self) -> List[Entry]:
+        return read_entries(self.path)
+
+    def page(self, limit: int = 50, cursor: str | None = None) -> Page:
+        return read_page(self.path, limit=limit, cursor=cursor)
+
+    def get(self, entry_id: str) -> Entry | None:
+        return get_entry(self.path, entry_id)
+
+    def update(self, entry_id: str, **fields) -> Entry | None:
+        return update_entry(self.path, entry_id, **fields)
+
+    def delete(self, entry_id: str) -> bool:
+        return delete_entry(self.path, entry_id)
+
+    def vacuum(self) -> int:
+        return vacuum(self.path)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    description TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '',
+    duration_minutes INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS entries_id ON entries (id);
+CREATE INDEX IF NOT EXISTS entries_date ON entries (date);
+CREATE INDEX IF NOT EXISTS entries_date_time ON entries (date, time);
+"""
+_SQLITE_COLUMNS = ", ".join(CSV_FIELDS)
+_SQLITE_INSERT = f"INSERT INTO entries ({_SQLITE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+_SQLITE_BATCH = 1000
+
+
+class SqliteBackend(EditableBackend):
+    """Entries in a sqlite3 database (WAL mode), indexed on date, (date, time) and id.
+
+    Connections are per thread, as sqlite3 requires; `close` closes every
+    thread's connection, so call it once no thread is using the backend.
+    """
+
+    default_path = "practica.sqlite3"
+
+    def __init__(self, path: Path | str | None = None):
+        super().__init__(path)
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []  # every thread's, for close
+        self._conns_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # only its own thread runs statements on it; close may come from another one
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SQLITE_SCHEMA)
+            with self._conns_lock:
+                self._conns.append(conn)
+            local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._local = threading.local()  # threads that used the backend reconnect
+        for conn in conns:
+            conn.close()
+
+    def append_many(self, entries: Iterable[Entry], ignore_existing: bool = False) -> int:
+        """Insert in batches of prepared statements, one transaction per batch."""
+        sql = _SQLITE_INSERT.replace("INSERT", "INSERT OR IGNORE", 1) if ignore_existing else _SQLITE_INSERT
+        conn = self._connect()
+        count = 0
+        batch = []
+        for entry in entries:
+            batch.append(_entry_row(entry))
+            if len(batch) >= _SQLITE_BATCH:
+                with conn:
+                    count += conn.executemany(sql, batch).rowcount
+                batch = []
+        if batch:
+            with conn:
+                count += conn.executemany(sql, batch).rowcount
+        metrics.count_rows("sqlite", count, "written")
+        return count
+
+    def iter_entries(self) -> Iterator[Entry]:
+        cursor = self._connect().execute(f"SELECT {_SQLITE_COLUMNS} FROM entries ORDER BY seq")
+        rows = 0
+        try:
+            for row in cursor:
+                rows += 1
+                yield Entry(*row)
+        finally:
+            metrics.count_rows("sqlite", rows)
+
+    def version(self) -> DataVersion | None:
+        # committed transactions land in the WAL file until a checkpoint
+        return _files_version([self.path, self.path.with_name(self.path.name + "-wal")])
+
+    def get(self, entry_id: str) -> Entry | None:
+        row = self._connect().execute(f"SELECT {_SQLITE_COLUMNS} FROM entries WHERE id = ?", (entry_id,)).fetchone()
+        return Entry(*row) if row else None
+
+    def update(self, entry_id: str, **fields) -> Entry | None:
+        current = self.get(entry_id)
+        if current is None:
+            return None
+        updated = _apply_fields(current, fields)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE entries SET date = ?, time = ?, description = ?, tags = ?, duration_minutes = ? WHERE id = ?",
+                (*_entry_row(updated)[1:], entry_id),
+            )
+        metrics.count_rows("sqlite", 1, "written")
+        return updated
+
+    def delete(self, entry_id: str) -> bool:
+        conn = self._connect()
+        with conn:
+            deleted = conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,)).rowcount
+        return deleted > 0
+
+    def vacuum(self) -> int:
+        self._connect().execute("VACUUM")
+        return 0
+
+    @metrics.timed("sqlite_page")
+    def page(self, limit: int = 50, cursor: str | None = None) -> Page:
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        sql = f"SELECT {_SQLITE_COLUMNS} FROM entries"
+        params: tuple = ()
+        if cursor:
+            _, _, key = _decode_cursor(cursor)
+            sql += " WHERE (date, time, id) < (?, ?, ?)"
+            params = key
+        sql += " ORDER BY date DESC, time DESC, id DESC LIMIT ?"
+        entries = [Entry(*row) for row in self._connect().execute(sql, (*params, limit + 1))]
+        metrics.count_rows("sqlite", len(entries))
+        if len(entries) <= limit:
+            return Page(entries, None)
+        entries = entries[:limit]
+        return Page(entries, _encode_cursor(0, 0, _sort_key(entries[-1])))
+
+
+# --- month-partitioned layout ---------------------------------------------
+
+PARTITION_MANIFEST = "manifest.json"
+UNDATED = "0000-00"  # partition for rows whose date is not YYYY-MM-DD
+_MONTH = re.compile(r"^(\d{4}-\d{2})-\d{2}$")
+_PARTITION_NAME = re.compile(r"^\d{4}-\d{2}$")
+
+
+def is_partitioned(path: Path) -> bool:
+    """True when `path` is the directory of a month-partitioned store."""
+    return (Path(path) / PARTITION_MANIFEST).is_file()
+
+
+def partition_of(entry_date: str) -> str:
+    """Partition name ("YYYY-MM") for an entry date; UNDATED for malformed dates."""
+    match = _MONTH.match(entry_date)
+    return match.group(1) if match else UNDATED
+
+
+def partition_path(root: Path, name: str) -> Path:
+    return Path(root) / f"{name}.csv"
+
+
+def read_manifest(root: Path) -> List[str]:
+    """Partition names listed in the manifest, oldest first."""
+    data = json.loads((Path(root) / PARTITION_MANIFEST).read_text(encoding="utf-8"))
+    return sorted(name for name in data["partitions"] if _PARTITION_NAME.match(name))
+
+
+def init_partitioned(root: Path) -> None:
+    """Create an empty partitioned store at `root` (a no-op if there is one)."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    if not is_partitioned(root):
+        _update_manifest(root, [])
+
+
+def _update_manifest(root: Path, names: Iterable[str]) -> None:
+    """Add partitions to the manifest; updates from several processes take turns."""
+    with open(root / f".{PARTITION_MANIFEST}.lock", "ab") as lock, _file_lock(lock):
+        manifest = root / PARTITION_MANIFEST
+        listed = set(read_manifest(root)) if manifest.exists() else set()
+        if manifest.exists() and listed.issuperset(names):
+            return
+        data = {"layout": "month", "partitions": sorted(listed.union(names))}
+        tmp = root / f".{PARTITION_MANIFEST}.tmp"
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, manifest)
+
+
+def _append_partitioned(root: Path, entries: Iterable[Entry], chunk_size: int = 1000) -> int:
+    """Append entries to their month's partition, in chunks; returns the count."""
+    root = Path(root)
+    known = set(read_manifest(root))
+    count = 0
+    for chunk in _chunks(entries, chunk_size):
+        by_partition: dict[str, List[Entry]] = {}
+        for entry in chunk:
+            by_partition.setdefault(partition_of(entry.date), []).append(entry)
+        new = set(by_partition) - known
+        if new:
+            _update_manifest(root, new)  # listed before the file exists, so readers never miss it
+            known |= new
+        for name, rows in by_partition.items():
+            path = partition_path(root, name)
+            ensure_csv(path)
+            with path.open("ab") as f:
+                _write_chunk(path, f, rows)
+        count += len(chunk)
+    return count
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# worker count -> process pool shared by every partitioned scan in this process
+_process_pools: dict[int, ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    with _process_pools_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            # never fork: the workers would inherit writer threads, locks and open connections
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _process_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method),
+            )
+        return pool
+
+
+@atexit.register
+def _shutdown_process_pools() -> None:
+    with _process_pools_lock:
+        pools = list(_process_pools.values())
+        _process_pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+def fan_out(func: Callable, items: List, workers: int | None = None) -> Iterator:
+    """Yield ``func(item)`` for each item, in order, computed in worker processes.
+
+    At most two tasks per worker are in flight, so results that are not
+    consumed yet do not pile up. `func` must be a picklable module-level
+    function. With one worker or one item it simply runs here.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(item)
+        return
+    pool = _process_pool(workers)
+    pending: deque = deque()
+    queued = iter(items)
+    try:
+        for item in islice(queued, 2 * workers):
+            pending.append(pool.submit(func, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(queued, 1):
+                pending.append(pool.submit(func, item))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _partition_rows(path: Path) -> List[Entry]:
+    return list(iter_entries(path))
+
+
+def _partition_rows_between(path: Path, since: str | None, until: str | None) -> List[Entry]:
+    return [e for e in iter_entries(path) if (since is None or e.date >= since) and (until is None or e.date <= until)]
+
+
+def _encode_partition_cursor(name: str, inner: str | None) -> str:
+    raw = json.dumps([name, inner], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_partition_cursor(cursor: str) -> tuple[str, str | None]:
+    try:
+        name, inner = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not (isinstance(name, str) and _PARTITION_NAME.match(name) and (inner is None or isinstance(inner, str))):
+            raise ValueError
+        return name, inner
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+class PartitionedBackend(EditableBackend):
+    """One CSV file per month under a directory (`practica/2026-01.csv`, ...).
+
+    `manifest.json` lists the partitions. Appends go to the partition of each
+    entry's date, rows with a malformed date to `UNDATED`. Each partition is
+    a regular entries CSV, so the per-file helpers (cache, backwards paging,
+    row-offset index) work on it unchanged. Date-range reads open only the
+    partitions they overlap. Full scans parse the partitions in worker
+    processes (`fan_out`, `workers` of them, default one per CPU) and yield
+    them back in month order.
+    """
+
+    default_path = "practica"
+
+    def __init__(self, path: Path | str | None = None, workers: int | None = None):
+        super().__init__(path)
+        self.workers = workers
+
+    def partitions(self) -> List[str]:
+        return read_manifest(self.path) if is_partitioned(self.path) else []
+
+    def _paths(self, names: Iterable[str]) -> List[Path]:
+        paths = (partition_path(self.path, name) for name in names)
+        return [path for path in paths if path.exists()]
+
+    def append_many(self, entries: Iterable[Entry]) -> int:
+        init_partitioned(self.path)
+        return _append_partitioned(self.path, entries)
+
+    def iter_entries(self) -> Iterator[Entry]:
+        for rows in fan_out(_partition_rows, self._paths(self.partitions()), self.workers):
+            yield from rows
+
+    def between(self, since: str | None = None, until: str | None = None) -> Iterator[Entry]:
+        names = [
+            name for name in self.partitions()
+            if name != UNDATED and (since is None or name >= since[:7]) and (until is None or name <= until[:7])
+        ]
+        scan = partial(_partition_rows_between, since=since, until=until)
+        for rows in fan_out(scan, self._paths(names), self.workers):
+            yield from rows
+
+    def page(self, limit: int = 50, cursor: str | None = None) -> Page:
+        """Newest first: partitions newest month first, each paged with `read_page`."""
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        start, inner = _decode_partition_cursor(cursor) if cursor else (None, None)
+        names = [name for name in reversed(self.partitions()) if start is None or name <= start]
+        out: List[Entry] = []
+        for i, name in enumerate(names):
+            page = read_page(partition_path(self.path, name), limit - len(out), inner if name == start else None)
+            out.extend(page.entries)
+            if page.next_cursor is not None:
+                return Page(out, _encode_partition_cursor(name, page.next_cursor))
+            if len(out) >= limit:
+                return Page(out, _encode_partition_cursor(names[i + 1], None) if i + 1 < len(names) else None)
+        return Page(out, None)
+
+    def get(self, entry_id: str) -> Entry | None:
+        """Newest partition first; a partition is only indexed (`get_entry`)
+        once a plain byte search of its file finds the id."""
+        needle = entry_id.encode("utf-8")
+        for path in reversed(self._paths(self.partitions())):
+            with path.open("rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    continue
+                with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(needle) < 0:
+                        continue
+            entry = get_entry(path, entry_id)
+            if entry is not None:
+                return entry
+        return None
+
+    def update(self, entry_id: str, **fields) -> Entry | None:
+        return update_entry(self.path, entry_id, **fields)
+
+    def delete(self, entry_id: str) -> bool:
+        return delete_entry(self.path, entry_id)
+
+    def vacuum(self) -> int:
+        return vacuum(self.path)
+
+    def version(self) -> DataVersion | None:
+        if not is_partitioned(self.path):
+            return None
+        return _files_version([self.path / PARTITION_MANIFEST, *self._paths(self.partitions())])
+
+
+def convert_to_partitioned(csv_path: Path, root: Path) -> int:
+    """Stream a single-file CSV store into a partitioned one at `root`, returns rows copied.
+
+    Rows keep their file order within each month. `root` must not hold
+    entries yet, so a half-done conversion is not silently doubled.
+    """
+    init_partitioned(root)
+    if read_manifest(root):
+        raise ValueError(f"{root} already holds partitioned entries")
+    return _append_partitioned(root, iter_entries(csv_path))
+
+
+# --- block-compressed layout ----------------------------------------------
+
+BLOCKS_SUFFIX = ".csvz"
+TAIL_SUFFIX = ".tail"
+BLOCK_BYTES = 256 * 1024  # raw CSV bytes gathered in the tail before they are sealed into a block
+CODECS = {"zlib": 1, "lzma": 2}
+_CODEC_NAMES = {number: name for name, number in CODECS.items()}
+_BLOCKS_HEADER = struct.Struct("<8sB7x")  # magic, codec for new blocks
+_BLOCKS_MAGIC = b"PRACBLK1"
+# magic, codec, rows, raw size, compressed size, crc32 of the compressed bytes, lowest date, highest date
+_BLOCK_HEADER = struct.Struct("<4sB3xIIII10s10s")
+_BLOCK_MAGIC = b"BLK1"
+_TAIL_HEADER = struct.Struct("<8sQ")  # magic, number of the row the tail starts with
+_TAIL_MAGIC = b"PRACTAIL"
+_LOWEST_DATE = b"\0" * 10
+_HIGHEST_DATE = b"\xff" * 10
+
+
+def is_compressed(path: Path) -> bool:
+    """True when `path` names a block-compressed store (by its `.csvz` suffix)."""
+    return Path(path).suffix == BLOCKS_SUFFIX
+
+
+def tail_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + TAIL_SUFFIX)
+
+
+@dataclass(frozen=True)
+class BlockInfo:
+    """Where one compressed block sits and what it holds; the block index is a list of these."""
+
+    offset: int  # of the block header
+    first_row: int
+    rows: int
+    codec: int
+    raw_size: int
+    size: int
+    crc: int
+    min_date: bytes
+    max_date: bytes
+
+    def overlaps(self, since: str | None, until: str | None) -> bool:
+        """Could the block hold a date from `since` to `until`? (compared like `between`)"""
+        return (since is None or self.max_date >= since.encode("utf-8")) and (
+            until is None or self.min_date <= until.encode("utf-8")
+        )
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == CODECS["lzma"]:
+        import lzma
+
+        return lzma.compress(data, preset=6)
+    return zlib.compress(data, 6)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODECS["lzma"]:
+        import lzma
+
+        return lzma.decompress(data)
+    if codec != CODECS["zlib"]:
+        raise ValueError(f"Unknown block codec: {codec}")
+    return zlib.decompress(data)
+
+
+def _encode_block(entries: List[Entry], codec: int, raw: bytes | None = None) -> bytes:
+    """A block header plus the compressed rows; `raw` is their CSV encoding when already at hand."""
+    raw = _encode_rows(entries) if raw is None else raw
+    data = _compress(codec, raw)
+    dates = [e.date.encode("utf-8") for e in entries]
+    if all(len(d) == 10 for d in dates):
+        low, high = min(dates), max(dates)
+    else:
+        low, high = _LOWEST_DATE, _HIGHEST_DATE  # odd dates: never skip this block
+    header = _BLOCK_HEADER.pack(_BLOCK_MAGIC, codec, len(entries), len(raw), len(data), zlib.crc32(data), low, high)
+    return header + data
+
+
+def _index_blocks(f, start: int, first_row: int, size: int) -> tuple[List[BlockInfo], int]:
+    """Hop over the block headers from byte `start`, returns the blocks and where they end.
+
+    Stops at the first block that is not whole (a seal that never finished).
+    """
+    blocks = []
+    pos = start
+    while pos + _BLOCK_HEADER.size <= size:
+        f.seek(pos)
+        magic, codec, rows, raw_size, length, crc, low, high = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+        if magic != _BLOCK_MAGIC or pos + _BLOCK_HEADER.size + length > size:
+            break
+        blocks.append(BlockInfo(pos, first_row, rows, codec, raw_size, length, crc, low, high))
+        first_row += rows
+        pos += _BLOCK_HEADER.size + length
+    return blocks, pos
+
+
+# store key -> ((device, inode), indexed end, blocks); blocks are only ever appended
+_block_indexes: dict[str, tuple[tuple[int, int], int, List[BlockInfo]]] = {}
+_block_indexes_lock = threading.Lock()
+
+
+def _block_index(path: Path, f) -> tuple[List[BlockInfo], int]:
+    """The blocks of the open store file `f`, indexing only blocks added since the last call."""
+    st = os.fstat(f.fileno())
+    key = _cache_key(path)
+    with _block_indexes_lock:
+        ident, end, blocks = _block_indexes.get(key, (None, 0, []))
+        if ident != (st.st_dev, st.st_ino) or end > st.st_size:
+            end, blocks = _BLOCKS_HEADER.size, []
+        first_row = blocks[-1].first_row + blocks[-1].rows if blocks else 0
+        added, end = _index_blocks(f, end, first_row, st.st_size)
+        if added:
+            blocks = blocks + added
+        _block_indexes[key] = ((st.st_dev, st.st_ino), end, blocks)
+        return blocks, end
+
+
+def _read_block(f, block: BlockInfo) -> List[Entry]:
+    f.seek(block.offset + _BLOCK_HEADER.size)
+    data = f.read(block.size)
+    if zlib.crc32(data) != block.crc:
+        raise ValueError(f"Corrupt block at byte {block.offset} of {getattr(f, 'name', 'store')}")
+    raw = _decompress(block.codec, data)
+    metrics.count_bytes_read("entries_blocks", block.size)
+    metrics.count_rows("entries_blocks", block.rows)
+    return [_row_to_entry(CSV_FIELDS, values) for values in csv.reader(io.StringIO(raw.decode("utf-8"), newline="")) if values]
+
+
+def _read_tail(path: Path) -> tuple[int, List[Entry], bytes]:
+    """Row number the tail starts with, its whole rows and their CSV bytes."""
+    try:
+        data = tail_path(path).read_bytes()
+    except FileNotFoundError:
+        return 0, [], b""
+    if len(data) < _TAIL_HEADER.size:
+        return 0, [], b""
+    magic, base = _TAIL_HEADER.unpack_from(data)
+    if magic != _TAIL_MAGIC:
+        raise ValueError(f"{tail_path(path)} is not a block store tail")
+    body = data[_TAIL_HEADER.size:]
+    cut = _complete_prefix(body)
+    if cut < len(body) and body[cut:].strip():
+        # a last row without a newline: whole, or still being written?
+        with tail_path(path).open("rb") as t, Path(path).open("rb") as lock_file:
+            if _final_row(t, _TAIL_HEADER.size + cut, len(data), CSV_FIELDS, lock_file) is not None:
+                cut = len(body)
+    body = body[:cut]
+    rows = [_row_to_entry(CSV_FIELDS, values) for values in csv.reader(io.StringIO(body.decode("utf-8"), newline="")) if values]
+    metrics.count_bytes_read("entries_blocks", len(body))
+    metrics.count_rows("entries_blocks", len(rows))
+    return base, rows, body
+
+
+@dataclass
+class _BlockSnapshot:
+    f: BinaryIO
+    blocks: List[BlockInfo]
+    end: int  # where the whole blocks end
+    tail: List[Entry]  # rows after the last block
+
+    @property
+    def sealed(self) -> int:
+        return self.blocks[-1].first_row + self.blocks[-1].rows if self.blocks else 0
+
+    @property
+    def rows(self) -> int:
+        return self.sealed + len(self.tail)
+
+
+@contextmanager
+def _open_blocks(path: Path) -> Iterator[_BlockSnapshot | None]:
+    """A consistent view of a block store, None when there is none.
+
+    The tail is read before the block index: a seal appends the block first
+    and replaces the tail after, so rows the tail shares with a new block are
+    recognised by its starting row number and skipped.
+    """
+    base, tail, _ = _read_tail(path)
+    try:
+        f = Path(path).open("rb")
+    except FileNotFoundError:
+        yield None
+        return
+    with f:
+        blocks, end = _block_index(path, f)
+        snapshot = _BlockSnapshot(f, blocks, end, [])
+        snapshot.tail = tail[max(0, snapshot.sealed - base):]
+        yield snapshot
+
+
+def init_blocks(path: Path, codec: str = "zlib") -> None:
+    """Create an empty block store at `path` whose blocks use `codec` (a no-op if there is one)."""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec: {codec!r} (expected one of {sorted(CODECS)})")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as f, _file_lock(f):
+        if f.seek(0, os.SEEK_END) == 0:
+            f.write(_BLOCKS_HEADER.pack(_BLOCKS_MAGIC, CODECS[codec]))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _append_blocks(path: Path, entries: Iterable[Entry], chunk_size: int = 1000) -> int:
+    """Append entries to the tail, sealing it into a block once it holds `BLOCK_BYTES`.
+
+    Appends and seals from all processes take turns through a lock on the
+    store file. A seal writes and fsyncs the new block, then atomically
+    replaces the tail with the rows that did not go into it.
+    """
+    path = Path(path)
+    init_blocks(path)
+    count = 0
+    with path.open("r+b") as f, _file_lock(f):
+        magic, codec = _BLOCKS_HEADER.unpack(f.read(_BLOCKS_HEADER.size))
+        if magic != _BLOCKS_MAGIC:
+            raise ValueError(f"{path} is not a block store")
+        tail = tail_path(path)
+        if not tail.exists() or tail.stat().st_size < _TAIL_HEADER.size:
+            tail.write_bytes(_TAIL_HEADER.pack(_TAIL_MAGIC, 0))
+        for chunk in _chunks(entries, chunk_size):
+            data = _encode_rows(chunk)
+            if tail.stat().st_size > _TAIL_HEADER.size and _ends_mid_line(tail):
+                data = b"\n" + data
+            with tail.open("ab") as t:
+                t.write(data)
+                size = t.tell()
+            metrics.count_bytes_written("entries_blocks", len(data))
+            metrics.count_rows("entries_blocks", len(chunk), "written")
+            count += len(chunk)
+            if size - _TAIL_HEADER.size >= BLOCK_BYTES:
+                _seal(path, f, codec)
+    _notify_appended(path)
+    return count
+
+
+def _seal(path: Path, f, codec: int) -> None:
+    """Compress the tail into one block; `f` is the locked store file."""
+    base, rows, body = _read_tail(path)
+    blocks, end = _block_index(path, f)
+    sealed = blocks[-1].first_row + blocks[-1].rows if blocks else 0
+    pending = rows[max(0, sealed - base):]
+    if pending:
+        f.truncate(end)  # drop a block a crashed seal left half written
+        f.seek(end)
+        # the tail already holds the rows as CSV unless a crashed seal stored some of them
+        block = _encode_block(pending, codec, body if len(pending) == len(rows) else None)
+        f.write(block)
+        f.flush()
+        os.fsync(f.fileno())
+        metrics.count_bytes_written("entries_blocks", len(block))
+    tail = tail_path(path)
+    tmp = tail.with_name(f".{tail.name}.tmp")
+    with tmp.open("wb") as t:
+        t.write(_TAIL_HEADER.pack(_TAIL_MAGIC, sealed + len(pending)))
+        t.flush()
+        os.fsync(t.fileno())
+    os.replace(tmp, tail)
+
+
+def iter_blocks(path: Path, since: str | None = None, until: str | None = None) -> Iterator[Entry]:
+    """Stream the entries of a block store in append order, one block at a time.
+
+    With `since` / `until` (ISO dates, inclusive) only the blocks whose date
+    span overlaps the range are decompressed.
+    """
+    with _open_blocks(path) as snapshot:
+        if snapshot is None:
+            return
+        dated = since is not None or until is not None
+        for block in snapshot.blocks:
+            if dated and not block.overlaps(since, until):
+                continue
+            for entry in _read_block(snapshot.f, block):
+                if not dated or ((since is None or entry.date >= since) and (until is None or entry.date <= until)):
+                    yield entry
+        for entry in snapshot.tail:
+            if not dated or ((since is None or entry.date >= since) and (until is None or entry.date <= until)):
+                yield entry
+
+
+@metrics.timed("read_rows")
+def read_rows(path: Path, start: int, stop: int | None = None) -> List[Entry]:
+    """Rows `start` to `stop` (exclusive, 0-based in append order) of a block store,
+    decompressing only the blocks that hold them."""
+    with _open_blocks(path) as snapshot:
+        if snapshot is None:
+            return []
+        stop = snapshot.rows if stop is None else min(stop, snapshot.rows)
+        out: List[Entry] = []
+        i = bisect.bisect_right([b.first_row for b in snapshot.blocks], start) - 1
+        for block in snapshot.blocks[max(i, 0):]:
+            if block.first_row >= stop:
+                break
+            rows = _read_block(snapshot.f, block)
+            out.extend(rows[max(0, start - block.first_row):stop - block.first_row])
+        sealed = snapshot.sealed
+        out.extend(snapshot.tail[max(0, start - sealed):max(0, stop - sealed)])
+        return out
+
+
+def _scan_blocks_reversed(path: Path, end: int | None = None) -> Iterator[tuple[int, int, Entry]]:
+    """`_scan_reversed` for a block store: ``(row, row + 1, entry)`` for rows before `end`, last first."""
+    with _open_blocks(path) as snapshot:
+        if snapshot is None:
+            return
+        end = snapshot.rows if end is None else min(end, snapshot.rows)
+        sealed = snapshot.sealed
+        for row in range(end - 1, sealed - 1, -1):
+            yield row, row + 1, snapshot.tail[row - sealed]
+        for block in reversed(snapshot.blocks):
+            if block.first_row >= end:
+                continue
+            rows = _read_block(snapshot.f, block)
+            for i in range(min(block.rows, end - block.first_row) - 1, -1, -1):
+                yield block.first_row + i, block.first_row + i + 1, rows[i]
+
+
+def block_stats(path: Path) -> dict:
+    """Rows, blocks and sizes of a block store, with its compression ratio."""
+    with _open_blocks(path) as snapshot:
+        if snapshot is None:
+            return {"rows": 0, "blocks": 0, "raw_bytes": 0, "stored_bytes": 0, "ratio": None}
+        raw = sum(b.raw_size for b in snapshot.blocks)
+        stored = sum(_BLOCK_HEADER.size + b.size for b in snapshot.blocks)
+        tail = len(_encode_rows(snapshot.tail))
+        return {
+            "rows": snapshot.rows,
+            "blocks": len(snapshot.blocks),
+            "raw_bytes": raw + tail,
+            "stored_bytes": stored + tail,
+            "ratio": round((raw + tail) / (stored + tail), 2) if stored + tail else None,
+        }
+
+
+class CompressedBackend(StorageBackend):
+    """Entries in independently compressed blocks (`practica.csvz`, zlib or lzma).
+
+    Appends go to a plain CSV tail (`practica.csvz.tail`); once it holds
+    `BLOCK_BYTES` it is compressed into a block. Each block header records
+    its row count and the lowest and highest date in it, so date ranges,
+    row ranges (`read_rows`) and newest-first pages decompress only the
+    blocks they need. Updates and deletes are not supported.
+    """
+
+    default_path = "practica.csvz"
+
+    def __init__(self, path: Path | str | None = None, codec: str = "zlib"):
+        super().__init__(path)
+        self.codec = codec
+
+    def append_many(self, entries: Iterable[Entry]) -> int:
+        init_blocks(self.path, self.codec)
+        return _append_blocks(self.path, entries)
+
+    def iter_entries(self) -> Iterator[Entry]:
+        return iter_blocks(self.path)
+
+    def between(self, since: str | None = None, until: str | None = None) -> Iterator[Entry]:
+        return iter_blocks(self.path, since, until)
+
+    def page(self, limit: int = 50, cursor: str | None = None) -> Page:
+        return _page_from(partial(_scan_blocks_reversed, self.path), limit, cursor)
+
+    def get(self, entry_id: str) -> Entry | None:
+        """Newest block first, decompressing until the id turns up."""
+        for _, _, entry in _scan_blocks_reversed(self.path):
+            if entry.id == entry_id:
+                return entry
+        return None
+
+    def version(self) -> DataVersion | None:
+        return _files_version([self.path, tail_path(self.path)]) if self.path.exists() else None
+
+
+def convert_to_compressed(csv_path: Path, path: Path, codec: str = "zlib") -> int:
+    """Stream a single-file CSV store into a new block store at `path`, returns rows copied."""
+    if Path(path).exists() and Path(path).stat().st_size > _BLOCKS_HEADER.size:
+        raise ValueError(f"{path} already holds entries")
+    init_blocks(path, codec)
+    count = _append_blocks(path, iter_entries(csv_path))
+    with Path(path).open("r+b") as f, _file_lock(f):
+        _seal(path, f, CODECS[codec])  # the remainder too: nothing is left uncompressed
+    return count
+
+
+BACKENDS: dict[str, type[StorageBackend]] = {
+    "csv": CsvBackend,
+    "sqlite": SqliteBackend,
+    "partitioned": PartitionedBackend,
+    "compressed": CompressedBackend,
+}
+
+
+def get_backend(name: str = "csv", path: Path | str | None = None, **options) -> StorageBackend:
+    """Build the backend registered as `name` for the data file at `path`."""
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {name!r} (expected one of {sorted(BACKENDS)})") from None
+    return cls(path, **options)
+
+
+def migrate_csv_to_sqlite(csv_path: Path, db_path: Path) -> int:
+    """Stream every row of a CSV file into a sqlite database, returns rows copied.
+
+    Rows whose id is already in the database are skipped, so re-running is safe.
+    """
+    backend = SqliteBackend(db_path)
+    try:
+        return backend.append_many(iter_entries(csv_path), ignore_existing=True)
+    finally:
+        backend.close()
@@ -0,0 +1,215 @@
+"""Columnar, memory-compact container for large entry histories.
+
+
+Responsibilities:
+- `EntryTable` stores entries column-wise in `array` buffers: dates as day
+  ordinals, times as minutes of day, durations as unsigned ints and tags as
+  codes into a small table of distinct tag strings
+- Row access returns regular `store.Entry` objects, so callers keep working
+  with the same attributes
+- Sorting, filtering and summing run over the arrays (NumPy is used when it
+  is installed, plain Python otherwise)
+
+A row costs roughly the id and description strings plus ~14 bytes, against
+several hundred bytes for a list of `Entry` objects with one `str` per field.
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+import re
+import sys
+from typing import Iterable, Iterator, List
+
+from practica_tracker.store import Entry, iter_entries
+
+NO_DATE = 0  # ordinal used for a missing or malformed date
+NO_TIME = -1  # minutes used for a missing or malformed time
+MAX_DURATION = 2**32 - 1  # what the unsigned durations column holds
+
+_TAG_SPLIT = re.compile(r"[,\s]+")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return numpy
+
+
+def date_ordinal(value: str) -> int:
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        return NO_DATE
+
+
+def time_minutes(value: str) -> int:
+    try:
+        hours, minutes = value.split(":")
+        hours, minutes = int(hours), int(minutes)
+    except ValueError:
+        return NO_TIME
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return NO_TIME
+    return hours * 60 + minutes
+
+
+@lru_cache(maxsize=4096)
+def _iso_date(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat() if ordinal != NO_DATE else ""
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}" if minutes != NO_TIME else ""
+
+
+def tag_tokens(tags: str) -> set[str]:
+    """Individual tags of a free-form tags string ("py, cli" -> {"py", "cli"})."""
+    return {t for t in _TAG_SPLIT.split(tags.strip().lower()) if t}
+
+
+class EntryTable:
+    """Entries stored column by column.
+
+    Dates and times that are not ISO dates / HH:MM are stored as NO_DATE /
+    NO_TIME and come back as empty strings. Durations must be 0..MAX_DURATION:
+    `append` raises ValueError for others and leaves the table unchanged.
+    """
+
+    __slots__ = ("ids", "dates", "times", "durations", "descriptions", "tag_codes", "tag_values", "_tag_index")
+
+    def __init__(self, entries: Iterable[Entry] = ()):
+        self.ids: List[str] = []
+        self.dates = array("i")
+        self.times = array("h")
+        self.durations = array("I")
+        self.descriptions: List[str] = []
+        self.tag_codes = array("I")
+        self.tag_values: List[str] = []
+        self._tag_index: dict[str, int] = {}
+        self.extend(entries)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "EntryTable":
+        """Build a table by streaming a CSV file, never holding Entry objects."""
+        return cls(iter_entries(path))
+
+    def append(self, entry: Entry) -> None:
+        # every value is checked before any column grows, so the columns stay in step
+        duration = entry.duration_minutes
+        if not 0 <= duration <= MAX_DURATION:
+            raise ValueError(f"invalid duration_minutes: {duration!r}")
+        ordinal, minutes = date_ordinal(entry.date), time_minutes(entry.time)
+        description, tag_code = sys.intern(entry.description), self._tag_code(entry.tags)
+        self.ids.append(entry.id)
+        self.dates.append(ordinal)
+        self.times.append(minutes)
+        self.durations.append(duration)
+        self.descriptions.append(description)
+        self.tag_codes.append(tag_code)
+
+    def extend(self, entries: Iterable[Entry]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def _tag_code(self, tags: str) -> int:
+        code = self._tag_index.get(tags)
+        if code is None:
+            code = self._tag_index[tags] = len(self.tag_values)
+            self.tag_values.append(sys.intern(tags))
+        return code
+
+    # --- row access -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Entry:
+        return Entry(
+            id=self.ids[index],
+            date=_iso_date(self.dates[index]),
+            time=_hhmm(self.times[index]),
+            description=self.descriptions[index],
+            tags=self.tag_values[self.tag_codes[index]],
+            duration_minutes=self.durations[index],
+        )
+
+    def __iter__(self) -> Iterator[Entry]:
+        return (self[i] for i in range(len(self)))
+
+    def take(self, indices: Iterable[int]) -> "EntryTable":
+        """New table with the given rows, in the given order (tag table is shared)."""
+        out = EntryTable()
+        out.tag_values = self.tag_values
+        out._tag_index = self._tag_index
+        for i in indices:
+            out.ids.append(self.ids[i])
+            out.dates.append(self.dates[i])
+            out.times.append(self.times[i])
+            out.durations.append(self.durations[i])
+            out.descriptions.append(self.descriptions[i])
+            out.tag_codes.append(self.tag_codes[i])
+        return out
+
+    # --- column operations ------------------------------------------------
+
+    def order_by_datetime(self, reverse: bool = False) -> List[int]:
+        """Row indices ordered by (date, time); stable for equal timestamps."""
+        np = _numpy()
+        if np is not None and len(self):
+            dates = np.frombuffer(self.dates, dtype=np.int32).astype(np.int64)
+            times = np.frombuffer(self.times, dtype=np.int16).astype(np.int64)
+            keys = dates * 1440 + times
+            order = np.argsort(-keys if reverse else keys, kind="stable")
+            return order.tolist()
+        dates, times = self.dates, self.times
+        return sorted(range(len(self)), key=lambda i: dates[i] * 1440 + times[i], reverse=reverse)
+
+    def sorted(self, reverse: bool = False) -> "EntryTable":
+        return self.take(self.order_by_datetime(reverse))
+
+    def _matching_tag_codes(self, tag: str) -> List[int]:
+        tag = tag.strip().lower()
+        return [code for code, value in enumerate(self.tag_values) if tag in tag_tokens(value)]
+
+    def select(self, since: date | None = None, until: date | None = None, tag: str | None = None) -> List[int]:
+        """Indices of rows with since <= date <= until (inclusive) and carrying `tag`."""
+        lo = since.toordinal() if since is not None else None
+        hi = until.toordinal() if until is not None else None
+        codes = self._matching_tag_codes(tag) if tag else None
+        np = _numpy()
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            dates = np.frombuffer(self.dates, dtype=np.int32)
+            if lo is not None:
+                mask &= dates >= lo
+            if hi is not None:
+                mask &= dates <= hi
+            if codes is not None:
+                mask &= np.isin(np.frombuffer(self.tag_codes, dtype=np.uint32), codes)
+            return np.flatnonzero(mask).tolist()
+        wanted = set(codes) if codes is not None else None
+        dates, tag_codes = self.dates, self.tag_codes
+        return [
+            i for i in range(len(self))
+            if (lo is None or dates[i] >= lo)
+            and (hi is None or dates[i] <= hi)
+            and (wanted is None or tag_codes[i] in wanted)
+        ]
+
+    def filter(self, since: date | None = None, until: date | None = None, tag: str | None = None) -> "EntryTable":
+        return self.take(self.select(since, until, tag))
+
+    def total_duration(self, indices: Iterable[int] | None = None) -> int:
+        """Sum of duration_minutes over all rows or the given ones."""
+        np = _numpy()
+        if indices is None:
+            if np is not None:
+                return int(np.frombuffer(self.durations, dtype=np.uint32).sum(dtype=np.int64))
+            return sum(self.durations)
+        durations = self.durations
+        return sum(durations[i] for i in indices)
@@ -0,0 +1,177 @@
+"""Per-user data under one data root, served from one process.
+
+
+Responsibilities:
+- Each user (tenant) gets a directory under the data root holding their
+  entries in the backend's usual file name (`<root>/alice/practica.csv`) and
+  their challenges (`<root>/alice/challenges.json`)
+- `TenantManager` hands out a backend per user and keeps at most
+  `max_tenants` of them open, least recently used first out, plus any idle
+  for more than `idle_seconds` (checked whenever a tenant is acquired or
+  released, or by `evict_idle`)
+- Evicting a tenant closes its backend (every thread's sqlite connection)
+  and releases everything else the process keeps for its files
+  (`store.release`): the group-commit writer thread, parsed entries,
+  row-offset, block and search indexes, stats trackers. Their next request
+  rebuilds these from disk, incrementally where it can
+- A tenant in use (`acquire` / `release`, or `use`) is never evicted, so a
+  request never sees its writer closed under it
+
+User names become directory names, so only letters, digits, `_`, `-` and
+`.` are accepted (not leading `.`), at most 64 characters.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Iterator
+
+from practica_tracker import metrics, store
+from practica_tracker.store import BACKENDS, StorageBackend, get_backend
+
+DEFAULT_MAX_TENANTS = 64
+DEFAULT_IDLE_SECONDS = 300.0
+CHALLENGES_NAME = "challenges.json"
+
+_USER = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}")
+
+TENANTS = metrics.Counter("practica_tenants_total", "Tenant lookups and evictions", ("result",))
+
+
+def check_user(user: str) -> str:
+    """`user` if it is a valid tenant name, else ValueError."""
+    if not isinstance(user, str) or not _USER.fullmatch(user):
+        raise ValueError(f"invalid user name: {user!r}")
+    return user
+
+
+@dataclass(eq=False)
+class Tenant:
+    user: str
+    root: Path
+    backend: StorageBackend
+    pins: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def challenges_path(self) -> Path:
+        return self.root / CHALLENGES_NAME
+
+
+class TenantManager:
+    """Backends for the users under `root`, at most `max_tenants` kept open. Thread safe."""
+
+    def __init__(
+        self,
+        root: Path | str,
+        kind: str = "csv",
+        max_tenants: int = DEFAULT_MAX_TENANTS,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        group_commit_delay: float | None = None,
+    ):
+        if kind not in BACKENDS:
+            raise ValueError(f"Unknown backend: {kind!r}")
+        self.root = Path(root)
+        self.kind = kind
+        self.max_tenants = max_tenants
+        self.idle_seconds = idle_seconds
+        self.group_commit_delay = group_commit_delay
+        self._cond = threading.Condition()
+        self._tenants: OrderedDict[str, Tenant] = OrderedDict()  # least recently used first
+        self._evicting: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, user: str) -> bool:
+        return user in self._tenants
+
+    def path(self, user: str) -> Path:
+        """Where `user`'s entries live."""
+        return self.root / check_user(user) / BACKENDS[self.kind].default_path
+
+    def acquire(self, user: str) -> Tenant:
+        """`user`'s tenant, opened if needed and pinned until `release`."""
+        path = self.path(user)
+        with self._cond:
+            while user in self._evicting:  # let its writer finish before opening a new one
+                self._cond.wait()
+            tenant = self._tenants.get(user)
+            if tenant is None:
+                TENANTS.inc("opened")
+                tenant = self._tenants[user] = Tenant(user, path.parent, self._open(path))
+            else:
+                TENANTS.inc("hit")
+                self._tenants.move_to_end(user)
+            tenant.pins += 1
+            tenant.last_used = time.monotonic()
+            evicted = self._pick_evictions(tenant.last_used)
+        self._evict(evicted)
+        return tenant
+
+    def release(self, tenant: Tenant) -> None:
+        """Unpin a tenant from `acquire`; evicts tenants the pins kept over the limit."""
+        with self._cond:
+            tenant.pins -= 1
+            tenant.last_used = time.monotonic()
+            evicted = self._pick_evictions(tenant.last_used)
+        self._evict(evicted)
+
+    @contextmanager
+    def use(self, user: str) -> Iterator[Tenant]:
+        tenant = self.acquire(user)
+        try:
+            yield tenant
+        finally:
+            self.release(tenant)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """Evict unpinned tenants idle for more than `idle_seconds`, returns how many."""
+        with self._cond:
+            evicted = self._pick_evictions(time.monotonic() if now is None else now)
+        self._evict(evicted)
+        return len(evicted)
+
+    def close(self) -> None:
+        """Evict every tenant, pinned or not."""
+        with self._cond:
+            evicted = list(self._tenants.values())
+            self._tenants.clear()
+            self._evicting.update(t.user for t in evicted)
+        self._evict(evicted)
+
+    def _open(self, path: Path) -> StorageBackend:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.kind == "csv":
+            return get_backend(self.kind, path, group_commit_delay=self.group_commit_delay)
+        return get_backend(self.kind, path)
+
+    def _pick_evictions(self, now: float) -> list[Tenant]:
+        # called with the lock held; takes idle tenants, then the least recently used over the limit
+        idle = [t for t in self._tenants.values() if not t.pins and now - t.last_used > self.idle_seconds]
+        for tenant in idle:
+            del self._tenants[tenant.user]
+        over = len(self._tenants) - self.max_tenants
+        lru = [t for t in self._tenants.values() if not t.pins][:max(over, 0)]
+        for tenant in lru:
+            del self._tenants[tenant.user]
+        evicted = idle + lru
+        self._evicting.update(t.user for t in evicted)
+        return evicted
+
+    def _evict(self, evicted: list[Tenant]) -> None:
+        try:
+            for tenant in evicted:
+                tenant.backend.close()
+                store.release(tenant.root)
+        finally:
+            if evicted:
+                TENANTS.inc("evicted", amount=len(evicted))
+                with self._cond:
+                    self._evicting.difference_update(t.user for t in evicted)
+                    self._cond.notify_all()
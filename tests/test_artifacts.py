@@ -0,0 +1,110 @@
+import os
+import time
+
+import pytest
+
+from practica_tracker import artifacts
+from practica_tracker.artifacts import ArtifactCache
+from practica_tracker.store import Entry, append_entries
+
+
+def _build(size):
+    def build(path):
+        path.write_bytes(b"x" * size)
+    return build
+
+
+def test_get_or_build_builds_once(tmp_path):
+    cache = ArtifactCache(tmp_path / "cache")
+    calls = []
+
+    def build(path):
+        calls.append(path)
+        path.write_bytes(b"data")
+
+    first = cache.get_or_build("a.xlsx", build)
+    second = cache.get_or_build("a.xlsx", build)
+    assert first == second and first.read_bytes() == b"data"
+    assert len(calls) == 1
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == ["a.xlsx"]
+
+
+def test_failed_build_leaves_nothing_behind(tmp_path):
+    cache = ArtifactCache(tmp_path / "cache")
+
+    def build(path):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_build("a.xlsx", build)
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_least_recently_used_is_evicted_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "EVICT_GRACE_SECONDS", 0)
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=250)
+    for i, key in enumerate(["a", "b"]):
+        path = cache.get_or_build(key, _build(100))
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    cache.get("a")  # a is now the most recently used
+    cache.get_or_build("c", _build(100))
+    assert sorted(p.name for p in cache.root.iterdir()) == ["a", "c"]
+
+
+def test_rejects_path_like_keys(tmp_path):
+    with pytest.raises(ValueError):
+        ArtifactCache(tmp_path).path("../etc/passwd")
+
+
+@pytest.fixture
+def client(tmp_path):
+    flask_app = pytest.importorskip("practica_tracker.app").app
+    saved = dict(flask_app.config)
+    flask_app.config.update(PRACTICA_BACKEND="csv", PRACTICA_DB=str(tmp_path / "practica.csv"),
+                            PRACTICA_ARTIFACT_DIR=str(tmp_path / "artifacts"))
+    yield flask_app.test_client()
+    flask_app.config.clear()
+    flask_app.config.update(saved)
+
+
+def test_flask_xlsx_export_uses_cache_and_validators(client, tmp_path):
+    pytest.importorskip("openpyxl")
+    db = tmp_path / "practica.csv"
+    append_entries(db, [Entry.new(description="x", date_iso="2026-01-01", time_str="08:00")])
+    first = client.get("/export/xlsx")
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+    etag = first.headers["ETag"]
+    assert len(list((tmp_path / "artifacts").iterdir())) == 1
+    assert client.get("/export/xlsx").data == first.data
+    assert client.get("/export/xlsx", headers={"If-None-Match": etag}).status_code == 304
+
+    append_entries(db, [Entry.new(description="y", date_iso="2026-01-02", time_str="08:00")])
+    changed = client.get("/export/xlsx", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert len(list((tmp_path / "artifacts").iterdir())) == 2
+
+
+def test_flask_csv_export_validators_and_ranges(client, tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entries(db, [Entry.new(description="x", date_iso="2026-01-01", time_str="08:00")])
+    full = client.get("/export/csv")
+    assert full.status_code == 200 and full.headers["Accept-Ranges"] == "bytes"
+    assert client.get("/export/csv", headers={"If-None-Match": full.headers["ETag"]}).status_code == 304
+    partial = client.get("/export/csv", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206 and partial.data == db.read_bytes()[:10]
+    assert partial.headers["Content-Range"] == f"bytes 0-9/{len(full.data)}" and partial.headers["ETag"] == full.headers["ETag"]
+    assert client.get("/export/csv", headers={"Range": "bytes=5-2"}).data == full.data
+    assert client.get("/export/csv", headers={"Range": f"bytes={len(full.data)}-"}).status_code == 416
+    stale = client.get("/export/csv", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.data == full.data
+
+
+def test_flask_index_answers_304_before_reading(client, tmp_path, monkeypatch):
+    db = tmp_path / "practica.csv"
+    append_entries(db, [Entry.new(description="x", date_iso="2026-01-01", time_str="08:00")])
+    from practica_tracker.store import CsvBackend
+
+    etag = f'W/"{CsvBackend(db).version().token}-50-"'
+    monkeypatch.setattr(CsvBackend, "page", lambda *a, **k: pytest.fail("page read for a fresh client"))
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304 and response.headers["ETag"] == etag
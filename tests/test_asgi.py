@@ -0,0 +1,177 @@
+import asyncio
+import csv
+import gzip
+import io
+
+import pytest
+
+from practica_tracker.asgi import FLASH_COOKIE, PracticaASGI
+from practica_tracker.store import Entry, append_entries, read_entries
+
+
+async def call(app, method, path, body=b"", query=b"", headers=(), on_chunk=None):
+    """Drive one request through the ASGI app, returns (status, headers, body)."""
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()  # never disconnects
+
+    response = {"status": None, "headers": {}, "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        else:
+            response["body"] += message.get("body", b"")
+            if on_chunk is not None and message.get("more_body"):
+                await on_chunk()
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query, "headers": list(headers)}
+    await app(scope, receive, send)
+    return response["status"], response["headers"], response["body"]
+
+
+@pytest.fixture
+def app(tmp_path):
+    application = PracticaASGI(
+        backend="csv", db=tmp_path / "practica.csv", group_commit_delay=0.001, workers=2, export_workers=1,
+        artifact_dir=tmp_path / "artifacts",
+    )
+    yield application
+    application.close()
+
+
+def test_add_then_export_csv(app):
+    form = b"description=scales&date=2026-01-02&time=09:30&tags=piano&duration=20"
+    status, headers, _ = asyncio.run(call(app, "POST", "/add", form))
+    assert status == 302 and headers["location"] == "/"
+    assert FLASH_COOKIE in headers["set-cookie"]
+
+    status, headers, body = asyncio.run(call(app, "GET", "/export/csv"))
+    assert status == 200 and headers["content-type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert [(r["description"], r["duration_minutes"]) for r in rows] == [("scales", "20")]
+    assert body == app.storage().path.read_bytes()
+
+
+def test_add_requires_description_and_rejects_unknown_routes(app):
+    status, headers, _ = asyncio.run(call(app, "POST", "/add", b"description=+"))
+    assert status == 302 and headers["location"] == "/add"
+    assert asyncio.run(call(app, "POST", "/add", b"description=x&duration=-5"))[0] == 400
+    assert asyncio.run(call(app, "POST", "/add", b"description=x&date=someday"))[0] == 400
+    assert asyncio.run(call(app, "GET", "/nope"))[0] == 404
+    status, headers, _ = asyncio.run(call(app, "DELETE", "/add"))
+    assert status == 405 and headers["allow"] == "GET, POST"
+
+
+def test_export_csv_without_data_redirects(app):
+    status, headers, _ = asyncio.run(call(app, "GET", "/export/csv"))
+    assert status == 302 and headers["location"] == "/"
+
+
+def test_export_xlsx_streams_a_workbook(app):
+    pytest.importorskip("openpyxl")
+    append_entries(app.storage().path, [Entry.new(description="x", date_iso="2026-01-01", time_str="08:00")])
+    status, headers, body = asyncio.run(call(app, "GET", "/export/xlsx"))
+    assert status == 200 and body[:2] == b"PK"
+    assert headers["content-length"] == str(len(body))
+
+
+def test_sqlite_export_streams_from_one_thread(tmp_path):
+    app = PracticaASGI(backend="sqlite", db=tmp_path / "practica.sqlite3", workers=2, export_workers=1, artifact_dir=tmp_path / "a")
+    try:
+        app.storage().append_many(Entry.new(description=f"e{i}", date_iso="2026-01-01", time_str="08:00") for i in range(2500))
+        status, _, body = asyncio.run(call(app, "GET", "/export/csv"))
+    finally:
+        app.close()
+    assert status == 200
+    assert len(list(csv.DictReader(io.StringIO(body.decode())))) == 2500
+
+
+def test_slow_download_does_not_block_quick_requests(app):
+    path = app.storage().path
+    append_entries(path, (Entry.new(description="x" * 200, date_iso="2026-01-01", time_str="08:00") for _ in range(2000)))
+    release = asyncio.Event()
+
+    async def slow_client():
+        await release.wait()  # stalls after the first chunk until the adds are done
+
+    async def scenario():
+        download = asyncio.create_task(call(app, "GET", "/export/csv", on_chunk=slow_client))
+        await asyncio.sleep(0.05)
+        # more quick requests than pool threads, all while the download is stuck
+        adds = [call(app, "POST", "/add", f"description=quick {i}".encode()) for i in range(6)]
+        statuses = [status for status, _, _ in await asyncio.wait_for(asyncio.gather(*adds), timeout=10)]
+        assert not download.done()
+        release.set()
+        return statuses, await download
+
+    statuses, (status, _, body) = asyncio.run(scenario())
+    assert statuses == [302] * 6
+    assert status == 200 and len(body) > 64 * 1024
+    assert sum(e.description.startswith("quick") for e in read_entries(path)) == 6
+
+
+def test_csv_export_validators_and_ranges(app):
+    append_entries(app.storage().path, [Entry.new(description="x", date_iso="2026-01-01", time_str="08:00")])
+    data = app.storage().path.read_bytes()
+    status, headers, _ = asyncio.run(call(app, "GET", "/export/csv"))
+    etag = headers["etag"]
+    assert status == 200 and headers["accept-ranges"] == "bytes" and "last-modified" in headers
+
+    assert asyncio.run(call(app, "GET", "/export/csv", headers=[(b"if-none-match", etag.encode())]))[0] == 304
+    since = headers["last-modified"].encode()
+    assert asyncio.run(call(app, "GET", "/export/csv", headers=[(b"if-modified-since", since)]))[0] == 304
+
+    status, headers, body = asyncio.run(call(app, "GET", "/export/csv", headers=[(b"range", b"bytes=5-9")]))
+    assert status == 206 and body == data[5:10]
+    assert headers["content-range"] == f"bytes 5-9/{len(data)}"
+    status, _, body = asyncio.run(call(app, "GET", "/export/csv", headers=[(b"range", b"bytes=-4")]))
+    assert status == 206 and body == data[-4:]
+    status, headers, _ = asyncio.run(call(app, "GET", "/export/csv", headers=[(b"range", f"bytes={len(data)}-".encode())]))
+    assert status == 416 and headers["content-range"] == f"bytes */{len(data)}"
+    # a range that does not parse, or is backwards, is ignored
+    for ignored in (b"bytes=5-2", b"bytes=abc", b"bytes=0-1,4-5", b"pages=1-2"):
+        status, _, body = asyncio.run(call(app, "GET", "/export/csv", headers=[(b"range", ignored)]))
+        assert status == 200 and body == data
+    # an outdated If-Range gets the whole file
+    stale = [(b"range", b"bytes=0-1"), (b"if-range", b'"stale"')]
+    assert asyncio.run(call(app, "GET", "/export/csv", headers=stale))[2] == data
+
+    append_entries(app.storage().path, [Entry.new(description="y", date_iso="2026-01-02", time_str="08:00")])
+    status, headers, _ = asyncio.run(call(app, "GET", "/export/csv", headers=[(b"if-none-match", etag.encode())]))
+    assert status == 200 and headers["etag"] != etag
+
+
+def test_xlsx_export_is_cached_per_version(app):
+    pytest.importorskip("openpyxl")
+    append_entries(app.storage().path, [Entry.new(description="x", date_iso="2026-01-01", time_str="08:00")])
+    status, headers, first = asyncio.run(call(app, "GET", "/export/xlsx"))
+    assert status == 200
+    artifacts = list(app.artifacts.root.iterdir())
+    assert len(artifacts) == 1
+    _, _, second = asyncio.run(call(app, "GET", "/export/xlsx"))
+    assert second == first and list(app.artifacts.root.iterdir()) == artifacts
+    assert asyncio.run(call(app, "GET", "/export/xlsx", headers=[(b"if-none-match", headers["etag"].encode())]))[0] == 304
+
+
+def test_asgi_index_served_from_cache(tmp_path, monkeypatch):
+    app = PracticaASGI(backend="csv", db=tmp_path / "practica.csv", workers=1, export_workers=1)
+    calls = []
+    monkeypatch.setattr(app, "render", lambda template, flashes, **context: calls.append(template) or b"<p>page</p>")
+    try:
+        append_entries(app.storage().path, [Entry.new(description="x", date_iso="2026-01-01", time_str="08:00")])
+        status, headers, body = asyncio.run(call(app, "GET", "/"))
+        assert status == 200 and body == b"<p>page</p>"
+        status, headers, body = asyncio.run(call(app, "GET", "/", headers=[(b"accept-encoding", b"gzip")]))
+        assert headers["content-encoding"] == "gzip" and gzip.decompress(body) == b"<p>page</p>"
+        assert calls == ["index.html"] and len(app.pages) == 1
+        asyncio.run(call(app, "POST", "/add", b"description=y"))
+        assert len(app.pages) == 0
+    finally:
+        app.close()
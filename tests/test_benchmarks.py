@@ -0,0 +1,74 @@
+import json
+
+from benchmarks.datasets import ensure_dataset, generate_challenges, generate_entries, parse_size, write_challenges_json
+from benchmarks.run import compare, main
+from practica_tracker.challenge import load_challenges_json, save_challenges_json
+from practica_tracker.store import read_entries
+
+
+def test_generator_is_deterministic(tmp_path):
+    assert list(generate_entries(50, seed=7)) == list(generate_entries(50, seed=7))
+    assert list(generate_entries(50, seed=7)) != list(generate_entries(50, seed=8))
+    a = ensure_dataset(tmp_path / "a", 200, seed=7)
+    b = ensure_dataset(tmp_path / "b", 200, seed=7)
+    assert a.entries_csv.read_bytes() == b.entries_csv.read_bytes()
+    assert a.challenges_json.read_bytes() == b.challenges_json.read_bytes()
+    assert len(read_entries(a.entries_csv)) == 200
+    assert len(load_challenges_json(a.challenges_json)) == 200
+
+
+def test_streamed_challenges_match_save_challenges_json(tmp_path):
+    for rows in (0, 1, 5):
+        write_challenges_json(tmp_path / "streamed.json", generate_challenges(rows))
+        save_challenges_json(tmp_path / "saved.json", generate_challenges(rows))
+        assert (tmp_path / "streamed.json").read_text() == (tmp_path / "saved.json").read_text()
+
+
+def test_parse_size():
+    assert parse_size("10k") == 10_000
+    assert parse_size("10M") == 10_000_000
+    assert parse_size("250") == 250
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": [
+        {"scenario": "read_entries", "size": "10k", "seconds": 1.0},
+        {"scenario": "export_xlsx", "size": "10k", "seconds": 1.0},
+        {"scenario": "app.stats", "size": "10k", "seconds": 1.0},
+    ]}
+    current = {"results": [
+        {"scenario": "read_entries", "size": "10k", "seconds": 1.5},
+        {"scenario": "export_xlsx", "size": "10k", "seconds": 0.5},
+        {"scenario": "load_challenges_json", "size": "10k", "seconds": 0.1},
+    ]}
+    status = {row["key"]: row["status"] for row in compare(current, baseline, threshold=0.1)}
+    assert status == {
+        "read_entries/10k": "regression",
+        "export_xlsx/10k": "faster",
+        "load_challenges_json/10k": "new",
+        "app.stats/10k": "missing",
+    }
+
+
+def test_run_writes_results(tmp_path):
+    out = tmp_path / "results.json"
+    argv = ["--sizes", "100", "--scenarios", "read_entries,load_challenges_json", "--repeat", "1",
+            "--data-dir", str(tmp_path / "data"), "--out", str(out)]
+    assert main(argv) == 0
+    results = json.loads(out.read_text())["results"]
+    assert [(r["scenario"], r["rows"]) for r in results] == [("read_entries", 100), ("load_challenges_json", 100)]
+    assert all(r["rows_per_sec"] > 0 and r["peak_rss_kib"] > 0 for r in results)
+    # against itself nothing regresses by 10x
+    assert main(argv + ["--baseline", str(out), "--threshold", "9"]) == 0
+
+
+def test_load_comparison_runs(tmp_path):
+    from benchmarks import load
+
+    out = tmp_path / "load.json"
+    argv = ["--size", "200", "--data-dir", str(tmp_path / "data"), "--workers", "2", "--slow", "2", "--quick", "2",
+            "--duration", "0.3", "--json", str(out)]
+    assert load.main(argv) == 0
+    results = json.loads(out.read_text())["results"]
+    for name in ("flask", "asgi"):
+        assert results[name]["quick_requests"] > 0 and results[name]["quick_errors"] == 0
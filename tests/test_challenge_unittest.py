@@ -1,7 +1,15 @@
 import unittest
 from datetime import date
 import json
-from practica_tracker.challenge import Challenge, save_challenges_csv, load_challenges_csv, status_pendant
+import tempfile
+import threading
+from practica_tracker.challenge import (
+    Challenge, ChallengeCollection, save_challenges_csv, load_challenges_csv, status_pendant, status_completed,
+    JOURNAL_ADD, JOURNAL_COMPLETE, append_journal, compact_challenges, journal_path, load_challenges_json, maybe_compact,
+    save_challenges_json,
+    iter_challenges_csv, iter_challenges_json, _iter_json_array,
+)
+import io
 from pathlib import Path
 
 class TestChallenge(unittest.TestCase):
@@ -44,5 +52,145 @@ class TestChallenge(unittest.TestCase):
         with self.assertRaises(ValueError):
             Challenge(date=date.today(), description="x", status="invalid")
 
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.challenges = [
+            Challenge(date=date(2026, 1, d), description=f"day {d}, with {{braces}}", status=status_completed if d % 2 else status_pendant)
+            for d in range(1, 29)
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iter_json_matches_save(self):
+        path = self.dir / "challenges.json"
+        save_challenges_json(path, self.challenges)
+        for trusted in (False, True):
+            loaded = list(iter_challenges_json(path, trusted=trusted))
+            self.assertEqual([c.to_dict() for c in loaded], [c.to_dict() for c in self.challenges])
+
+    def test_json_array_across_chunk_boundaries(self):
+        items = [{"a": "x}, {"}, 12345, -3.5e10, "s", [], {"b": {"c": [1, 2]}}, None, True]
+        text = json.dumps(items, indent=2)
+        for chunk_size in (1, 2, 3, 7, 64):
+            self.assertEqual(list(_iter_json_array(io.StringIO(text), chunk_size)), items)
+        self.assertEqual(list(_iter_json_array(io.StringIO(" [ ] "), 1)), [])
+
+    def test_json_array_rejects_malformed(self):
+        for text in ["", "{}", "[1,]", "[1 2]", "[{}{}]", "[1]x", "[{}"]:
+            with self.assertRaises(json.JSONDecodeError, msg=text):
+                list(_iter_json_array(io.StringIO(text), 2))
+
+    def test_iter_csv(self):
+        path = self.dir / "challenges.csv"
+        save_challenges_csv(path, self.challenges)
+        for trusted in (False, True):
+            loaded = list(iter_challenges_csv(path, trusted=trusted))
+            self.assertEqual([c.to_dict() for c in loaded], [c.to_dict() for c in self.challenges])
+
+    def test_trusted_skips_normalization(self):
+        raw = {"date": "2026-01-02", "description": "  kept as is  ", "status": status_pendant}
+        self.assertEqual(Challenge.from_dict(raw, trusted=True).description, "  kept as is  ")
+        with self.assertRaises(ValueError):
+            Challenge.from_dict(dict(raw, status=" pending "), trusted=True)
+
+    def test_slots(self):
+        c = Challenge(date=date(2026, 1, 2), description="x")
+        self.assertFalse(hasattr(c, "__dict__"))
+        with self.assertRaises(AttributeError):
+            c.other = 1
+
+
+class TestChallengeCollection(unittest.TestCase):
+    def setUp(self):
+        self.days = [date(2026, 1, d) for d in (5, 1, 3, 2, 4)]
+        self.coll = ChallengeCollection(Challenge(date=d, description=str(d.day)) for d in self.days)
+
+    def test_lookup_and_sorted_views(self):
+        self.assertEqual(len(self.coll), 5)
+        self.assertEqual(self.coll.get(date(2026, 1, 3)).description, "3")
+        self.assertIsNone(self.coll.get(date(2026, 2, 1)))
+        self.assertEqual([c.date for c in self.coll], sorted(self.days))
+        self.assertEqual(len(self.coll.by_status(status_pendant)), 5)
+
+    def test_add_and_complete_update_views(self):
+        self.assertTrue(self.coll.add(Challenge(date=date(2025, 12, 31), description="nye", status=status_completed)))
+        self.assertFalse(self.coll.add(Challenge(date=date(2026, 1, 1), description="dup")))
+        self.assertEqual(self.coll.sorted()[0].description, "nye")
+        self.coll.complete(date(2026, 1, 3))
+        self.assertEqual([c.description for c in self.coll.by_status(status_completed)], ["nye", "3"])
+        self.assertEqual([c.description for c in self.coll.by_status(status_pendant)], ["1", "2", "4", "5"])
+        self.assertIsNone(self.coll.complete(date(2030, 1, 1)))
+
+    def test_between(self):
+        self.assertEqual([c.description for c in self.coll.between(date(2026, 1, 2), date(2026, 1, 4))], ["2", "3", "4"])
+        self.assertEqual([c.description for c in self.coll.between(since=date(2026, 1, 4))], ["4", "5"])
+        self.assertEqual([c.description for c in self.coll.between(until=date(2026, 1, 1))], ["1"])
+        self.coll.complete(date(2026, 1, 5))
+        self.assertEqual([c.description for c in self.coll.between(date(2026, 1, 3), status=status_completed)], ["5"])
+
+    def test_duplicate_dates_are_kept_in_file_order(self):
+        loaded = [Challenge(date=date(2026, 1, 2), description="b"), Challenge(date=date(2026, 1, 1), description="a"),
+                  Challenge(date=date(2026, 1, 2), description="b again")]
+        coll = ChallengeCollection(loaded)
+        self.assertEqual(len(coll), 3)
+        self.assertEqual([c.description for c in coll], ["a", "b", "b again"])
+        self.assertEqual(coll.complete(date(2026, 1, 2)).description, "b")
+        self.assertEqual([c.description for c in coll.by_status(status_pendant)], ["a", "b again"])
+        self.assertEqual([c.description for c in coll.between(date(2026, 1, 2))], ["b", "b again"])
+        self.assertEqual(coll.in_file_order(), loaded)
+
+class TestJournal(unittest.TestCase):
+    def test_replay_over_snapshot(self):
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "c.json"
+            save_challenges_json(db, [Challenge(date=date(2026, 1, 1), description="snap")])
+            append_journal(db, JOURNAL_ADD, Challenge(date=date(2026, 1, 2), description="logged"))
+            append_journal(db, JOURNAL_COMPLETE, Challenge(date=date(2026, 1, 1), description="snap"))
+            with journal_path(db).open("a", encoding="utf-8") as handle:
+                handle.write('{"op": "add", "date": "2026-01-0')  # torn write
+            loaded = load_challenges_json(db)
+            self.assertEqual([(c.description, c.status) for c in loaded],
+                             [("snap", status_completed), ("logged", status_pendant)])
+
+    def test_maybe_compact_threshold(self):
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "c.json"
+            append_journal(db, JOURNAL_ADD, Challenge(date=date(2026, 1, 1), description="one"))
+            self.assertFalse(maybe_compact(db))
+            for day in range(2, 200):
+                append_journal(db, JOURNAL_ADD, Challenge(date=date.fromordinal(date(2026, 1, 1).toordinal() + day), description="x" * 80))
+            self.assertTrue(maybe_compact(db))
+            self.assertFalse(journal_path(db).exists())
+            self.assertEqual(len(load_challenges_json(db)), 199)
+
+    def test_compact_keeps_duplicate_dates_and_order(self):
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "c.json"
+            save_challenges_json(db, [Challenge(date=date(2026, 1, 2), description="later"),
+                                      Challenge(date=date(2026, 1, 1), description="first"),
+                                      Challenge(date=date(2026, 1, 2), description="same day")])
+            append_journal(db, JOURNAL_ADD, Challenge(date=date(2026, 1, 3), description="logged"))
+            self.assertEqual(compact_challenges(db), 4)
+            self.assertEqual([c.description for c in load_challenges_json(db)], ["later", "first", "same day", "logged"])
+
+    def test_appends_made_while_compacting_are_kept(self):
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "c.json"
+            days = [date.fromordinal(date(2026, 1, 1).toordinal() + i) for i in range(200)]
+
+            def add_all():
+                for day in days:
+                    append_journal(db, JOURNAL_ADD, Challenge(date=day, description=f"day {day}"))
+
+            writer = threading.Thread(target=add_all)
+            writer.start()
+            while writer.is_alive():
+                compact_challenges(db)
+            writer.join()
+            self.assertEqual(sorted(c.date for c in load_challenges_json(db)), days)
+
 if __name__ == '__main__':
     unittest.main()
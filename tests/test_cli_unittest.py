@@ -1,9 +1,15 @@
 import unittest
 from datetime import date
 from pathlib import Path
+import contextlib
+import io
+import json
+import sys
 import tempfile
+from unittest import mock
 from practica_tracker.main import main as cli_main
-from practica_tracker.challenge import load_challenges_json, status_pendant, status_completed
+from practica_tracker.store import read_entries
+from practica_tracker.challenge import journal_path, load_challenges_csv, load_challenges_json, status_pendant, status_completed
 
 class TestCLI(unittest.TestCase):
     def test_add_and_list(self):
@@ -26,5 +32,70 @@ class TestCLI(unittest.TestCase):
             self.assertIsNotNone(ch)
             self.assertEqual(ch.status, status_completed)
 
+    def test_add_and_complete_only_append_to_journal(self):
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "db3.json"
+            mirror = Path(d) / "db3.csv"
+            today = date.today().isoformat()
+            with mock.patch.object(sys.modules["practica_tracker.main"], "DEFAULT_CSV", mirror):
+                cli_main(["--file", str(db), "add", "Journaled"])
+                cli_main(["--file", str(db), "complete", today])
+                self.assertFalse(db.exists())
+                self.assertEqual(len(journal_path(db).read_text(encoding="utf-8").splitlines()), 2)
+                out = io.StringIO()
+                with contextlib.redirect_stdout(out):
+                    cli_main(["--file", str(db), "complete", today])
+                self.assertIn("already completed", out.getvalue())
+                self.assertEqual(len(journal_path(db).read_text(encoding="utf-8").splitlines()), 2)
+
+                cli_main(["--file", str(db), "compact"])
+            self.assertFalse(journal_path(db).exists())
+            for loaded in (load_challenges_json(db), load_challenges_csv(mirror)):
+                self.assertEqual([(c.description, c.status) for c in loaded], [("Journaled", status_completed)])
+
+    def test_import_jsonl_and_csv(self):
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "practica.csv"
+            src = Path(d) / "dump.jsonl"
+            lines = [json.dumps({"description": f"log {i}", "date": "2025-06-01", "time": "07:30", "tags": ["py", "cli"], "duration_minutes": i}) for i in range(5)]
+            lines.insert(2, json.dumps({"description": "bad", "date": "June 1st"}))
+            lines.insert(4, "{not json")
+            src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            out, err = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                cli_main(["import", str(src), "--db", str(db)])
+            self.assertIn("Imported 5 entries", out.getvalue())
+            self.assertIn("rows/sec", out.getvalue())
+            self.assertIn("line 3: invalid date", err.getvalue())
+            self.assertIn("line 5: invalid JSON", err.getvalue())
+            entries = read_entries(db)
+            self.assertEqual([e.duration_minutes for e in entries], [0, 1, 2, 3, 4])
+            self.assertEqual(entries[0].tags, "py,cli")
+
+            csv_src = Path(d) / "more.csv"
+            csv_src.write_text("description,date,time,tags,duration_minutes\nfrom csv,2025-06-02,08:00,py,20\n", encoding="utf-8")
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli_main(["import", str(csv_src), "--db", str(db)])
+            self.assertEqual(read_entries(db)[-1].description, "from csv")
+
+    def test_import_into_sqlite_reports_repeated_ids(self):
+        from practica_tracker.store import SqliteBackend
+
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "practica.sqlite3"
+            src = Path(d) / "dump.jsonl"
+            records = [{"id": "a", "description": "first", "date": "2025-06-01", "time": "7:05"},
+                       {"id": "b", "description": "second"}, {"id": "a", "description": "again"}]
+            src.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+            err = io.StringIO()
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(err):
+                cli_main(["import", str(src), "--backend", "sqlite", "--db", str(db)])
+                cli_main(["import", str(src), "--backend", "sqlite", "--db", str(db)])
+            self.assertIn("line 3: duplicate id: 'a'", err.getvalue())
+            self.assertIn("line 1: duplicate id: 'a'", err.getvalue())
+            entries = SqliteBackend(db).read_all()
+            self.assertEqual([e.description for e in entries], ["first", "second"])
+            self.assertEqual(entries[0].time, "07:05")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,133 @@
+import csv
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from practica_tracker import exports
+from practica_tracker.exports import DONE, FAILED, ExportQueue, QueueFull
+from practica_tracker.store import Entry, append_entries, get_backend
+
+
+def _entries(n):
+    return [
+        Entry.new(
+            description=f"etude {i}", date_iso=f"2026-0{1 + i % 3}-{1 + i % 28:02d}", time_str="08:00",
+            tags="scales" if i % 2 else "pieces",
+        )
+        for i in range(n)
+    ]
+
+
+def _wait(job, timeout=10.0):
+    # poll the status like a client does; whatever it reports must already be complete
+    deadline = time.monotonic() + timeout
+    while job.status not in (DONE, FAILED) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.finished is not None
+    return job
+
+
+def test_csv_job_applies_filters(tmp_path):
+    db = tmp_path / "practica.csv"
+    entries = _entries(60)
+    append_entries(db, entries)
+    queue = ExportQueue(tmp_path / "exports")
+    try:
+        job = _wait(queue.submit(get_backend("csv", db), "csv:a", "csv", since="2026-02-01", tag="scales"))
+        assert job.status == DONE and job.path.name == f"{job.id}.csv"
+        rows = list(csv.DictReader(io.StringIO(job.path.read_text())))
+        expected = [e for e in entries if e.date >= "2026-02-01" and e.tags == "scales"]
+        assert job.rows == len(rows) == len(expected)
+        assert {r["id"] for r in rows} == {e.id for e in expected}
+        assert not [p for p in job.path.parent.iterdir() if p.name.endswith(".tmp")]
+        with pytest.raises(ValueError):
+            queue.submit(get_backend("csv", db), "csv:a", "pdf")
+        with pytest.raises(ValueError):
+            queue.submit(get_backend("csv", db), "csv:a", "csv", until="last tuesday")
+    finally:
+        queue.close()
+
+
+def test_identical_requests_share_one_job(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    db = tmp_path / "practica.csv"
+    append_entries(db, _entries(2500))
+    gate = threading.Event()
+    seen = []
+    write_xlsx = exports.write_xlsx
+
+    def slow_write(entries, path, progress):
+        gate.wait(10)
+        return write_xlsx(entries, path, lambda rows: (seen.append(rows), progress(rows)))
+    monkeypatch.setattr(exports, "write_xlsx", slow_write)
+    queue = ExportQueue(tmp_path / "exports", workers=1, max_pending=1)
+    backend = get_backend("csv", db)
+    try:
+        first = queue.submit(backend, "csv:a", "xlsx")
+        assert queue.submit(backend, "csv:a", "xlsx") is first
+        other = queue.submit(backend, "csv:a", "xlsx", tag="scales")  # waits behind the first
+        assert other is not first
+        with pytest.raises(QueueFull):
+            queue.submit(backend, "csv:a", "csv")
+        gate.set()
+        assert _wait(first).status == DONE and _wait(other).status == DONE
+        assert first.rows == 2500 and seen[:2] == [1000, 2000]
+        assert queue.submit(backend, "csv:a", "xlsx") is first  # same data version, still kept
+
+        append_entries(db, _entries(1))
+        assert queue.submit(backend, "csv:a", "xlsx") is not first
+    finally:
+        gate.set()
+        queue.close()
+
+
+def test_finished_jobs_expire_after_ttl(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entries(db, _entries(5))
+    root = tmp_path / "exports"
+    root.mkdir()
+    stray = root / "0123456789abcdef.csv"
+    stray.write_text("left by an earlier process")
+    os.utime(stray, (0, 0))
+    queue = ExportQueue(root, ttl=60)
+    try:
+        job = _wait(queue.submit(get_backend("csv", db), "csv:a", "csv"))
+        assert not stray.exists()
+        assert queue.expire(now=job.finished + 30) == 0 and job.path.exists()
+        assert queue.expire(now=job.finished + 61) == 1
+        assert queue.get(job.id) is None and not job.path.exists()
+    finally:
+        queue.close()
+
+
+def test_flask_export_job_flow(tmp_path):
+    pytest.importorskip("openpyxl")
+    app_module = pytest.importorskip("practica_tracker.app")
+    flask_app = app_module.app
+    saved = dict(flask_app.config)
+    db = tmp_path / "practica.csv"
+    flask_app.config.update(
+        PRACTICA_BACKEND="csv", PRACTICA_DB=str(db), PRACTICA_EXPORT_DIR=str(tmp_path / "exports"),
+    )
+    try:
+        append_entries(db, _entries(10))
+        client = flask_app.test_client()
+        created = client.post("/export/jobs", json={"format": "xlsx", "tag": "scales"})
+        assert created.status_code == 202
+        job_id = created.get_json()["id"]
+        assert created.headers["Location"].endswith(f"/export/jobs/{job_id}")
+        assert client.post("/export/jobs", data={"format": "xlsx", "tag": "scales"}).get_json()["id"] == job_id
+
+        _wait(app_module.exports().get(job_id))
+        status = client.get(f"/export/jobs/{job_id}").get_json()
+        assert status["status"] == "done" and status["rows"] == 5
+        download = client.get(f"/export/jobs/{job_id}/download")
+        assert download.status_code == 200 and download.data[:2] == b"PK"
+        assert client.get("/export/jobs/nope").status_code == 404
+        assert client.post("/export/jobs", data={"format": "pdf"}).status_code == 400
+    finally:
+        flask_app.config.clear()
+        flask_app.config.update(saved)
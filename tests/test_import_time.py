@@ -0,0 +1,68 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from practica_tracker import main as cli
+from practica_tracker.store import BACKENDS, CompressedBackend, CsvBackend, PartitionedBackend, SqliteBackend
+
+ROOT = Path(__file__).resolve().parents[1]
+# the stdlib modules the CLI needs anyway; importing them cold is the yardstick for the
+# machine at hand. `import practica_tracker.main` takes ~1.1x as long here, and ~2.7x when
+# it still pulled in the entry store
+BASELINE_MODULES = ("argparse", "csv", "json", "logging", "tempfile")
+BUDGET_RATIO = 2.0
+HEAVY_MODULES = ("flask", "openpyxl", "numpy", "sqlite3", "practica_tracker.store")
+
+
+def _import_ms(*modules):
+    """Cold import time of `modules`, in one fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        check=True, capture_output=True, text=True, cwd=ROOT,
+    )
+    total = {}
+    for line in out.stderr.splitlines():
+        fields = line.split("|")
+        # top-level imports only, nested ones are indented further
+        if len(fields) == 3 and fields[2][1:] in modules:
+            total[fields[2][1:]] = int(fields[1].split(":")[-1]) / 1000
+    missing = set(modules) - set(total)
+    assert not missing, f"{missing} missing from -X importtime output"
+    return sum(total.values())
+
+
+def test_cli_import_within_budget():
+    # best of three for both, measured back to back so they see the same machine load
+    baseline = min(_import_ms(*BASELINE_MODULES) for _ in range(3))
+    assert min(_import_ms("practica_tracker.main") for _ in range(3)) < BUDGET_RATIO * baseline
+
+
+def test_challenge_commands_do_not_load_heavy_modules(tmp_path):
+    challenges = tmp_path / "challenges.json"
+    challenges.write_text("[]", encoding="utf-8")
+    script = (
+        "import sys\n"
+        "from practica_tracker import main\n"
+        "main(['--file', sys.argv[1], 'list'])\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", script, str(challenges)], check=True, cwd=ROOT)
+
+
+def test_lazy_exports_resolve():
+    import practica_tracker
+
+    assert practica_tracker.Entry is __import__("practica_tracker.store").store.Entry
+    assert practica_tracker.EntryTable.__name__ == "EntryTable"
+    assert "Entry" in dir(practica_tracker)
+
+
+def test_cli_defaults_match_store():
+    module = sys.modules["practica_tracker.main"]
+    assert sorted(module.BACKEND_CHOICES) == sorted(BACKENDS)
+    assert module.DEFAULT_ENTRIES_CSV == Path(CsvBackend.default_path)
+    assert module.DEFAULT_ENTRIES_DB == Path(SqliteBackend.default_path)
+    assert module.DEFAULT_ENTRIES_DIR == Path(PartitionedBackend.default_path)
+    assert module.DEFAULT_ENTRIES_BLOCKS == Path(CompressedBackend.default_path)
+    assert callable(cli)
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from practica_tracker import metrics
+from practica_tracker.store import Entry, append_entries, invalidate_cache, read_entries, read_page
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("test_seconds", "test", ("op",), buckets=(0.1, 1.0))
+    try:
+        for value in (0.05, 0.5, 0.5, 5.0):
+            h.observe(value, 'a"b')
+        text = "\n".join(h.render())
+    finally:
+        metrics._registry.remove(h)
+    assert 'test_seconds_bucket{op="a\\"b",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{op="a\\"b",le="1.0"} 3' in text
+    assert 'test_seconds_bucket{op="a\\"b",le="+Inf"} 4' in text
+    assert 'test_seconds_count{op="a\\"b"} 4' in text
+    assert 'test_seconds_sum{op="a\\"b"} 6.05' in text
+
+
+def test_timing_hooks_and_io_counters(tmp_path):
+    seen = []
+    metrics.add_timing_hook(lambda op, seconds: seen.append(op))
+    try:
+        db = tmp_path / "practica.csv"
+        append_entries(db, (Entry.new(description=f"e{i}", date_iso="2026-01-01", time_str="09:00") for i in range(10)))
+        invalidate_cache(db)
+        assert len(read_entries(db)) == 10
+        assert len(read_page(db, limit=3).entries) == 3
+    finally:
+        metrics._timing_hooks.clear()
+    assert seen == ["append_entries", "read_entries", "read_page"]
+    assert metrics.ROWS.value("entries_csv", "written") == 10
+    assert metrics.ROWS.value("entries_csv", "read") >= 13
+    size = db.stat().st_size
+    assert metrics.BYTES.value("entries_csv", "read") >= size
+    assert metrics.OPERATION_SECONDS.count("read_entries") == 1
+
+
+def test_sampling_profiler_collects_stacks():
+    def busy():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    with metrics.SamplingProfiler(interval=0.001) as profiler:
+        busy()
+    assert profiler.total > 0
+    assert "busy (test_metrics.py" in profiler.collapsed()
+
+
+@pytest.fixture
+def client(tmp_path):
+    flask_app = pytest.importorskip("practica_tracker.app").app
+    saved = dict(flask_app.config)
+    flask_app.config.update(PRACTICA_BACKEND="csv", PRACTICA_DB=str(tmp_path / "practica.csv"),
+                            PRACTICA_CHALLENGES=str(tmp_path / "challenges.json"))
+    yield flask_app.test_client()
+    flask_app.config.clear()
+    flask_app.config.update(saved)
+
+
+def test_metrics_endpoint_reports_request_latency(client):
+    assert client.get("/stats").status_code == 200
+    assert client.get("/no-such-page").status_code == 404
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'practica_http_request_duration_seconds_count{endpoint="stats_route",method="GET"} 1' in body
+    assert 'practica_http_requests_total{endpoint="unmatched",method="GET",status="404"} 1' in body
+    assert "# TYPE practica_operation_seconds histogram" in body
+
+
+def test_profile_parameter_is_opt_in(client):
+    client.application.config["PRACTICA_PROFILING"] = False
+    response = client.get("/stats?profile=1")
+    assert response.is_json and "X-Profile-Samples" not in response.headers
+
+    client.application.config["PRACTICA_PROFILING"] = True
+    response = client.get("/stats?profile=1")
+    assert response.mimetype == "text/plain"
+    assert response.headers["X-Profiled-Status"] == "200"
+    assert int(response.headers["X-Profile-Samples"]) >= 0
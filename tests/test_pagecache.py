@@ -0,0 +1,81 @@
+import pytest
+
+from practica_tracker import pagecache
+from practica_tracker.pagecache import PageCache, accepts_gzip, gunzip_body, page_key
+from practica_tracker.store import DataVersion, Entry, append_entries
+
+
+def _key(store, token, *params):
+    return page_key(store, DataVersion(token, 0.0), "index", *params)
+
+
+def test_put_get_roundtrip_compressed():
+    cache = PageCache()
+    html = b"<tr><td>scales</td></tr>" * 200
+    body = cache.put(_key("csv:/a", "v1", 50), html)
+    assert len(body) < len(html) and gunzip_body(body) == html
+    assert cache.get(_key("csv:/a", "v1", 50)) == body
+    assert cache.get(_key("csv:/a", "v2", 50)) is None  # another data version
+    assert cache.nbytes == len(body)
+
+
+def test_least_recently_used_is_evicted_first():
+    pages = [bytes(range(256)) * 4 for _ in range(3)]  # barely compressible
+    cache = PageCache(max_bytes=2 * len(pagecache.gzip_body(pages[0])) + 10)
+    for i, html in enumerate(pages[:2]):
+        cache.put(_key("csv:/a", "v1", i), html)
+    cache.get(_key("csv:/a", "v1", 0))  # 0 is now the most recently used
+    cache.put(_key("csv:/a", "v1", 2), pages[2])
+    assert cache.get(_key("csv:/a", "v1", 1)) is None
+    assert cache.get(_key("csv:/a", "v1", 0)) is not None and len(cache) == 2
+    assert cache.nbytes <= cache.max_bytes
+    PageCache(max_bytes=0).put(_key("csv:/a", "v1", 0), pages[0])  # too big to keep, still returned
+
+
+def test_invalidate_drops_only_one_store():
+    cache = PageCache()
+    cache.put(_key("csv:/a", "v1", 50), b"a")
+    cache.put(_key("csv:/a", "v1", 10), b"a")
+    cache.put(_key("csv:/b", "v1", 50), b"b")
+    assert cache.invalidate("csv:/a") == 2 and cache.invalidate("csv:/a") == 0
+    assert cache.get(_key("csv:/b", "v1", 50)) is not None and len(cache) == 1
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br") and accepts_gzip("*") and accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert not accepts_gzip(None) and not accepts_gzip("br") and not accepts_gzip("gzip;q=0")
+
+
+def test_flask_index_served_from_cache_until_add(tmp_path, monkeypatch):
+    app_module = pytest.importorskip("practica_tracker.app")
+    calls = []
+
+    def render(template, **context):
+        calls.append(template)
+        return "".join(f"<li>{e.description}</li>" for e in context["entries"])
+    monkeypatch.setattr(app_module, "render_template", render)
+    flask_app = app_module.app
+    saved = dict(flask_app.config)
+    db = tmp_path / "practica.csv"
+    flask_app.config.update(PRACTICA_BACKEND="csv", PRACTICA_DB=str(db), PRACTICA_GROUP_COMMIT_DELAY=None)
+    try:
+        append_entries(db, [Entry.new(description="scales", date_iso="2026-01-01", time_str="08:00")])
+        client = flask_app.test_client()
+        first = client.get("/")
+        again = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert first.data == b"<li>scales</li>" and calls == ["index.html"]
+        assert again.headers["Content-Encoding"] == "gzip" and gunzip_body(again.data) == first.data
+        assert "Accept-Encoding" in again.headers["Vary"] and again.headers["ETag"] == first.headers["ETag"]
+        client.get("/?limit=5")
+        assert calls == ["index.html"] * 2
+
+        assert client.post("/add", data={"description": "arpeggios", "duration": "-5"}).status_code == 400
+        client.post("/add", data={"description": "arpeggios", "date": "2026-01-02", "time": "08:00"})
+        assert len(app_module.pages()) == 0
+        client.get("/")  # the pending flash is rendered, not cached
+        assert client.get("/").data == b"<li>arpeggios</li><li>scales</li>"
+        assert calls == ["index.html"] * 4
+    finally:
+        flask_app.config.clear()
+        flask_app.config.update(saved)
+        app_module.pages().clear()
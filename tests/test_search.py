@@ -0,0 +1,45 @@
+from practica_tracker.search import SearchIndex, get_index, index_path, search_entries
+from practica_tracker.store import Entry, append_entries, append_entry
+
+
+def _descriptions(entries):
+    return [e.description for e in entries]
+
+
+def test_search_by_tag_and_words(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entries(db, [
+        Entry.new(description="Recursion drills", date_iso="2026-01-01", time_str="08:00", tags="py"),
+        Entry.new(description="Borrow checker and recursion", date_iso="2026-01-02", time_str="08:00", tags="rust"),
+        Entry.new(description="Tail recursion, memoization", date_iso="2026-01-03", time_str="08:00", tags="py, algo"),
+        Entry.new(description='Quoted "text",\nmultiline', date_iso="2026-01-04", time_str="08:00", tags="py"),
+    ])
+    assert _descriptions(search_entries(db, tag="py", q="recursion")) == ["Tail recursion, memoization", "Recursion drills"]
+    assert _descriptions(search_entries(db, q="RECURSION memoization")) == ["Tail recursion, memoization"]
+    assert _descriptions(search_entries(db, tag="py", q="multiline")) == ['Quoted "text",\nmultiline']
+    assert search_entries(db, tag="go") == []
+    assert search_entries(db) == []
+
+
+def test_index_follows_appends_and_rewrites(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entry(db, Entry.new(description="first session", date_iso="2026-01-01", time_str="08:00", tags="py"))
+    index = get_index(db)
+    assert index.sync() == 1
+    # appends leave the index alone, the next query catches up
+    append_entry(db, Entry.new(description="second session", date_iso="2026-01-02", time_str="08:00", tags="py"))
+    assert _descriptions(index.search(q="second")) == ["second session"]
+    assert index.sync() == 0
+    assert _descriptions(index.search(q="session")) == ["second session", "first session"]
+
+    # rows written by someone else are picked up by a fresh index on the same sidecar
+    with db.open("a", encoding="utf-8", newline="") as f:
+        f.write("ext-1,2026-01-03,08:00,third session,py,10\r\n")
+    other = SearchIndex(db)
+    assert _descriptions(other.search(tag="py", limit=1)) == ["third session"]
+    other.close()
+
+    db.unlink()
+    append_entry(db, Entry.new(description="rewritten", date_iso="2026-02-01", time_str="08:00", tags="py"))
+    assert _descriptions(index.search(tag="py")) == ["rewritten"]
+    assert index_path(db).exists()
@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+
+from practica_tracker import stats, store
+from practica_tracker.challenge import Challenge, JOURNAL_ADD, append_journal, save_challenges_json, status_completed
+from practica_tracker.stats import StatsTracker, backend_stats, compute_streaks
+from practica_tracker.store import (
+    CsvBackend, Entry, PartitionedBackend, append_entries, append_entry, convert_to_partitioned, delete_entry, update_entry,
+)
+
+
+def _challenges(path, days, status=status_completed):
+    save_challenges_json(path, [Challenge(date=date(2026, 1, d), description="x", status=status) for d in days])
+
+
+def test_rollups_follow_appends_and_rewrites(tmp_path):
+    db = tmp_path / "practica.csv"
+    tracker = StatsTracker(db, tmp_path / "challenges.json")
+    assert tracker.snapshot()["entries"] == 0
+    append_entry(db, Entry.new(description="a", date_iso="2026-01-05", time_str="08:00", tags="py, cli", duration_minutes=30))
+    append_entry(db, Entry.new(description="b", date_iso="2026-01-06", time_str="08:00", tags="py", duration_minutes=15))
+    data = tracker.snapshot()
+    assert data["total_minutes"] == 45
+    assert data["by_day"] == {"2026-01-05": 30, "2026-01-06": 15}
+    assert data["by_week"] == {"2026-W02": 45}
+    assert data["by_month"] == {"2026-01": 45}
+    assert data["by_tag"] == {"py": 45, "cli": 30}
+
+    append_entry(db, Entry.new(description="c", date_iso="2026-02-01", time_str="08:00", tags="rust", duration_minutes=60))
+    data = tracker.snapshot()
+    assert (data["entries"], data["by_month"]) == (3, {"2026-01": 45, "2026-02": 60})
+
+    db.unlink()
+    append_entry(db, Entry.new(description="fresh", date_iso="2026-03-01", time_str="08:00", duration_minutes=5))
+    assert tracker.snapshot()["by_month"] == {"2026-03": 5}
+
+
+def test_edits_and_deletes_adjust_rollups_without_a_rescan(tmp_path, monkeypatch):
+    db = tmp_path / "practica.csv"
+    tracker = StatsTracker(db, tmp_path / "challenges.json")
+    entries = [Entry.new(description=str(i), date_iso="2026-01-05", time_str="08:00", tags="py", duration_minutes=10)
+               for i in range(3)]
+    entries.append(Entry.new(description="go", date_iso="2026-02-01", time_str="08:00", tags="go", duration_minutes=5))
+    append_entries(db, entries)
+    assert tracker.snapshot()["total_minutes"] == 35
+    read_back = []
+
+    def read_entries_at(path, offsets):
+        found = store.read_entries_at(path, offsets)
+        read_back.extend(found)
+        return found
+
+    monkeypatch.setattr(stats, "read_entries_at", read_entries_at)
+    update_entry(db, entries[0].id, duration_minutes=40, tags="rust")
+    data = tracker.snapshot()
+    assert (data["entries"], data["total_minutes"]) == (4, 65)
+    assert data["by_tag"] == {"rust": 40, "py": 20, "go": 5}
+    delete_entry(db, entries[3].id)
+    append_entry(db, Entry.new(description="late", date_iso="2026-01-06", time_str="08:00", duration_minutes=1))
+    data = tracker.snapshot()
+    assert (data["entries"], data["total_minutes"], data["by_month"]) == (4, 61, {"2026-01": 61})
+    assert "go" not in data["by_tag"]
+    # only the superseded row, the deleted row and its tombstone were read back
+    assert [e.description for e in read_back] == ["0", "go", ""]
+    assert data == StatsTracker(db, tmp_path / "challenges.json").snapshot()
+
+
+def test_partitioned_stats_merge_per_partition_rollups(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entries(db, [
+        Entry.new(description=str(i), date_iso=f"2026-{i % 3 + 1:02d}-{i % 28 + 1:02d}", time_str="08:00", tags="py" if i % 2 else "go",
+                  duration_minutes=i)
+        for i in range(40)
+    ])
+    convert_to_partitioned(db, tmp_path / "practica")
+    expected = backend_stats(CsvBackend(db), tmp_path / "challenges.json")
+    for workers in (1, 2):
+        assert backend_stats(PartitionedBackend(tmp_path / "practica", workers=workers), tmp_path / "challenges.json") == expected
+
+
+def test_streaks_from_challenges_and_journal(tmp_path):
+    challenges = tmp_path / "challenges.json"
+    tracker = StatsTracker(tmp_path / "practica.csv", challenges)
+    _challenges(challenges, [1, 2, 3, 5, 6])
+    streak = tracker.snapshot(today=date(2026, 1, 7))["streak"]
+    assert streak == {"current": 2, "longest": 3, "last_completed": "2026-01-06"}
+    assert tracker.snapshot(today=date(2026, 1, 9))["streak"]["current"] == 0
+    append_journal(challenges, JOURNAL_ADD, Challenge(date=date(2026, 1, 7), description="y", status=status_completed))
+    assert tracker.snapshot(today=date(2026, 1, 7))["streak"]["current"] == 3
+
+
+def test_compute_streaks_ignores_pending_and_duplicates():
+    assert compute_streaks([], today=date(2026, 1, 1)) == {"current": 0, "longest": 0, "last_completed": None}
+    days = [date(2026, 1, 1), date(2026, 1, 1), date(2026, 1, 2)]
+    assert compute_streaks(days, today=date(2026, 1, 2))["longest"] == 2
@@ -1,4 +1,14 @@
-from practica_tracker.store import Entry, append_entry, read_entries, export_xlsx
+import csv
+import os
+import subprocess
+import sys
+import pytest
+from practica_tracker.store import (
+    CODECS, CSV_FIELDS, TOMBSTONE, UNDATED, Entry, OffsetIndex, PartitionedBackend, SqliteBackend, append_entries, append_entry,
+    convert_to_partitioned, dead_rows, delete_entry, export_xlsx, get_backend, get_entry, get_offset_index, invalidate_cache,
+    iter_entries, maybe_vacuum, migrate_csv_to_sqlite, offsets_path, partition_path, read_entries, read_manifest, read_page,
+    read_row, read_rows, tail_path, update_entry, vacuum, block_stats, convert_to_compressed, _read_block,
+)
 from pathlib import Path
 
 
@@ -23,3 +33,542 @@ def test_export_xlsx(tmp_path):
         import pytest
         pytest.skip("openpyxl not installed")
     assert xlsx.exists()
+
+
+def test_read_entries_picks_up_external_appends(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entry(db, Entry.new(description="first", date_iso="2026-01-01", time_str="09:00"))
+    assert [e.description for e in read_entries(db)] == ["first"]
+    # another process appending behind our back: only the tail is new
+    other = Entry.new(description='with "quotes", commas\nand newline', date_iso="2026-01-02", time_str="09:00")
+    with db.open("a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow([other.id, other.date, other.time, other.description, other.tags, other.duration_minutes])
+    loaded = read_entries(db)
+    assert [e.description for e in loaded] == ["first", other.description]
+
+
+def test_read_entries_reloads_after_rewrite(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entry(db, Entry.new(description="old one", date_iso="2026-01-01", time_str="09:00"))
+    append_entry(db, Entry.new(description="old two", date_iso="2026-01-01", time_str="10:00"))
+    assert len(read_entries(db)) == 2
+    db.unlink()
+    append_entry(db, Entry.new(description="new", date_iso="2026-01-03", time_str="09:00"))
+    assert [e.description for e in read_entries(db)] == ["new"]
+    # truncated and rewritten in place with more data than before
+    text = db.read_text(encoding="utf-8")
+    db.write_text(text.replace("new", "rewritten entry longer than the original"), encoding="utf-8")
+    assert [e.description for e in read_entries(db)] == ["rewritten entry longer than the original"]
+
+
+def test_read_entries_ignores_partial_trailing_row(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entry(db, Entry.new(description="complete", date_iso="2026-01-01", time_str="09:00"))
+    with db.open("ab") as f:
+        f.write(b"abc,2026-01-02,10:00,half writ")
+    assert [e.description for e in read_entries(db)] == ["complete"]
+    with db.open("ab") as f:
+        f.write(b"ten,,5\r\n")
+    assert [e.description for e in read_entries(db)] == ["complete", "half written"]
+
+
+def test_last_row_without_newline_is_read_and_appended_after(tmp_path):
+    import fcntl
+    from practica_tracker.search import search_entries
+
+    db = tmp_path / "practica.csv"
+    db.write_bytes(b"id,date,time,description,tags,duration_minutes\r\na,2026-01-01,08:00,scales,warmup,10\r\nb,2026-01-02,08:00,etude,warmup,20")
+    with db.open("rb") as locked:
+        fcntl.flock(locked.fileno(), fcntl.LOCK_EX)  # as if a writer were mid-append
+        assert [e.id for e in read_entries(db)] == ["a"]
+    assert [e.id for e in read_entries(db)] == [e.id for e in iter_entries(db)] == ["a", "b"]
+    assert [e.id for e in read_page(db).entries] == ["b", "a"]
+    assert get_entry(db, "b").duration_minutes == 20 and read_row(db, -1).id == "b"
+    assert [e.id for e in search_entries(db, tag="warmup")] == ["b", "a"]
+
+    append_entry(db, Entry("c", "2026-01-03", "08:00", "arpeggios", "", 5))
+    assert db.read_bytes().endswith(b"20\n" + b"c,2026-01-03,08:00,arpeggios,,5\r\n")
+    invalidate_cache(db)
+    assert [e.id for e in read_entries(db)] == ["a", "b", "c"] and get_entry(db, "c").description == "arpeggios"
+
+    store = tmp_path / "practica.csvz"
+    append_entries(store, read_entries(db)[:2])
+    tail = tail_path(store)
+    tail.write_bytes(tail.read_bytes().rstrip(b"\r\n"))
+    assert [e.id for e in read_entries(store)] == ["a", "b"]
+    append_entry(store, Entry("c", "2026-01-03", "08:00", "arpeggios", "", 5))
+    assert [e.id for e in read_entries(store)] == ["a", "b", "c"]
+
+
+def _page_through(db, limit):
+    pages, cursor = [], None
+    while True:
+        page = read_page(db, limit=limit, cursor=cursor)
+        pages.append(page.entries)
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_read_page_newest_first_with_out_of_order_rows(tmp_path):
+    db = tmp_path / "practica.csv"
+    days = [f"2026-01-{d:02d}" for d in range(1, 29)]
+    # backfilled rows land a few positions after where they belong
+    order = days[:10] + days[12:15] + days[10:12] + days[15:]
+    for d in order:
+        append_entry(db, Entry.new(description=f"on {d}\nmultiline", date_iso=d, time_str="08:00"))
+    pages = _page_through(db, limit=5)
+    assert all(len(p) == 5 for p in pages[:-1])
+    dates = [e.date for p in pages for e in p]
+    assert dates == sorted(days, reverse=True)
+
+
+def test_read_page_cursor_is_stable_across_appends(tmp_path):
+    db = tmp_path / "practica.csv"
+    for d in range(1, 11):
+        append_entry(db, Entry.new(description=str(d), date_iso=f"2026-02-{d:02d}", time_str="08:00"))
+    first = read_page(db, limit=4)
+    assert [e.description for e in first.entries] == ["10", "9", "8", "7"]
+    append_entry(db, Entry.new(description="late", date_iso="2026-02-20", time_str="08:00"))
+    second = read_page(db, limit=4, cursor=first.next_cursor)
+    assert [e.description for e in second.entries] == ["6", "5", "4", "3"]
+    assert read_page(db, limit=4).entries[0].description == "late"
+
+
+def test_read_page_empty_and_bad_cursor(tmp_path):
+    db = tmp_path / "practica.csv"
+    assert read_page(db).entries == []
+    with pytest.raises(ValueError):
+        read_page(db, cursor="not-a-cursor")
+
+
+def test_sqlite_backend_roundtrip_and_pages(tmp_path):
+    backend = SqliteBackend(tmp_path / "practica.sqlite3")
+    entries = [Entry.new(description=str(d), date_iso=f"2026-03-{d:02d}", time_str="08:00") for d in (3, 1, 2, 5, 4)]
+    assert backend.append_many(entries) == 5
+    assert [e.description for e in backend.read_all()] == ["3", "1", "2", "5", "4"]
+    assert backend.get(entries[0].id) == entries[0]
+    first = backend.page(limit=3)
+    assert [e.description for e in first.entries] == ["5", "4", "3"]
+    second = backend.page(limit=3, cursor=first.next_cursor)
+    assert [e.description for e in second.entries] == ["2", "1"]
+    assert second.next_cursor is None
+    backend.close()
+
+
+def test_migrate_csv_to_sqlite_is_rerunnable(tmp_path):
+    db = tmp_path / "practica.csv"
+    for i in range(3):
+        append_entry(db, Entry.new(description=f"row {i}", date_iso="2026-01-02", time_str="10:00"))
+    target = tmp_path / "practica.sqlite3"
+    assert migrate_csv_to_sqlite(db, target) == 3
+    assert migrate_csv_to_sqlite(db, target) == 0
+    assert [e.description for e in get_backend("sqlite", target).read_all()] == ["row 0", "row 1", "row 2"]
+    with pytest.raises(ValueError):
+        get_backend("nope")
+
+
+_EXPORT_RSS_SCRIPT = """
+import resource, sys
+from pathlib import Path
+from practica_tracker.store import CSV_FIELDS, export_xlsx
+rows, csv_path, xlsx_path = int(sys.argv[1]), Path(sys.argv[2]), Path(sys.argv[3])
+with csv_path.open("w", encoding="utf-8", newline="") as f:
+    f.write(",".join(CSV_FIELDS) + "\\r\\n")
+    for i in range(rows):
+        f.write(f"{i:08d}-0000-4000-8000-000000000000,2026-01-{i % 28 + 1:02d},08:{i % 60:02d},session {i % 97},py,{i % 90}\\r\\n")
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+assert export_xlsx(csv_path, xlsx_path) == rows
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+"""
+
+
+def _export_rss_growth_kib(tmp_path, rows):
+    out = subprocess.run(
+        [sys.executable, "-c", _EXPORT_RSS_SCRIPT, str(rows), str(tmp_path / f"{rows}.csv"), str(tmp_path / f"{rows}.xlsx")],
+        check=True, capture_output=True, text=True, cwd=Path(__file__).resolve().parents[1],
+    )
+    return int(out.stdout.split()[-1])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs the resource module")
+@pytest.mark.parametrize("rows", [
+    20_000,
+    pytest.param(1_000_000, marks=pytest.mark.skipif(not os.environ.get("PRACTICA_SLOW_TESTS"), reason="set PRACTICA_SLOW_TESTS=1")),
+])
+def test_export_xlsx_memory_stays_flat(tmp_path, rows):
+    pytest.importorskip("openpyxl")
+    # exporting many more rows must not grow peak RSS by more than a few MiB
+    assert _export_rss_growth_kib(tmp_path, rows) - _export_rss_growth_kib(tmp_path, 1_000) < 16 * 1024
+
+
+def test_append_entries_in_chunks(tmp_path):
+    db = tmp_path / "practica.csv"
+    append_entry(db, Entry.new(description="before", date_iso="2026-01-01", time_str="09:00"))
+    assert len(read_entries(db)) == 1
+    batch = (Entry.new(description=f"bulk {i}", date_iso="2026-01-02", time_str="09:00") for i in range(5))
+    assert append_entries(db, batch, chunk_size=2) == 5
+    assert [e.description for e in read_entries(db)] == ["before"] + [f"bulk {i}" for i in range(5)]
+    invalidate_cache(db)
+    assert len(read_entries(db)) == 6
+
+
+def test_get_entry_and_read_row_follow_appends_and_rewrites(tmp_path):
+    db = tmp_path / "practica.csv"
+    entries = [Entry.new(description=f"row {i}", date_iso="2026-01-01", time_str="08:00", tags="a, b") for i in range(5)]
+    entries[2].description = 'quoted "text",\nmultiline'
+    append_entries(db, entries)
+    assert get_entry(db, entries[2].id) == entries[2]
+    assert [read_row(db, i) for i in range(5)] == entries
+    assert read_row(db, -1) == entries[-1]
+    with pytest.raises(IndexError):
+        read_row(db, 5)
+    assert get_entry(db, "missing") is None
+    # appends through store extend the sidecar; other writers are caught up on lookup
+    late = Entry.new(description="late", date_iso="2026-01-02", time_str="08:00")
+    append_entry(db, late)
+    assert len(get_offset_index(db)) == 6
+    with db.open("a", encoding="utf-8") as f:
+        f.write("external-id,2026-01-03,09:00,external,,5\n")
+    assert get_entry(db, "external-id").duration_minutes == 5
+    assert read_row(db, 6).id == "external-id"
+    # a rewrite is re-indexed from scratch, and a new process reuses the sidecar
+    db.write_text(db.read_text(encoding="utf-8").replace("external,", "rewritten,"), encoding="utf-8")
+    assert get_entry(db, "external-id").description == "rewritten"
+    size = offsets_path(db).stat().st_size
+    fresh = OffsetIndex(db)
+    assert fresh.sync() == 0 and offsets_path(db).stat().st_size == size
+    assert fresh.get(late.id) == late
+    assert get_entry(tmp_path / "nothing.csv", late.id) is None
+
+
+def test_entry_route(tmp_path):
+    flask_app = pytest.importorskip("practica_tracker.app").app
+    db = tmp_path / "practica.csv"
+    entry = Entry.new(description="one", date_iso="2026-01-01", time_str="08:00", tags="py", duration_minutes=20)
+    append_entry(db, entry)
+    saved = dict(flask_app.config)
+    flask_app.config.update(PRACTICA_BACKEND="csv", PRACTICA_DB=str(db))
+    try:
+        client = flask_app.test_client()
+        response = client.get(f"/entry/{entry.id}")
+        assert response.status_code == 200
+        assert response.get_json() == {
+            "id": entry.id, "date": "2026-01-01", "time": "08:00", "description": "one", "tags": "py", "duration_minutes": 20,
+        }
+        assert client.get("/entry/nope").status_code == 404
+    finally:
+        flask_app.config.clear()
+        flask_app.config.update(saved)
+
+
+def _spread_entries(n):
+    # appended out of month order, like a backfill
+    return [
+        Entry.new(description=f"e{i}", date_iso=f"2026-{(i * 7) % 4 + 1:02d}-{i % 28 + 1:02d}", time_str=f"{8 + i % 10:02d}:00")
+        for i in range(n)
+    ]
+
+
+def test_convert_and_route_appends_by_month(tmp_path):
+    db = tmp_path / "practica.csv"
+    entries = _spread_entries(30)
+    append_entries(db, entries)
+    root = tmp_path / "practica"
+    assert convert_to_partitioned(db, root) == 30
+    assert read_manifest(root) == ["2026-01", "2026-02", "2026-03", "2026-04"]
+    in_month_order = sorted(entries, key=lambda e: e.date[:7])  # stable: file order within a month
+    assert read_entries(root) == list(iter_entries(root)) == in_month_order
+    assert [e.date[:7] for e in read_entries(partition_path(root, "2026-02"))] == ["2026-02"] * 7
+    with pytest.raises(ValueError):
+        convert_to_partitioned(db, root)  # already holds entries
+
+    late = Entry.new(description="late", date_iso="2025-12-31", time_str="23:00")
+    odd = Entry.new(description="odd", date_iso="someday", time_str="23:00")
+    append_entry(root, late)
+    append_entries(root, [odd])
+    assert read_manifest(root) == [UNDATED, "2025-12", "2026-01", "2026-02", "2026-03", "2026-04"]
+    backend = get_backend("partitioned", root)
+    assert backend.read_all()[:2] == [odd, late]
+    assert backend.get(late.id) == late and backend.get("missing") is None
+    assert list(backend.between("2025-12-01", "2026-01-05")) == [late] + [e for e in in_month_order if "2026-01-01" <= e.date <= "2026-01-05"]
+    version = backend.version()
+    backend.append(Entry.new(description="more", date_iso="2026-04-02", time_str="08:00"))
+    assert backend.version() != version
+
+
+def test_partitioned_pages_and_parallel_scan(tmp_path):
+    root = tmp_path / "practica"
+    backend = PartitionedBackend(root, workers=2)
+    entries = _spread_entries(45)
+    backend.append_many(entries)
+    assert backend.read_all() == sorted(entries, key=lambda e: e.date[:7])
+    seen, cursor = [], None
+    while True:
+        page = backend.page(limit=4, cursor=cursor)
+        seen.extend(page.entries)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    # every row once, newest month first (within a month read_page's ordering applies)
+    assert sorted(e.id for e in seen) == sorted(e.id for e in entries)
+    months = [e.date[:7] for e in seen]
+    assert months == sorted(months, reverse=True)
+    with pytest.raises(ValueError):
+        backend.page(cursor="garbage")
+    assert PartitionedBackend(tmp_path / "empty").page().entries == []
+
+
+def test_update_and_delete_append_and_readers_resolve_latest(tmp_path):
+    db = tmp_path / "practica.csv"
+    entries = [Entry.new(description=f"row {i}", date_iso="2026-01-01", time_str=f"{8 + i:02d}:00", tags="py") for i in range(4)]
+    append_entries(db, entries)
+    assert read_entries(db) == entries  # cached before the edits
+    size = db.stat().st_size
+    updated = update_entry(db, entries[1].id, description="edited", duration_minutes="15")
+    assert updated == Entry(entries[1].id, "2026-01-01", "09:00", "edited", "py", 15)
+    assert delete_entry(db, entries[2].id)
+    assert db.stat().st_size > size  # appended, nothing rewritten
+    assert update_entry(db, "missing", description="x") is None and not delete_entry(db, "missing")
+    assert not delete_entry(db, entries[2].id)
+    with pytest.raises(ValueError):
+        update_entry(db, entries[0].id, date="not a date")
+    with pytest.raises(ValueError):
+        update_entry(db, entries[0].id, id="other")
+
+    live = [entries[0], entries[3], updated]
+    assert read_entries(db) == list(iter_entries(db)) == live
+    assert get_entry(db, entries[1].id) == updated and get_entry(db, entries[2].id) is None
+    assert read_row(db, 5).date == TOMBSTONE  # raw rows stay addressable
+    assert [e.id for e in read_page(db, limit=10).entries] == [entries[3].id, updated.id, entries[0].id]
+    from practica_tracker.search import search_entries
+    from practica_tracker.stats import get_tracker
+
+    assert search_entries(db, tag="py") == [updated, entries[3], entries[0]]
+    assert get_tracker(db, tmp_path / "challenges.json").snapshot()["total_minutes"] == 15
+    assert dead_rows(db) == 3  # the old version, the deleted row and its tombstone
+
+
+def test_readers_never_create_the_sidecar_and_resolve_ids_once_it_exists(tmp_path):
+    db = tmp_path / "practica.csv"
+    first = Entry(id="dup", date="2026-01-01", time="08:00", description="first")
+    append_entries(db, [first, Entry(id="dup", date="2026-01-01", time="09:00", description="second")])
+    # without a sidecar every row is live, and plain reads leave it that way
+    seen = ([e.description for e in read_entries(db)], [e.description for e in iter_entries(db)],
+            [e.description for e in read_page(db).entries], dead_rows(db))
+    assert seen == (["first", "second"], ["first", "second"], ["second", "first"], 0)
+    assert not offsets_path(db).exists()
+    assert get_entry(db, "dup").description == "second"
+    assert [e.description for e in read_entries(db)] == ["second"] and len(read_page(db).entries) == 1
+    # appends keep the sidecar current, so later repeats resolve too
+    append_entries(db, [Entry(id="dup", date="2026-01-01", time="10:00", description="third")])
+    assert [e.description for e in iter_entries(db)] == ["third"] and dead_rows(db) == 2
+
+
+def test_vacuum_keeps_live_rows_and_appends_made_meanwhile(tmp_path):
+    db = tmp_path / "practica.csv"
+    entries = [Entry.new(description=f"row {i}", date_iso="2026-01-01", time_str="08:00") for i in range(6)]
+    append_entries(db, entries)
+    for entry in entries[:3]:
+        delete_entry(db, entry.id)
+    assert dead_rows(db) == 6  # the deleted rows and their tombstones
+    assert not maybe_vacuum(db, min_dead=7)
+    # a writer that opened the file before the rename waits on the lock, then follows it
+    stale = db.open("ab")
+    with db.open("rb") as f:
+        inode = os.fstat(f.fileno()).st_ino
+    assert maybe_vacuum(db, min_dead=6, ratio=0.5)
+    assert os.stat(db).st_ino != inode and dead_rows(db) == 0
+    late = Entry.new(description="late", date_iso="2026-01-02", time_str="08:00")
+    from practica_tracker.store import _write_chunk
+
+    with stale:
+        _write_chunk(db, stale, [late])
+    assert read_entries(db) == entries[3:] + [late]
+    assert get_entry(db, late.id) == late and read_row(db, 0) == entries[3]
+    assert vacuum(db) == 0
+
+
+def test_partitioned_and_sqlite_update_delete(tmp_path):
+    root = tmp_path / "practica"
+    backend = PartitionedBackend(root)
+    entries = _spread_entries(8)
+    backend.append_many(entries)
+    moved = backend.update(entries[0].id, date="2025-06-01")
+    assert moved.date == "2025-06-01" and backend.get(entries[0].id) == moved
+    assert backend.delete(entries[1].id) and backend.get(entries[1].id) is None
+    assert sorted(e.id for e in backend.read_all()) == sorted(e.id for e in [moved, *entries[2:]])
+    assert "2025-06" in read_manifest(root) and dead_rows(root) == 4
+    assert backend.vacuum() == 4 and dead_rows(root) == 0
+    assert backend.get(entries[0].id) == moved
+
+    sqlite = SqliteBackend(tmp_path / "practica.sqlite3")
+    try:
+        sqlite.append_many(entries)
+        assert sqlite.update(entries[0].id, tags="x").tags == "x" and sqlite.get(entries[0].id).tags == "x"
+        assert sqlite.delete(entries[0].id) and not sqlite.delete(entries[0].id)
+        assert sqlite.update(entries[0].id, tags="y") is None
+    finally:
+        sqlite.close()
+
+
+def test_compressed_store_reads_blocks_and_tail(tmp_path, monkeypatch):
+    from practica_tracker import store
+
+    monkeypatch.setattr(store, "BLOCK_BYTES", 300)
+    entries = _spread_entries(60)
+    path = tmp_path / "practica.csvz"
+    backend = get_backend("compressed", path, codec="lzma")
+    backend.append_many(entries[:35])
+    for entry in entries[35:40]:
+        append_entry(path, entry)
+    append_entries(path, entries[40:])
+    stats = block_stats(path)
+    assert stats["rows"] == 60 and stats["blocks"] >= 3 and stats["ratio"] > 1
+    assert read_entries(path) == list(iter_entries(path)) == entries
+    assert read_rows(path, 17, 43) == entries[17:43] and read_rows(path, 55) == entries[55:]
+    assert backend.get(entries[3].id) == entries[3] and get_entry(path, "missing") is None
+
+    decoded = []
+    monkeypatch.setattr(store, "_read_block", lambda f, block: decoded.append(block) or _read_block(f, block))
+    january = list(backend.between("2026-01-01", "2026-01-31"))
+    assert january == [e for e in entries if e.date[:7] == "2026-01"]
+    assert all(block.overlaps("2026-01-01", "2026-01-31") for block in decoded)
+    monkeypatch.setattr(store, "_read_block", _read_block)
+
+    # pages come out as they would from the same rows in a CSV file
+    db = tmp_path / "practica.csv"
+    append_entries(db, entries)
+    cursor = csv_cursor = None
+    while True:
+        page, csv_page = backend.page(limit=7, cursor=cursor), read_page(db, limit=7, cursor=csv_cursor)
+        assert page.entries == csv_page.entries
+        cursor, csv_cursor = page.next_cursor, csv_page.next_cursor
+        if cursor is None:
+            assert csv_cursor is None
+            break
+
+
+def test_compressed_store_survives_an_interrupted_seal(tmp_path, monkeypatch):
+    from practica_tracker import store
+
+    monkeypatch.setattr(store, "BLOCK_BYTES", 10 ** 9)  # seal by hand
+    path = tmp_path / "practica.csvz"
+    entries = _spread_entries(20)
+    append_entries(path, entries[:10])
+    old_tail = tail_path(path).read_bytes()
+    with path.open("r+b") as f:
+        store._seal(path, f, CODECS["zlib"])
+    # crashed after writing the block, before replacing the tail
+    tail_path(path).write_bytes(old_tail)
+    assert read_entries(path) == entries[:10]
+    # and a half-written block is ignored, then overwritten by the next seal
+    with path.open("ab") as f:
+        f.write(b"BLK1\x01")
+    append_entries(path, entries[10:])
+    assert read_entries(path) == entries
+    with path.open("r+b") as f:
+        store._seal(path, f, CODECS["zlib"])
+    assert read_entries(path) == entries and block_stats(path)["blocks"] == 2
+    with pytest.raises(ValueError):
+        convert_to_compressed(tmp_path / "other.csv", path)
+
+
+def test_backends_declare_what_they_implement():
+    from practica_tracker.store import BACKENDS, EditableBackend, StorageBackend
+
+    with pytest.raises(TypeError):
+        StorageBackend("x")  # abstract
+    assert {name for name, cls in BACKENDS.items() if issubclass(cls, EditableBackend)} == {"csv", "sqlite", "partitioned"}
+
+
+def test_edit_and_delete_routes(tmp_path):
+    flask_app = pytest.importorskip("practica_tracker.app").app
+    db = tmp_path / "practica.csv"
+    entry = Entry.new(description="one", date_iso="2026-01-01", time_str="08:00")
+    append_entry(db, entry)
+    saved = dict(flask_app.config)
+    flask_app.config.update(PRACTICA_BACKEND="csv", PRACTICA_DB=str(db))
+    try:
+        client = flask_app.test_client()
+        response = client.post(f"/entry/{entry.id}/edit", data={"description": "two", "duration": "30"})
+        assert response.status_code == 302
+        assert client.get(f"/entry/{entry.id}").get_json()["description"] == "two"
+        assert client.post(f"/entry/{entry.id}/edit", data={"time": "25:00"}).status_code == 400
+        exported = client.get("/export/csv").data.decode("utf-8").splitlines()
+        assert len(exported) == 2 and exported[1].endswith(",two,,30")
+        assert client.post(f"/entry/{entry.id}/delete").status_code == 302
+        assert client.get(f"/entry/{entry.id}").status_code == 404
+        assert client.post(f"/entry/{entry.id}/delete").status_code == 404
+        assert client.post("/entry/nope/edit", data={"description": "x"}).status_code == 404
+
+        flask_app.config.update(PRACTICA_BACKEND="compressed", PRACTICA_DB=str(tmp_path / "practica.csvz"))
+        assert client.post(f"/entry/{entry.id}/edit", data={"description": "x"}).status_code == 501
+        assert client.post(f"/entry/{entry.id}/delete").status_code == 501
+    finally:
+        flask_app.config.clear()
+        flask_app.config.update(saved)
+
+
+_WRITER_STRESS_SCRIPT = """
+import sys, threading
+from pathlib import Path
+from practica_tracker.store import Entry, get_writer
+path, proc, threads, per_thread = Path(sys.argv[1]), sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+writer = get_writer(path, max_delay=0.001)
+def work(t):
+    for i in range(per_thread):
+        writer.submit(Entry.new(description=f"p{proc} t{t} n{i} " + "x" * (i * 37 % 300), date_iso="2026-01-01", time_str="08:00"))
+workers = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+for w in workers: w.start()
+for w in workers: w.join()
+writer.close()
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fcntl locks are POSIX only")
+def test_group_commit_writer_multiprocess_stress(tmp_path):
+    db = tmp_path / "practica.csv"
+    procs, threads, per_thread = 4, 4, 50
+    root = Path(__file__).resolve().parents[1]
+    running = [
+        subprocess.Popen([sys.executable, "-c", _WRITER_STRESS_SCRIPT, str(db), str(p), str(threads), str(per_thread)], cwd=root)
+        for p in range(procs)
+    ]
+    assert all(proc.wait(timeout=120) == 0 for proc in running)
+    with db.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_FIELDS
+    body = rows[1:]
+    assert len(body) == procs * threads * per_thread
+    assert all(len(r) == len(CSV_FIELDS) for r in body)
+    assert len({r[0] for r in body}) == len(body)
+    expected = {f"p{p} t{t} n{i}" for p in range(procs) for t in range(threads) for i in range(per_thread)}
+    assert {" ".join(r[3].split()[:3]) for r in body} == expected
+
+
+def test_closed_writer_is_replaced_and_sidecar_sync_errors_do_not_fail_appends(tmp_path, monkeypatch, caplog):
+    from practica_tracker import store
+
+    db = tmp_path / "practica.csv"
+    writer = store.get_writer(db, max_delay=0.0)
+    first = Entry.new(description="one", date_iso="2026-01-01", time_str="08:00")
+    writer.submit(first)
+    writer.close()
+    assert store.get_writer(db) is not writer
+
+    # the append listener keeps the sidecar current behind each commit
+    update_entry(db, first.id, description="one again")
+    store.get_writer(db, max_delay=0.0).submit(Entry(id=first.id, date="2026-01-01", time="09:00", description="three"))
+    assert store.get_offset_index(db).sync() == 0
+    assert [e.description for e in read_entries(db)] == ["three"]
+
+    def broken(self):
+        raise RuntimeError("index is gone")
+
+    with monkeypatch.context() as m:
+        m.setattr(store.OffsetIndex, "sync", broken)
+        store.get_writer(db, max_delay=0.0).submit(Entry.new(description="two", date_iso="2026-01-01", time_str="08:00"))
+    assert [e.description for e in read_entries(db)] == ["three", "two"]
+    assert "index is gone" in caplog.text
+    store.release(db)
@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+
+from practica_tracker import table as table_module
+from practica_tracker.store import Entry, append_entry
+from practica_tracker.table import EntryTable
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(table_module, "_numpy", lambda: None)
+    return request.param
+
+
+def _entries():
+    return [
+        Entry.new(description="b", date_iso="2026-01-02", time_str="09:30", tags="py", duration_minutes=20),
+        Entry.new(description="a", date_iso="2026-01-01", time_str="18:00", tags="py, cli", duration_minutes=45),
+        Entry.new(description="c", date_iso="2026-01-02", time_str="07:05", tags="rust", duration_minutes=10),
+        Entry.new(description="d", date_iso="2026-01-05", time_str="12:00", tags="", duration_minutes=0),
+    ]
+
+
+def test_rows_round_trip(backend):
+    entries = _entries()
+    t = EntryTable(entries)
+    assert len(t) == 4
+    assert list(t) == entries
+    assert t[1].tags == "py, cli"
+    assert t.tag_values == ["py", "py, cli", "rust", ""]
+
+
+def test_sort_filter_and_sum(backend):
+    t = EntryTable(_entries())
+    assert [e.description for e in t.sorted()] == ["a", "c", "b", "d"]
+    assert [e.description for e in t.sorted(reverse=True)] == ["d", "b", "c", "a"]
+    assert t.select(since=date(2026, 1, 2), until=date(2026, 1, 2)) == [0, 2]
+    assert [e.description for e in t.filter(tag="py")] == ["b", "a"]
+    assert [e.description for e in t.filter(since=date(2026, 1, 2), tag="PY")] == ["b"]
+    assert t.total_duration() == 75
+    assert t.total_duration(t.select(tag="py")) == 65
+
+
+def test_from_csv_and_malformed_values(tmp_path, backend):
+    db = tmp_path / "practica.csv"
+    append_entry(db, Entry(id="x", date="someday", time="late", description="odd", tags="", duration_minutes=5))
+    append_entry(db, _entries()[0])
+    t = EntryTable.from_csv(db)
+    assert (t[0].date, t[0].time) == ("", "")
+    assert [e.description for e in t.sorted()] == ["odd", "b"]
+    assert t.select(since=date(2026, 1, 1)) == [1]
+    for duration in (-1, 2**32):
+        with pytest.raises(ValueError):
+            t.append(Entry(id="y", date="2026-01-05", time="08:00", description="bad", duration_minutes=duration))
+    assert len(t.ids) == len(t.dates) == len(t.times) == len(t.durations) == len(t.descriptions) == 2
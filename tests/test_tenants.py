@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from practica_tracker import search, stats, store
+from practica_tracker.store import Entry, read_entries
+from practica_tracker.tenants import TenantManager, check_user
+
+
+def _entry(description, day="2026-01-01"):
+    return Entry.new(description=description, date_iso=day, time_str="08:00", tags="scales")
+
+
+def _held(path):
+    """Process-wide state kept for files under `path`."""
+    key = os.path.abspath(path)
+    return [
+        name for name, cache in (
+            ("writer", store._writers), ("entries", store._entry_cache), ("offsets", store._offset_indexes),
+            ("search", search._indexes),
+        )
+        if any(k.startswith(key) for k in cache)
+    ] + (["stats"] if any(k[0].startswith(key) for k in stats._trackers) else [])
+
+
+def test_user_names_are_checked(tmp_path):
+    manager = TenantManager(tmp_path)
+    assert manager.path("alice") == tmp_path / "alice" / "practica.csv"
+    assert TenantManager(tmp_path, "sqlite").path("bob.s-1") == tmp_path / "bob.s-1" / "practica.sqlite3"
+    for bad in ("", "..", ".hidden", "a/b", "a\\b", "x" * 65, None):
+        with pytest.raises(ValueError):
+            check_user(bad)
+    with pytest.raises(ValueError):
+        TenantManager(tmp_path, "parquet")
+
+
+def test_least_recently_used_tenant_is_released(tmp_path):
+    manager = TenantManager(tmp_path, max_tenants=2, group_commit_delay=0.0)
+    for user in ("alice", "bob"):
+        with manager.use(user) as tenant:
+            tenant.backend.append(_entry(f"{user} scales"))
+            tenant.backend.get(read_entries(tenant.backend.path)[0].id)
+            search.search_entries(tenant.backend.path, tag="scales")
+            stats.backend_stats(tenant.backend, tenant.challenges_path)
+    alice = tmp_path / "alice"
+    assert _held(alice) == ["writer", "entries", "offsets", "search", "stats"]
+
+    with manager.use("alice"):  # alice is now the most recently used
+        pass
+    with manager.use("carol"):
+        pass
+    assert "bob" not in manager and "alice" in manager and len(manager) == 2
+    assert _held(tmp_path / "bob") == [] and _held(alice)
+
+    with manager.use("bob") as tenant:  # reopened from disk
+        assert [e.description for e in tenant.backend.read_all()] == ["bob scales"]
+    manager.close()
+    assert len(manager) == 0 and _held(tmp_path) == []
+
+
+def test_evicting_closes_every_threads_sqlite_connection(tmp_path):
+    manager = TenantManager(tmp_path, "sqlite")
+    with manager.use("alice") as tenant:
+        backend = tenant.backend
+        backend.append(_entry("main thread"))
+        worker = threading.Thread(target=lambda: backend.append(_entry("other thread")))
+        worker.start()
+        worker.join()
+        conns = list(backend._conns)
+    assert len(conns) == 2
+    manager.close()
+    for conn in conns:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert [e.description for e in backend.read_all()] == ["main thread", "other thread"]  # reconnects
+    backend.close()
+
+
+def test_pinned_tenants_are_not_evicted(tmp_path):
+    manager = TenantManager(tmp_path, max_tenants=1, idle_seconds=60)
+    alice = manager.acquire("alice")
+    with manager.use("bob"):
+        assert len(manager) == 2  # over the limit while both are in use
+    assert "bob" not in manager and "alice" in manager
+    assert manager.acquire("alice") is alice
+    manager.release(alice)
+    manager.release(alice)
+    assert manager.evict_idle(now=alice.last_used + 30) == 0
+    assert manager.evict_idle(now=alice.last_used + 61) == 1 and len(manager) == 0
+
+
+def test_flask_routes_each_user_to_their_own_file(tmp_path, monkeypatch):
+    app_module = pytest.importorskip("practica_tracker.app")
+    monkeypatch.setattr(app_module, "render_template", lambda template, **context: "".join(
+        f"<li>{e.description}</li>" for e in context.get("entries", ())
+    ))
+    flask_app = app_module.app
+    saved = dict(flask_app.config)
+    flask_app.config.update(
+        PRACTICA_BACKEND="csv", PRACTICA_DATA_ROOT=str(tmp_path), PRACTICA_GROUP_COMMIT_DELAY=None,
+        PRACTICA_EXPORT_DIR=str(tmp_path / "exports"),
+    )
+    try:
+        client = flask_app.test_client()
+        for user in ("alice", "bob"):
+            client.post(
+                "/add", headers={"X-Practica-User": user},
+                data={"description": f"{user} etude", "date": "2026-01-02", "time": "08:00"},
+            )
+        assert client.get("/", headers={"X-Practica-User": "alice"}).data == b"<li>alice etude</li>"
+        assert [e.description for e in read_entries(tmp_path / "bob" / "practica.csv")] == ["bob etude"]
+        assert client.get("/stats?user=bob").status_code == 400  # only the header names a user by default
+        bob = {"X-Practica-User": "bob"}
+        assert "X-Practica-User" in client.get("/", headers=bob).headers["Vary"]
+
+        job = client.post("/export/jobs", data={"format": "csv"}, headers=bob).get_json()
+        assert client.get(f"/export/jobs/{job['id']}", headers=bob).status_code == 200
+        assert client.get(f"/export/jobs/{job['id']}", headers={"X-Practica-User": "alice"}).status_code == 404
+
+        flask_app.config["PRACTICA_ALLOW_USER_PARAM"] = True
+        assert client.get("/stats?user=bob").get_json()["entries"] == 1
+        assert client.get("/").data == b"<li>bob etude</li>"  # ?user= is remembered
+        assert "Cookie" in client.get("/").headers["Vary"]
+
+        fresh = flask_app.test_client()
+        assert fresh.get("/").status_code == 400
+        assert fresh.get("/", headers={"X-Practica-User": "../etc"}).status_code == 400
+        assert all(t.pins == 0 for t in app_module.tenants()._tenants.values())
+    finally:
+        app_module.tenants().close()
+        flask_app.config.clear()
+        flask_app.config.update(saved)
+        app_module.pages().clear()
+
+
+def test_export_job_keeps_its_backend_when_the_tenant_is_evicted(tmp_path, monkeypatch):
+    from practica_tracker import exports
+
+    app_module = pytest.importorskip("practica_tracker.app")
+    flask_app = app_module.app
+    saved = dict(flask_app.config)
+    flask_app.config.update(
+        PRACTICA_BACKEND="sqlite", PRACTICA_DATA_ROOT=str(tmp_path), PRACTICA_MAX_TENANTS=1,
+        PRACTICA_EXPORT_DIR=str(tmp_path / "exports"),
+    )
+    reading, gate = threading.Event(), threading.Event()
+    select_entries = exports.select_entries
+
+    def paused(*args):
+        for row, entry in enumerate(select_entries(*args)):
+            if row == 1:
+                reading.set()
+                gate.wait(10)  # the export is mid-read while bob gets evicted
+            yield entry
+
+    monkeypatch.setattr(exports, "select_entries", paused)
+    try:
+        client = flask_app.test_client()
+        bob = {"X-Practica-User": "bob"}
+        for i in range(3):
+            client.post("/add", headers=bob, data={"description": f"bob {i}", "date": "2026-01-02", "time": "08:00"})
+        job = client.post("/export/jobs", data={"format": "csv"}, headers=bob).get_json()
+        assert reading.wait(10)
+        client.get("/stats", headers={"X-Practica-User": "alice"})  # only one tenant fits: bob goes
+        assert "bob" not in app_module.tenants()._tenants
+        gate.set()
+        done = app_module.exports().get(job["id"])
+        deadline = time.monotonic() + 10
+        while done.finished is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert (done.status, done.rows, done.error) == (exports.DONE, 3, None)
+    finally:
+        gate.set()
+        app_module.exports().close()
+        app_module.tenants().close()
+        flask_app.config.clear()
+        flask_app.config.update(saved)